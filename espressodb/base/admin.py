@@ -2,15 +2,26 @@
 """
 from typing import Optional, List, Tuple
 
+from functools import reduce
 from logging import getLogger
+from operator import or_
 
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
 from django.contrib.admin.sites import AdminSite
+from django.contrib.admin.views.main import ChangeList, ORDER_VAR, PAGE_VAR
+from django.core import checks
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
 from django.db import models
+from django.utils.functional import cached_property
 
 
 from espressodb.base.models import Base
+from espressodb.base.models import _deferred_specialization
 from espressodb.base.utilities.apps import get_project_apps
+from espressodb.base.utilities.models import get_estimated_count
+from espressodb.base.utilities.models import get_indexed_field_names
 
 
 LOGGER = getLogger("espressodb")
@@ -30,13 +41,128 @@ class BaseAdmin(admin.ModelAdmin):
         super(BaseAdmin, self).save_model(request, obj, form, change)
 
 
+#: Change list parameter of the last id of the previous page for keyset navigation
+KEYSET_VAR = "after"
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator which uses the row estimate of the query planner for unfiltered tables.
+
+    Filtered querysets and tables with less than :attr:`exact_count_threshold`
+    estimated rows are counted exactly.
+    See :func:`espressodb.base.utilities.models.get_estimated_count`.
+    """
+
+    #: Tables with less estimated rows are counted exactly
+    exact_count_threshold: int = 10000
+
+    @cached_property
+    def count(self) -> int:
+        """Returns the estimated or exact number of objects.
+        """
+        queryset = self.object_list
+        if isinstance(queryset, models.QuerySet) and not queryset.query.where:
+            estimate = get_estimated_count(queryset.model, using=queryset.db)
+            if estimate is not None and estimate >= self.exact_count_threshold:
+                return estimate
+        return Paginator.count.func(self)
+
+
+class BaseChangeList(ChangeList):
+    """Change list which loads the specializations of the displayed page in batches.
+
+    See :meth:`ListViewAdmin.load_page`.
+    If the admin uses keyset navigation (see :attr:`ListViewAdmin.large_table`),
+    rows are ordered by descending id and the next page is selected by the last id of
+    the current page instead of an offset.
+    """
+
+    #: If the page is selected by the :data:`KEYSET_VAR` parameter
+    keyset: bool = False
+    #: The id of the last row of the previous page
+    keyset_after = None
+    #: The id of the last row if a next page (may) exist
+    keyset_next = None
+    #: Link to the first and next page for keyset navigation
+    keyset_first_url: Optional[str] = None
+    keyset_next_url: Optional[str] = None
+
+    def get_filters_params(self, params=None):
+        """Removes the keyset parameter from the lookup parameters.
+        """
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(KEYSET_VAR, None)
+        return lookup_params
+
+    def get_queryset(self, request):
+        """Orders by descending id and reads the keyset parameter if keyset navigation
+        is used.
+
+        Keyset navigation is not used if the change list is ordered by a column.
+
+        Raises:
+            IncorrectLookupParameters: If the keyset parameter is not a valid id.
+        """
+        queryset = super().get_queryset(request)
+        self.keyset = (
+            getattr(self.model_admin, "large_table", False)
+            and getattr(self.model_admin, "keyset_pagination", False)
+            and ORDER_VAR not in self.params
+        )
+        if self.keyset:
+            queryset = queryset.order_by("-pk")
+            if self.params.get(KEYSET_VAR):
+                try:
+                    self.keyset_after = self.model._meta.pk.to_python(
+                        self.params[KEYSET_VAR]
+                    )
+                except ValidationError as error:
+                    raise IncorrectLookupParameters(error) from error
+        return queryset
+
+    def get_results(self, request):
+        """Evaluates the page and prefetches specializations of rows and foreign keys.
+        """
+        super().get_results(request)
+
+        if self.keyset and not self.show_all:
+            queryset = self.queryset
+            if self.keyset_after is not None:
+                queryset = queryset.filter(pk__lt=self.keyset_after)
+            self.result_list = queryset[: self.list_per_page]
+
+        self.result_list = self.model_admin.load_page(self.result_list)
+
+        if self.keyset:
+            self.keyset_first_url = self.get_query_string(remove=[KEYSET_VAR, PAGE_VAR])
+            if not self.show_all and len(self.result_list) == self.list_per_page:
+                self.keyset_next = self.result_list[-1].pk
+                self.keyset_next_url = self.get_query_string(
+                    {KEYSET_VAR: self.keyset_next}, [PAGE_VAR]
+                )
+
+
 class ListViewAdmin(admin.ModelAdmin):
     """List view admin which displays all model fields.
 
+    Foreign keys in ``list_display`` are joined (``list_select_related``) and
+    specializations of the displayed rows and their foreign keys are loaded in batches.
+    Thus, the number of queries does not depend on the number of displayed rows.
+
     Attributes:
         search_fields:
             The fields which are searchable on the admin page.
             Does only render fields which are present in ``list_display``
+        large_table:
+            Adjusts the change list for tables with many rows:
+            Rows are counted by the :class:`EstimatedCountPaginator`,
+            only indexed ``search_fields`` are searched for exact matches
+            and pages are navigated by id if ``keyset_pagination`` is set.
+            Search fields without index are ignored and reported by
+            :meth:`ListViewAdmin.check`.
+        keyset_pagination:
+            Navigate large tables by "next page" links which select rows with ids
+            smaller than the last id of the current page (instead of page offsets).
         list_display:
             The fields to display as a column on the admin page.
             Defaults to ``["id", "instance_name", ..., "tag"]`` where ``...`` are
@@ -54,6 +180,8 @@ class ListViewAdmin(admin.ModelAdmin):
     list_display: Optional[List[str]] = None
     list_display_links: Optional[List[str]] = None
     display_instance_names: bool = True
+    large_table: bool = False
+    keyset_pagination: bool = True
 
     def __init__(  # pylint: disable=too-many-arguments
         self, model: Base, admin_site: AdminSite, **kwargs,
@@ -87,13 +215,115 @@ class ListViewAdmin(admin.ModelAdmin):
         else:
             self.list_display_links = self.list_display_links
 
-        self.search_fields = []
-        for search_field in self.search_fields:
-            if search_field in self.list_display:
-                self.search_fields.append(search_field)
+        self.search_fields = [
+            search_field
+            for search_field in self.search_fields
+            if search_field in self.list_display
+        ]
+
+        self._unindexed_search_fields = []
+        if self.large_table:
+            indexed_fields = get_indexed_field_names(model)
+            self._unindexed_search_fields = [
+                search_field
+                for search_field in self.search_fields
+                if search_field not in indexed_fields
+            ]
+            self.search_fields = [
+                search_field
+                for search_field in self.search_fields
+                if search_field in indexed_fields
+            ]
+
+            self.paginator = EstimatedCountPaginator
+            self.show_full_result_count = False
+            if self.keyset_pagination and self.change_list_template is None:
+                self.change_list_template = "admin/keyset_change_list.html"
+
+        if self.list_select_related is False:
+            self.list_select_related = [
+                field.name
+                for field in model.get_foreign_key_fields()
+                if field.name in self.list_display
+            ]
 
         super().__init__(model, admin_site, **kwargs)
 
+    def get_changelist(self, request, **kwargs):
+        """Returns the :class:`BaseChangeList` class.
+        """
+        return BaseChangeList
+
+    def check(self, **kwargs):
+        """Runs the admin checks and warns about unindexed search fields of large
+        tables.
+        """
+        errors = super().check(**kwargs)
+        for search_field in self._unindexed_search_fields:
+            errors.append(
+                checks.Warning(
+                    f"Search field '{search_field}' of {self.model.__name__} is not"
+                    " indexed and ignored by the large table admin.",
+                    hint="Add a database index for the column or remove it from"
+                    " search_fields.",
+                    obj=self.__class__,
+                    id="espressodb.W001",
+                )
+            )
+        return errors
+
+    def get_search_results(self, request, queryset, search_term):
+        """Filters large tables by exact matches of indexed search fields.
+
+        Other than the default search (``icontains`` on all fields), exact lookups of
+        indexed columns do not scan the table.
+        Search fields which can not represent the term (e.g., text for integer
+        columns) are ignored.
+        """
+        if not self.large_table:
+            return super().get_search_results(request, queryset, search_term)
+
+        search_term = search_term.strip()
+        if not search_term or not self.search_fields:
+            return queryset, False
+
+        conditions = []
+        for name in self.search_fields:
+            try:
+                value = self.model._meta.get_field(name).to_python(search_term)
+            except ValidationError:
+                continue
+            conditions.append(models.Q(**{name: value}))
+
+        if not conditions:
+            return queryset.none(), False
+        return queryset.filter(reduce(or_, conditions)), False
+
+    def load_page(self, queryset: models.QuerySet) -> List[Base]:
+        """Evaluates the page of the change list with batched specializations.
+
+        Rows are loaded without querying their specializations one by one.
+        Afterwards, the specializations of rows and of selected foreign keys are
+        loaded by :meth:`espressodb.base.models.Base.prefetch_specializations`.
+
+        Arguments:
+            queryset: The (sliced) queryset of the page.
+        """
+        with _deferred_specialization():
+            rows = list(queryset)
+
+        Base.prefetch_specializations(rows)
+
+        related = []
+        for field in self.model.get_foreign_key_fields():
+            if field.name in self.list_display and issubclass(
+                field.related_model, Base
+            ):
+                related += [getattr(row, field.name) for row in rows]
+        Base.prefetch_specializations(related)
+
+        return rows
+
     @staticmethod
     def instance_name(obj: Base) -> str:
         """Returns the name of the instance
@@ -8,6 +8,13 @@ class BaseConfig(AppConfig):
     label = "base"
 
     def ready(self):
-        """Loads signals from espressodb
+        """Loads signals from espressodb and prepares field meta data of models
         """
         import espressodb.base.signals  # pylint: disable=W0611
+        from espressodb.base.models import Base
+
+        Base.clear_field_cache()
+        for model in self.apps.get_models():
+            if issubclass(model, Base):
+                model.get_open_fields()
+                model.get_specialization_lookups()
@@ -1,6 +1,6 @@
 """Custom exceptions used in EspressoDB
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from django.db.models import Model
 
@@ -42,3 +42,34 @@ class ConsistencyError(Exception):
         self.data = ddata
         self.instance = instance
         self.error = error
+
+
+class BulkConsistencyError(ConsistencyError):
+    """Error which is raised if consistency checks of many instances fail.
+
+    This happens for bulk operations like ``Model.objects.bulk_create``.
+    The error collects the individual :class:`ConsistencyError` of all failed checks.
+    The ``instance``, ``error`` and ``data`` attributes refer to the first failure.
+    """
+
+    def __init__(  # pylint: disable=W0231
+        self, errors: List[ConsistencyError], n_instances: Optional[int] = None
+    ):
+        """Initialize consistency error and prepares the aggregated error message.
+
+        Arguments:
+            errors: The errors of the failed checks.
+            n_instances: The number of checked instances.
+        """
+        n_checked = f" of {n_instances}" if n_instances is not None else ""
+        message = f"Consistency checks failed for {len(errors)}{n_checked} instances.\n"
+        message += "\n".join(
+            f"[{n_error}] " + str(error) for n_error, error in enumerate(errors)
+        )
+
+        Exception.__init__(self, message)  # pylint: disable=W0233
+
+        self.errors = errors
+        self.data = errors[0].data
+        self.instance = errors[0].instance
+        self.error = errors[0].error
@@ -0,0 +1,399 @@
+"""This module provides the default manager and queryset of the
+:class:`espressodb.base.models.Base` class.
+
+The :class:`BaseQuerySet` extends the ``django_pandas`` ``DataFrameQuerySet`` such that
+all ``to_dataframe`` like methods stay available.
+For tables which do not fit in memory, :meth:`BaseQuerySet.iter_dataframes` streams
+the queryset in DataFrame chunks and :meth:`BaseQuerySet.export_dataframes` writes
+them to Parquet, Feather or HDF5 files.
+:meth:`BaseQuerySet.to_flat_dataframe` joins the specializations of foreign keys in
+one query.
+Since bulk operations do not emit ``pre_save`` signals, :meth:`BaseQuerySet.bulk_create`
+and :meth:`BaseQuerySet.bulk_update` run the pre save logic and consistency checks of
+all instances before the database is accessed.
+"""
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+from django.db import models
+from django.db import connections
+from django.db import router
+
+from django_pandas.managers import DataFrameQuerySet
+
+from pandas import DataFrame
+
+from espressodb.base.exceptions import ConsistencyError
+from espressodb.base.exceptions import BulkConsistencyError
+from espressodb.base.utilities.dataframes import cast_dataframe
+from espressodb.base.utilities.dataframes import get_dtypes
+from espressodb.base.utilities.dataframes import get_max_lengths
+from espressodb.base.utilities.dataframes import write_dataframes
+
+
+def _check_instances(
+    instances: List["espressodb.base.models.Base"], close_connections: bool = False
+) -> List[ConsistencyError]:
+    """Runs ``pre_save`` and ``check_consistency`` of the instances.
+
+    Arguments:
+        instances: The instances to check.
+        close_connections: Close database connections of this thread when done.
+
+    Returns:
+        The errors of the failed consistency checks.
+    """
+    errors = []
+    try:
+        for instance in instances:
+            if instance.run_pre_save:
+                instance.pre_save()
+
+            if instance.run_checks:
+                try:
+                    instance.check_consistency()
+                except Exception as error:  # pylint: disable=W0703
+                    errors.append(ConsistencyError(error, instance))
+    finally:
+        if close_connections:
+            connections.close_all()
+
+    return errors
+
+
+class BaseQuerySet(DataFrameQuerySet):
+    """QuerySet for models which inherit from :class:`espressodb.base.models.Base`.
+
+    Provides methods which operate on whole batches of instances instead of single
+    rows.
+    """
+
+    def specialized_classes(self) -> Dict[int, "espressodb.base.models.Base"]:
+        """Returns the most specialized class for each entry in the queryset.
+
+        The tables of all children of the queryset model are joined in a single query.
+        The returned dictionary preserves the order of the queryset.
+
+        Returns:
+            Map of primary keys to the most specialized class.
+        """
+        lookups = self.model.get_specialization_lookups()
+
+        classes = {}
+        for pk, *child_pks in self.values_list("pk", *lookups):
+            cls = self.model
+            # lookups are ordered by inheritance depth -> parents are checked first
+            for child, child_pk in zip(lookups.values(), child_pks):
+                if child_pk is not None and cls in child.__bases__:
+                    cls = child
+            classes[pk] = cls
+
+        return classes
+
+    def specialized(self) -> List["espressodb.base.models.Base"]:
+        """Returns the most specialized instance for each entry in the queryset.
+
+        Other than iterating the queryset and accessing ``instance.specialization``,
+        this method uses one query to identify the specializations (see
+        :meth:`BaseQuerySet.specialized_classes`) and one query per specialized class
+        to load the instances.
+
+        Returns:
+            List of specialized instances in the order of the queryset.
+
+        Note:
+            If the model has children, instances are reloaded from their tables.
+            Thus, annotations and deferred fields of this queryset are not present in
+            the returned instances.
+        """
+        if not self.model.get_specialization_lookups():
+            return list(self)
+
+        return list(self._load_specializations().values())
+
+    def _load_specializations(
+        self, skip_unspecialized: bool = False
+    ) -> Dict[int, "espressodb.base.models.Base"]:
+        """Loads the most specialized instance for each entry in the queryset.
+
+        Uses one query to identify the specialized classes (see
+        :meth:`BaseQuerySet.specialized_classes`) and one query per specialized class
+        to load the instances.
+
+        Arguments:
+            skip_unspecialized: Do not load entries which have no specialization.
+
+        Returns:
+            Map of primary keys to specialized instances in the order of the queryset.
+        """
+        classes = self.specialized_classes()
+
+        pks_by_class = {}
+        for pk, cls in classes.items():
+            if not (skip_unspecialized and cls == self.model):
+                pks_by_class.setdefault(cls, []).append(pk)
+
+        instances = {}
+        for cls, pks in pks_by_class.items():
+            instances.update(
+                cls._in_bulk_specialized(pks, using=self.db)  # pylint: disable=W0212
+            )
+
+        return {pk: instances[pk] for pk in classes if pk in instances}
+
+    def iter_dataframes(
+        self, fieldnames: Optional[List[str]] = None, chunk_size: int = 10000
+    ) -> Iterator[DataFrame]:
+        """Streams the queryset as DataFrames of at most ``chunk_size`` rows.
+
+        Rows are fetched by ``iterator(chunk_size=...)``, which uses server-side
+        cursors if the database supports them.
+        Thus, only one chunk is held in memory at a time.
+        Column dtypes are derived from the model fields and identical for all chunks
+        (see :func:`espressodb.base.utilities.dataframes.get_dtypes`).
+        Chunk indices continue the previous chunk.
+        At least one (possibly empty) chunk is yielded.
+
+        Arguments:
+            fieldnames:
+                The columns of the frames. Can be lookups, e.g.,
+                ``"hamiltonian__n_sites"``. Defaults to all concrete fields.
+            chunk_size:
+                The number of rows per chunk and fetch.
+        """
+        fieldnames = list(
+            fieldnames
+            or [
+                field.name
+                for field in self.model._meta.concrete_fields  # pylint: disable=W0212
+            ]
+        )
+        dtypes = get_dtypes(self.model, fieldnames)
+
+        def to_frame(rows: List[tuple], offset: int) -> DataFrame:
+            frame = DataFrame(
+                rows, columns=fieldnames, index=range(offset, offset + len(rows))
+            )
+            return cast_dataframe(frame, dtypes)
+
+        rows = []
+        offset = 0
+        for row in self.values_list(*fieldnames).iterator(chunk_size=chunk_size):
+            rows.append(row)
+            if len(rows) == chunk_size:
+                yield to_frame(rows, offset)
+                offset += len(rows)
+                rows = []
+
+        if rows or not offset:
+            yield to_frame(rows, offset)
+
+    def to_flat_dataframe(self, tree: Optional[Dict[str, Any]] = None) -> DataFrame:
+        """Returns the queryset joined with the specializations of its foreign keys.
+
+        The tree is compiled to lookups (see
+        :meth:`espressodb.base.models.Base.get_flat_lookups`), such that all tables
+        are joined in a single query.
+        Columns of dependencies have dotted names, e.g., ``"hamiltonian.n_sites"``,
+        and dtypes are derived from the model fields.
+        Rows whose foreign keys are not of the specialization chosen in the tree have
+        missing values in the columns of the specialization.
+
+        Arguments:
+            tree:
+                The tree of ForeignKey dependencies as used by
+                :meth:`espressodb.base.models.Base.get_or_create_from_parameters`,
+                e.g., ``{"hamiltonian": "Contact"}``.
+                Foreign keys which are not in the tree are represented by their id.
+
+        Example:
+            .. code-block:: python
+
+                Eigenvalue.objects.filter(n_level=0).to_flat_dataframe(
+                    tree={"hamiltonian": "Contact"}
+                )[["id", "value", "hamiltonian.n_sites", "hamiltonian.c"]]
+        """
+        columns = {"id": "pk"}
+        columns.update(self.model.get_flat_lookups(tree=tree))
+        lookups = list(columns.values())
+
+        frame = DataFrame(list(self.values_list(*lookups)), columns=lookups)
+        frame = cast_dataframe(frame, get_dtypes(self.model, lookups))
+        frame.columns = list(columns)
+        return frame
+
+    def export_dataframes(
+        self,
+        path: str,
+        fieldnames: Optional[List[str]] = None,
+        chunk_size: int = 10000,
+        file_format: Optional[str] = None,
+        key: str = "data",
+    ) -> int:
+        """Writes the queryset to a file chunk by chunk.
+
+        Chunks of :meth:`BaseQuerySet.iter_dataframes` are written as Parquet row
+        groups, Feather record batches or HDF5 table appends (see
+        :func:`espressodb.base.utilities.dataframes.write_dataframes`).
+        The full table is never held in memory.
+
+        Arguments:
+            path:
+                The file to (over)write.
+            fieldnames:
+                The columns of the file. Defaults to all concrete fields.
+            chunk_size:
+                The number of rows per chunk and fetch.
+            file_format:
+                One of ``parquet``, ``feather`` or ``hdf5``.
+                Inferred from the suffix of ``path`` if not given.
+            key:
+                The HDF5 group identifier.
+
+        Returns:
+            The number of written rows.
+        """
+        chunks = self.iter_dataframes(fieldnames=fieldnames, chunk_size=chunk_size)
+        chunk = next(chunks)
+        return write_dataframes(
+            chain([chunk], chunks),
+            path,
+            file_format=file_format,
+            key=key,
+            min_itemsize=get_max_lengths(self.model, list(chunk.columns)),
+        )
+
+    def run_checks(
+        self,
+        objs: List["espressodb.base.models.Base"],
+        max_workers: Optional[int] = None,
+    ):
+        """Runs ``pre_save`` and ``check_consistency`` for all instances.
+
+        Other than for ``save``, errors of individual checks do not stop the
+        remaining checks.
+
+        Arguments:
+            objs:
+                The instances to check.
+            max_workers:
+                Number of threads used to run the checks.
+                Checks run in the current thread if not larger than one.
+                Since other threads use their own database connection, only use
+                threads for CPU-heavy checks which do not depend on uncommitted data.
+
+        Raises:
+            BulkConsistencyError: If at least one check failed. Contains all failures.
+        """
+        if max_workers is not None and max_workers > 1 and len(objs) > 1:
+            n_chunks = min(max_workers, len(objs))
+            chunks = [objs[n_chunk::n_chunks] for n_chunk in range(n_chunks)]
+            with ThreadPoolExecutor(max_workers=n_chunks) as executor:
+                results = list(
+                    executor.map(
+                        lambda chunk: _check_instances(chunk, close_connections=True),
+                        chunks,
+                    )
+                )
+            positions = {id(obj): n_obj for n_obj, obj in enumerate(objs)}
+            errors = sorted(
+                [error for result in results for error in result],
+                key=lambda error: positions[id(error.instance)],
+            )
+        else:
+            errors = _check_instances(objs)
+
+        if errors:
+            raise BulkConsistencyError(errors, n_instances=len(objs))
+
+    def bulk_create(  # pylint: disable=W0221
+        self,
+        objs: Iterable["espressodb.base.models.Base"],
+        batch_size: Optional[int] = None,
+        ignore_conflicts: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> List["espressodb.base.models.Base"]:
+        """Inserts the instances after running their pre save logic and consistency
+        checks.
+
+        Instances without user are stored with the default user
+        (see :meth:`espressodb.base.models.Base.get_default_user`).
+        No instance is inserted if a check fails.
+
+        Arguments:
+            objs: The instances to insert.
+            batch_size: Maximal number of instances inserted per query.
+            ignore_conflicts: Ignore failure to insert rows, e.g., duplicates.
+            max_workers: Number of threads used for checks, see
+                :meth:`BaseQuerySet.run_checks`.
+
+        Raises:
+            BulkConsistencyError: If at least one check failed. Contains all failures.
+        """
+        objs = list(objs)
+
+        if any(obj.user_id is None for obj in objs):
+            using = self._db or router.db_for_write(self.model)
+            user = self.model.get_default_user(using=using)
+            for obj in objs:
+                if obj.user_id is None:
+                    obj.user = user
+
+        self.run_checks(objs, max_workers=max_workers)
+
+        return super().bulk_create(
+            objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts
+        )
+
+    def bulk_update(  # pylint: disable=W0221
+        self,
+        objs: Iterable["espressodb.base.models.Base"],
+        fields: List[str],
+        batch_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """Updates the fields of the instances after running their pre save logic and
+        consistency checks.
+
+        The ``last_modified`` column is updated as well.
+        No instance is updated if a check fails.
+
+        Arguments:
+            objs: The instances to update.
+            fields: The names of the fields to update.
+            batch_size: Maximal number of instances updated per query.
+            max_workers: Number of threads used for checks, see
+                :meth:`BaseQuerySet.run_checks`.
+
+        Raises:
+            BulkConsistencyError: If at least one check failed. Contains all failures.
+        """
+        objs = list(objs)
+
+        self.run_checks(objs, max_workers=max_workers)
+
+        fields = list(fields)
+        if "last_modified" not in fields:
+            fields.append("last_modified")
+        last_modified = self.model._meta.get_field(  # pylint: disable=W0212
+            "last_modified"
+        )
+        for obj in objs:
+            last_modified.pre_save(obj, add=False)
+
+        return super().bulk_update(objs, fields, batch_size=batch_size)
+
+
+class BaseManager(models.Manager.from_queryset(BaseQuerySet)):
+    """Default manager of :class:`espressodb.base.models.Base` models.
+
+    Provides all methods of :class:`BaseQuerySet`, e.g.,
+    ``Hamiltonian.objects.specialized()``.
+    """
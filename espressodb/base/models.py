@@ -7,12 +7,20 @@ from typing import List
 from typing import Tuple
 from typing import Optional
 from typing import Any
+from typing import Callable
 
 import logging
+import threading
+
+from contextlib import contextmanager
 
 from django.db import models
+from django.db.models import Q
 from django.db import connection
+from django.db import connections
+from django.db import router
 from django.db import transaction
+from django.db import DEFAULT_DB_ALIAS
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.template.defaultfilters import slugify
@@ -21,12 +29,45 @@ from django.urls import reverse, Resolver404
 from django.apps.config import AppConfig
 from django.core.exceptions import ValidationError
 
-from django_pandas.managers import DataFrameManager
-
+from espressodb.base.exceptions import ConsistencyError
+from espressodb.base.managers import BaseManager
+from espressodb.base.managers import BaseQuerySet
+from espressodb.base.plans import ParameterPlan
 from espressodb.base.utilities.apps import APPS_TO_SLUG
 
 LOGGER = logging.getLogger("base")
 
+#: Thread local state which controls specialization look ups on init
+_SPECIALIZATION_STATE = threading.local()
+
+#: Per class cache of field meta data. See :meth:`Base.clear_field_cache`.
+_FIELD_CACHE: Dict["Base", Dict[Any, Any]] = {}
+
+#: Default users per database alias and username. See :meth:`Base.get_default_user`.
+_DEFAULT_USERS: Dict[Tuple[str, str], User] = {}
+
+#: Default users created in uncommitted transactions and the callbacks which cache
+#: them on commit. See :meth:`Base.get_default_user`.
+_PENDING_DEFAULT_USERS: Dict[Tuple[str, str], Tuple[User, Callable]] = {}
+
+#: Base columns which are indexed unless the ``ESPRESSODB_BASE_INDEXES`` setting is False.
+#: The ``user`` foreign key is indexed by Django already.
+DEFAULT_BASE_INDEXES = ("tag", "last_modified", "user")
+
+
+@contextmanager
+def _deferred_specialization():
+    """Context in which new :class:`Base` instances do not query their specialization.
+
+    Used when the specialization of loaded instances is already known.
+    """
+    deferred = getattr(_SPECIALIZATION_STATE, "deferred", False)
+    _SPECIALIZATION_STATE.deferred = True
+    try:
+        yield
+    finally:
+        _SPECIALIZATION_STATE.deferred = deferred
+
 
 class Base(models.Model):
     """The base class for the espressodb module.
@@ -38,6 +79,12 @@ class Base(models.Model):
     run_checks: bool = True
     # Run custom pre save actions on model before inserting.
     run_pre_save: bool = True
+    # Defer specialization look ups until a specialized attribute is accessed.
+    # Defaults to the ``ESPRESSODB_LAZY_SPECIALIZATION`` setting if None.
+    lazy_specialization: Optional[bool] = None
+    # Columns which get a single column database index (see :meth:`Base.get_base_indexes`).
+    # Defaults to the ``ESPRESSODB_BASE_INDEXES`` setting if None.
+    base_indexes: Optional[Tuple[str, ...]] = None
 
     #: Primary key for the base class
     id = models.AutoField(primary_key=True, help_text="Primary key for Base class.")
@@ -68,7 +115,7 @@ class Base(models.Model):
         """Returns import path as slug name"""
         return slugify(cls.__name__)
 
-    objects = DataFrameManager()
+    objects = BaseManager()
 
     class Meta:
         abstract = True
@@ -81,17 +128,134 @@ class Base(models.Model):
 
         The specialization attributes are attributes present in the child but not in the
         current instance.
+
+        If the class runs in lazy mode (see :meth:`Base.is_lazy`), the specialization
+        is not queried on init but once a specialized attribute is accessed.
         """
 
         super().__init__(*args, **kwargs)
         self._specialization = None
+        self._specialization_loaded = False
 
         self._specialized_keys = []
+        if getattr(_SPECIALIZATION_STATE, "deferred", False) or self.is_lazy():
+            return
+
+        self._load_specialized_attributes()
+
+    @classmethod
+    def is_lazy(cls) -> bool:
+        """Returns True if instances look up their specialization on attribute access
+        instead of init.
+
+        Uses the class attribute ``lazy_specialization`` and defaults to the
+        ``ESPRESSODB_LAZY_SPECIALIZATION`` setting if not specified.
+        """
+        if cls.lazy_specialization is not None:
+            return cls.lazy_specialization
+        return getattr(settings, "ESPRESSODB_LAZY_SPECIALIZATION", False)
+
+    @classmethod
+    def get_base_indexes(cls) -> Tuple[str, ...]:
+        """Returns the names of columns which get a database index.
+
+        Uses the class attribute ``base_indexes`` and defaults to the
+        ``ESPRESSODB_BASE_INDEXES`` setting if not specified.
+        The setting is either a list of column names, True for
+        :data:`DEFAULT_BASE_INDEXES` (default) or False to not add indexes.
+        """
+        if cls.base_indexes is not None:
+            return tuple(cls.base_indexes)
+        names = getattr(settings, "ESPRESSODB_BASE_INDEXES", True)
+        return DEFAULT_BASE_INDEXES if names is True else tuple(names or ())
+
+    @classmethod
+    def build_base_indexes(cls) -> List[models.Index]:
+        """Returns the indexes of :meth:`Base.get_base_indexes` missing in ``Meta``.
+
+        Columns of parent tables (multi-table inheritance), columns which are indexed
+        by their field (e.g., foreign keys) and columns with a single column index in
+        ``Meta.indexes`` are skipped.
+        Index names follow Django's naming scheme for unnamed indexes.
+
+        The indexes are added to ``Meta.indexes`` when the class is created.
+        Thus, they are part of the migrations of the model.
+        """
+        meta = cls._meta
+        existing = {tuple(index.fields) for index in meta.indexes}
+        indexes = []
+        for name in cls.get_base_indexes():
+            field = meta.get_field(name)
+            if (
+                field not in meta.local_concrete_fields
+                or field.db_index
+                or field.unique
+                or (name,) in existing
+            ):
+                continue
+            index = models.Index(fields=[name])
+            index.set_name_with_model(cls)
+            indexes.append(index)
+        return indexes
+
+    @classmethod
+    def get_specialized_field_names(cls) -> Tuple[str]:
+        """Returns names of open fields of children which are not present in the class.
+        """
+
+        def compute():
+            names = {field.name for field in cls._get_open_fields()}
+            specialized_names = []
+            for child in cls.get_specialization_lookups().values():
+                for field in child._get_open_fields():
+                    if field.name not in names:
+                        names.add(field.name)
+                        specialized_names.append(field.name)
+            return tuple(specialized_names)
+
+        return cls._get_cached("specialized_field_names", compute)
+
+    def _load_specialized_attributes(self):
+        """Copies the attributes of the specialization which are not present in self.
+        """
+        self._specialization_loaded = True
         if self.specialization != self:
-            for field in self.specialization.get_open_fields():
-                if field.name not in dir(self):
+            class_attributes = self._get_cached(
+                "class_attributes", lambda: frozenset(dir(self.__class__))
+            )
+            specialization = self.specialization
+            for field in specialization._get_open_fields():  # pylint: disable=W0212
+                if field.name in class_attributes:
+                    continue
+                if field.name in self.__dict__:
+                    # Attribute was set before the specialization was loaded
                     self._specialized_keys.append(field.name)
-                    setattr(self, field.name, getattr(self.specialization, field.name))
+                    setattr(self, field.name, self.__dict__[field.name])
+                else:
+                    self._specialized_keys.append(field.name)
+                    setattr(self, field.name, getattr(specialization, field.name))
+
+    def __getattr__(self, key):
+        """Loads specialized attributes if the specialization has not been loaded yet.
+
+        Only called if the attribute is not found by regular look ups.
+        """
+        if (
+            key.startswith("_")
+            or self.__dict__.get("_specialization_loaded", True)
+            or key not in self.get_specialized_field_names()
+        ):
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{key}'"
+            )
+
+        self._load_specialized_attributes()
+        if key not in self.__dict__:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{key}'"
+            )
+
+        return self.__dict__[key]
 
     @property
     def type(self) -> "Base":
@@ -139,6 +303,12 @@ class Base(models.Model):
         """Tries to set the attribute in specialization if it is a specialized attribute
         and else sets it in parent class.
         """
+        if (
+            self.__dict__.get("_specialization_loaded") is False
+            and key in self.get_specialized_field_names()
+        ):
+            self._load_specialized_attributes()
+
         if hasattr(self, "_specialized_keys") and key in self._specialized_keys:
             setattr(self.specialization, key, value)
         super().__setattr__(key, value)
@@ -177,19 +347,141 @@ class Base(models.Model):
         Raise errors here if the adding must fulfill checks.
         """
 
+    @classmethod
+    def check_m2m_consistency_bulk(
+        cls,
+        instances: List["Base"],
+        instances_to_add: List["Base"],
+        column: Optional[str] = None,
+    ):
+        """Method is called before adding the same instances to many many to many sets.
+
+        This happens if instances are added to the reverse relation of a many to many
+        field, e.g., ``a.b_set.add(b1, b2, ...)`` calls this method of ``B`` with
+        ``instances=[b1, b2, ...]`` and ``instances_to_add=[a]``.
+
+        The default implementation calls :meth:`Base.check_m2m_consistency` for each
+        instance. Overwrite this method to check all instances at once.
+
+        Arguments:
+            instances: The instances owning the many to many sets.
+            instances_to_add: The instances which are added to each set.
+            column: The name of the many to many field.
+
+        Raises:
+            ConsistencyError: If the check of an instance fails.
+        """
+        for instance in instances:
+            try:
+                instance.check_m2m_consistency(instances_to_add, column=column)
+            except Exception as error:
+                raise ConsistencyError(
+                    error,
+                    instance,
+                    data={"instances_to_add": instances_to_add, "column": column},
+                )
+
+    @classmethod
+    def _get_cached(cls, key: Any, compute: Callable[[], Any]) -> Any:
+        """Returns cached class meta data for the key and computes it if not present.
+
+        Arguments:
+            key: The identifier of the cached data.
+            compute: Function without arguments which computes the data.
+        """
+        cache = _FIELD_CACHE.setdefault(cls, {})
+        if key not in cache:
+            cache[key] = compute()
+        return cache[key]
+
+    @staticmethod
+    def clear_field_cache():
+        """Clears cached field meta data of all classes.
+
+        This is called automatically after apps are loaded and whenever a new model
+        class is prepared.
+        """
+        _FIELD_CACHE.clear()
+
+    @classmethod
+    def _get_open_fields(cls) -> Tuple[Field]:
+        """Returns cached tuple of fields for class which are editable.
+        """
+
+        def compute():
+            return tuple(
+                field
+                for field in cls._meta.get_fields()  # pylint: disable=W0212
+                if not (
+                    field.name in ["id", "user"]
+                    or not field.editable
+                    or field.name.endswith("_ptr")
+                )
+            )
+
+        return cls._get_cached("open_fields", compute)
+
     @classmethod
     def get_open_fields(cls) -> List[Field]:
         """Returns list of fields for class which are editable and non-ForeignKeys.
         """
-        fields = []
-        for field in cls._meta.get_fields():  # pylint: disable=W0212
-            if not (
-                field.name in ["id", "user"]
-                or not field.editable
-                or field.name.endswith("_ptr")
-            ):
-                fields.append(field)
-        return fields
+        return list(cls._get_open_fields())
+
+    @classmethod
+    def get_foreign_key_fields(cls) -> Tuple[models.ForeignKey]:
+        """Returns cached tuple of open fields which are ForeignKeys.
+        """
+        return cls._get_cached(
+            "foreign_key_fields",
+            lambda: tuple(
+                field
+                for field in cls._get_open_fields()
+                if isinstance(field, models.ForeignKey)
+            ),
+        )
+
+    @classmethod
+    def get_many_to_many_fields(cls) -> Tuple[models.ManyToManyField]:
+        """Returns cached tuple of open fields which are ManyToManyFields.
+        """
+        return cls._get_cached(
+            "many_to_many_fields",
+            lambda: tuple(
+                field
+                for field in cls._get_open_fields()
+                if isinstance(field, models.ManyToManyField)
+            ),
+        )
+
+    @classmethod
+    def get_column_fields(cls) -> Tuple[Field]:
+        """Returns cached tuple of open fields which are neither ForeignKeys nor
+        ManyToManyFields.
+        """
+        return cls._get_cached(
+            "column_fields",
+            lambda: tuple(
+                field
+                for field in cls._get_open_fields()
+                if not isinstance(field, (models.ForeignKey, models.ManyToManyField))
+            ),
+        )
+
+    @classmethod
+    def get_m2m_column(cls, through_table: str) -> Optional[str]:
+        """Returns the name of the many to many field which uses the through table.
+
+        Arguments:
+            through_table: The database table name of the through model.
+        """
+
+        def compute():
+            for field in cls.get_many_to_many_fields():
+                if field.m2m_db_table() == through_table:
+                    return field.name
+            return None
+
+        return cls._get_cached(("m2m_column", through_table), compute)
 
     @classmethod
     def get_label(cls) -> str:
@@ -204,10 +496,8 @@ class Base(models.Model):
         if self == self.specialization:
             kwargs = {
                 field.name: getattr(self, field.name)
-                for field in self.get_open_fields()
-                if not isinstance(field, models.ForeignKey)
-                and not isinstance(field, models.ManyToManyField)
-                and getattr(self, field.name) is not None
+                for field in self.get_column_fields()
+                if getattr(self, field.name) is not None
             }
             base = (
                 f"[{self.__class__.mro()[1].__name__}]"
@@ -235,12 +525,11 @@ class Base(models.Model):
             The keyword ``save_instance_only`` and ``check_consistency`` is not present
             in standard Django.
         """
-        if not self.user:
-            username = settings.DB_CONFIG.get("USER", None)
-            if username:
-                self.user, _ = User.objects.get_or_create(username=username)
-            else:
-                self.user, _ = User.objects.get_or_create(username="anonymous")
+        if self.user_id is None:
+            using = kwargs.get("using") or router.db_for_write(
+                self.__class__, instance=self
+            )
+            self.user = self.get_default_user(using=using)
 
         if self != self.specialization and not save_instance_only:
             self.specialization.save(*args, **kwargs)
@@ -249,6 +538,68 @@ class Base(models.Model):
 
         return self
 
+    @staticmethod
+    def get_default_user(using: Optional[str] = None) -> User:
+        """Returns the user which is stored with instances if no user is specified.
+
+        This is the user of the database connection (``settings.DB_CONFIG["USER"]``)
+        or "anonymous" if not present.
+        The user is cached per process and database.
+        Users which are created in a transaction are cached until the transaction is
+        rolled back.
+        The cache is cleared if users are changed or deleted
+        (see :meth:`Base.clear_default_user_cache`).
+
+        Arguments:
+            using: The database alias. Defaults to the default database.
+        """
+        using = using or DEFAULT_DB_ALIAS
+        username = settings.DB_CONFIG.get("USER", None) or "anonymous"
+        key = (using, username)
+
+        user = _DEFAULT_USERS.get(key)
+        if user is not None:
+            return user
+
+        if key in _PENDING_DEFAULT_USERS:
+            user, callback = _PENDING_DEFAULT_USERS[key]
+            # Django drops commit callbacks of rolled back transactions and savepoints
+            if any(entry[1] is callback for entry in connections[using].run_on_commit):
+                return user
+            _PENDING_DEFAULT_USERS.pop(key, None)
+
+        user, created = User.objects.db_manager(using).get_or_create(username=username)
+        if created and connections[using].in_atomic_block:
+
+            def callback():
+                _PENDING_DEFAULT_USERS.pop(key, None)
+                _DEFAULT_USERS.setdefault(key, user)
+
+            _PENDING_DEFAULT_USERS[key] = (user, callback)
+            transaction.on_commit(callback, using=using)
+        else:
+            _DEFAULT_USERS[key] = user
+
+        return user
+
+    @staticmethod
+    def clear_default_user_cache(user: Optional[User] = None):
+        """Clears the cached default users.
+
+        Arguments:
+            user: Only remove this user from the cache. Removes all users if None.
+        """
+        if user is None:
+            _DEFAULT_USERS.clear()
+            _PENDING_DEFAULT_USERS.clear()
+        else:
+            for key, cached_user in list(_DEFAULT_USERS.items()):
+                if cached_user.pk == user.pk:
+                    _DEFAULT_USERS.pop(key, None)
+            for key, (cached_user, _) in list(_PENDING_DEFAULT_USERS.items()):
+                if cached_user.pk == user.pk:
+                    _PENDING_DEFAULT_USERS.pop(key, None)
+
     @property
     def specialization(self) -> "Base":
         """Returns the specialization of the instance (children with the same id).
@@ -262,15 +613,114 @@ class Base(models.Model):
     def get_specialization(self) -> "Base":
         """Queries the dependency tree and returns the most specialized instance of the
         table.
+
+        Uses one query to identify the specialized class and one query to load the
+        specialized instance (if it is not the instance itself).
+        See also :meth:`espressodb.base.managers.BaseQuerySet.specialized`.
+        """
+        if self.pk is None or not self.get_specialization_lookups():
+            return self
+
+        using = self._state.db  # pylint: disable=W0212
+        queryset = BaseQuerySet(model=self.__class__, using=using).filter(pk=self.pk)
+        cls = queryset.specialized_classes().get(self.pk, self.__class__)
+        if cls == self.__class__:
+            return self
+
+        return cls._in_bulk_specialized([self.pk], using=using).get(self.pk, self)
+
+    @staticmethod
+    def prefetch_specializations(instances: List[Optional["Base"]]) -> List["Base"]:
+        """Loads the specializations of all instances in batches.
+
+        Uses one query per model and database to identify the specialized classes and
+        one query per specialized class to load the specializations.
+        Afterwards, specialized attributes and ``str`` of the instances do not query
+        the database.
+        Instances which already know their specialization and None entries are
+        skipped.
+
+        Arguments:
+            instances: The instances to specialize.
+
+        Returns:
+            The instances.
+        """
+        groups = {}
+        for instance in instances:
+            if instance is None or instance.pk is None:
+                continue
+            if instance._specialization is not None:  # pylint: disable=W0212
+                continue
+            key = (instance.__class__, instance._state.db)  # pylint: disable=W0212
+            groups.setdefault(key, []).append(instance)
+
+        for (model, using), group in groups.items():
+            specializations = {}
+            if model.get_specialization_lookups():
+                specializations = (
+                    BaseQuerySet(model=model, using=using)
+                    .filter(pk__in=[instance.pk for instance in group])
+                    ._load_specializations(skip_unspecialized=True)
+                )
+
+            for instance in group:
+                instance._specialization = specializations.get(  # pylint: disable=W0212
+                    instance.pk, instance
+                )
+                instance._load_specialized_attributes()  # pylint: disable=W0212
+
+        return instances
+
+    @classmethod
+    def get_specialization_lookups(cls) -> Dict[str, "Base"]:
+        """Returns query lookups for the primary keys of all concrete children of the
+        class.
+
+        Keys are lookups relative to the class, e.g., ``"contact__pk"`` for
+        ``Hamiltonian``, and values are the corresponding children.
+        The lookups are ordered by inheritance depth.
         """
-        instance = self
-        for cls in self.__class__.__subclasses__():
-            match = cls.objects.filter(id=self.id).first()
-            if match:  # use that the id is share among other subclasses.
-                instance = match.get_specialization()
-                break
 
-        return instance
+        def compute():
+            lookups = {}
+            parents = [("", cls)]
+            while parents:
+                children = []
+                for prefix, parent in parents:
+                    for child in parent.__subclasses__():
+                        ptr = child._meta.parents.get(parent)  # pylint: disable=W0212
+                        if ptr is None:  # proxy or abstract children have no own table
+                            continue
+                        path = prefix + ptr.related_query_name()
+                        lookups[f"{path}__pk"] = child
+                        children.append((f"{path}__", child))
+                parents = children
+            return lookups
+
+        return dict(cls._get_cached("specialization_lookups", compute))
+
+    @classmethod
+    def _in_bulk_specialized(
+        cls, pks: List[int], using: Optional[str] = None
+    ) -> Dict[int, "Base"]:
+        """Loads instances of the class which are known to be the most specialized
+        instances for the given primary keys.
+
+        The instances do not query their specialization on init.
+
+        Arguments:
+            pks: The primary keys to load.
+            using: The database alias.
+        """
+        with _deferred_specialization():
+            instances = cls._base_manager.using(using).in_bulk(pks)
+
+        for instance in instances.values():
+            instance._specialization = instance  # pylint: disable=W0212
+            instance._specialization_loaded = True  # pylint: disable=W0212
+
+        return instances
 
     @classmethod
     def _get_child_by_name(cls, class_name=str) -> "Base":
@@ -343,13 +793,31 @@ class Base(models.Model):
             _class_name:
                 This key is used internaly to identified the specialization of the base
                 object.
+
+        Results are cached per class, tree and class name.
         """
         tree = tree or {}
 
+        try:
+            key = ("recursive_columns", frozenset(tree.items()), _class_name)
+        except TypeError:  # unhashable tree values
+            return cls._get_recursive_columns(tree, _class_name=_class_name)
+
+        columns = cls._get_cached(
+            key, lambda: cls._get_recursive_columns(tree, _class_name=_class_name)
+        )
+        return {key: list(val) for key, val in columns.items()}
+
+    @classmethod
+    def _get_recursive_columns(
+        cls, tree: Dict[str, Any], _class_name: Optional[str] = None
+    ) -> Tuple[Dict[str, List[str]]]:
+        """Computes :meth:`Base.get_recursive_columns` without caching.
+        """
         specialization = cls._get_child_by_name(_class_name) if _class_name else cls
 
         columns = {}
-        for field in specialization.get_open_fields():
+        for field in specialization._get_open_fields():
 
             if isinstance(field, models.ForeignKey):
 
@@ -370,81 +838,116 @@ class Base(models.Model):
         return columns
 
     @classmethod
-    def _get_or_create_fk(  # pylint: disable=R0913
-        cls,
-        field: models.ForeignKey,
-        parameters: Dict[str, Any],
-        tree: Optional[Dict[str, Any]] = None,
-        dry_run: bool = False,
-        _recursion_level: int = 0,
-    ) -> Tuple["Base", bool]:
-        """Recursively iterates ForeignKey field and tries to construc the foreign keys
-        from parameters and parse tree using `get_or_create_from_parameters`.
+    def get_flat_lookups(
+        cls, tree: Optional[Dict[str, Any]] = None, _class_name: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Returns flat column names mapped to query lookups of the class and the
+        foreign keys of the tree.
+
+        Column names of foreign key dependencies are dotted, e.g.,
+        ``"hamiltonian.n_sites"``, lookups follow the foreign keys and the tables of
+        the chosen specializations, e.g., ``"hamiltonian__contact__n_sites"``.
+        Foreign keys map to the id of the related instance.
+        Many to many fields are ignored.
 
         Arguments:
-            field:
-                The foreign key field to get or create.
-            parameters:
-                The construction / query arguments. These parameters are shared among
-                all constructions.
             tree:
                 The tree of ForeignKey dependencies. This specify which class the
                 ForeignKey will take since only the base class is linked against.
                 Keys are strings corresponding to model fields, values are either
                 strings corresponding to classes
-            dry_run:
-                Do not insert in database.
-            _recursion_level:
-                This key is used internaly to track number of recursions.
-
-        Example:
-
-            .. code::
-
-                class B(Base):
-                    key2 = IntegerField() # or ForeignKey(C)
-
-                class A(Base):
-                    key1 = ForeignKey(B)
+            _class_name:
+                This key is used internaly to identified the specialization of the base
+                object.
 
-                tree={"key1": "B"}
-                # or if B also depends on Foreign Keys
-                tree={"key1": "B", "key1.key2": "C"}
-                ```
+        Results are cached per class, tree and class name.
         """
         tree = tree or {}
 
-        sub_class_name = tree.get(field.name, None)
-        if sub_class_name is not None:
-            sub_tree = cls.get_sub_info(field.name, tree)
+        try:
+            key = ("flat_lookups", frozenset(tree.items()), _class_name)
+        except TypeError:  # unhashable tree values
+            return cls._get_flat_lookups(tree, _class_name=_class_name)
 
-            # get general parameters
-            sub_pars = {
-                key: val for key, val in parameters.items() if len(key.split(".")) == 1
-            }
-            # now update keys with more specialized keys
-            sub_pars.update(cls.get_sub_info(field.name, parameters))
-
-            instance, created = field.related_model.get_or_create_from_parameters(
-                sub_pars,
-                tree=sub_tree,
-                dry_run=dry_run,
-                _class_name=sub_class_name,
-                _recursion_level=_recursion_level,
+        return dict(
+            cls._get_cached(
+                key, lambda: cls._get_flat_lookups(tree, _class_name=_class_name)
             )
+        )
 
-        else:
-            instance, created = None, False
-            if not field.null:
-                raise KeyError(
-                    "Tree for parsing classes did not contain"
-                    f" value for non-null foreign key {field.name}"
+    @classmethod
+    def _get_flat_lookups(
+        cls, tree: Dict[str, Any], _class_name: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Computes :meth:`Base.get_flat_lookups` without caching.
+        """
+        specialization = cls._get_child_by_name(_class_name) if _class_name else cls
+        # Fields of children are looked up through their table, e.g., "contact__c"
+        prefixes = {
+            child: lookup[: -len("pk")]
+            for lookup, child in cls.get_specialization_lookups().items()
+        }
+
+        lookups = {}
+        for field in specialization._get_open_fields():
+            if field.many_to_many:
+                continue
+
+            lookup = prefixes.get(field.model, "") + field.name
+            lookups[field.name] = lookup
+
+            sub_class_name = tree.get(field.name, None)
+            if isinstance(field, models.ForeignKey) and sub_class_name is not None:
+                sub_lookups = field.related_model.get_flat_lookups(
+                    tree=specialization.get_sub_info(field.name, tree),
+                    _class_name=sub_class_name,
                 )
+                for name, sub_lookup in sub_lookups.items():
+                    lookups[f"{field.name}.{name}"] = f"{lookup}__{sub_lookup}"
 
-        return instance, created
+        return lookups
+
+    @classmethod
+    def get_parameter_plan(
+        cls, tree: Optional[Dict[str, Any]] = None, _class_name: Optional[str] = None
+    ) -> ParameterPlan:
+        """Returns the compiled plan for creating the class and its dependencies from
+        parameters.
+
+        The plan resolves the classes of the ``tree`` once and can be executed many
+        times (see :class:`espressodb.base.plans.ParameterPlan`).
+        Plans are cached per class, tree and class name.
+
+        Arguments:
+            tree:
+                The tree of ForeignKey dependencies. This specify which class the
+                ForeignKey will take since only the base class is linked against.
+                Keys are strings corresponding to model fields, values are either
+                strings corresponding to classes
+            _class_name:
+                This key is used internaly to identified the specialization of the base
+                object.
+
+        Example:
+
+            .. code-block:: python
+
+                plan = Eigenvalue.get_parameter_plan(tree={"hamiltonian": "Contact"})
+                for pars in parameters:
+                    instance, created = plan.get_or_create(pars)
+        """
+        tree = tree or {}
+
+        try:
+            key = ("parameter_plan", frozenset(tree.items()), _class_name)
+        except TypeError:  # unhashable tree values
+            return ParameterPlan(cls, tree, class_name=_class_name)
+
+        return cls._get_cached(
+            key, lambda: ParameterPlan(cls, tree, class_name=_class_name)
+        )
 
     @classmethod
-    @transaction.atomic
     def get_or_create_from_parameters(  # pylint: disable=C0202, R0913, R0914, R0912
         calling_cls,
         parameters: Dict[str, Any],
@@ -540,59 +1043,277 @@ class Base(models.Model):
                 a0.c.c2.b1 == 2  # a.c.c2 is BA through tree
                 a0.c.c2.b2 == 3
         """
-        # parse full dependency and warn if duplicate columns
-        indent = "|" if _recursion_level else ""
-        indent += "-" * _recursion_level * 2
+        plan = calling_cls.get_parameter_plan(tree, _class_name=_class_name)
+        return plan.get_or_create(
+            parameters, dry_run=dry_run, _recursion_level=_recursion_level
+        )
+
+    @classmethod
+    def get_or_create_many_from_parameters(  # pylint: disable=C0202, R0913, R0914
+        calling_cls,
+        parameters: List[Dict[str, Any]],
+        tree: Optional[Dict[str, Any]] = None,
+        dry_run: bool = False,
+        batch_size: Optional[int] = None,
+        _class_name: Optional[str] = None,
+        _recursion_level: int = 0,
+    ) -> List[Tuple["Base", bool]]:
+        """Creates classes and dependencies for many parameter sets at once.
+
+        This method is the bulk version of :meth:`Base.get_or_create_from_parameters`
+        and accepts the same ``tree`` and parameter conventions.
+        Instead of querying each row, parameters which are identical for a table and
+        its dependencies are merged, each table is queried with one ``Q | Q | ...``
+        lookup per batch and missing rows are inserted using ``bulk_create``.
+        Dependencies are created bottom up.
+
+        Arguments:
+            calling_cls:
+                The top class which starts the get or create chain.
+
+            parameters:
+                List of construction / query arguments.
+                Each entry follows the conventions of
+                :meth:`Base.get_or_create_from_parameters`.
 
-        cls = (
-            calling_cls._get_child_by_name(_class_name) if _class_name else calling_cls
+            tree:
+                The tree of ForeignKey dependencies. This specify which class the
+                ForeignKey will take since only the base class is linked against.
+                Keys are strings corresponding to model fields, values are either
+                strings corresponding to classes
+
+            dry_run:
+                Do not insert in database.
+                Missing instances (and dependencies) are returned unsaved and
+                flagged as created.
+
+            batch_size:
+                Maximal number of rows per query and insert.
+                Defaults to the maximal number of query parameters of the database.
+
+            _class_name:
+                This key is used internaly to identified the specialization
+                of the base object.
+
+            _recursion_level:
+                This key is used internaly to track number of recursions.
+
+        Returns:
+            Instances and created flags in the order of the parameters.
+            If parameters are repeated, only the first occurrence is flagged as
+            created.
+
+        Note:
+            Models which inherit from other tables (e.g., ``Contact(Hamiltonian)``) can
+            not be bulk inserted by Django and are saved row by row.
+
+        Example:
+
+            .. code-block:: python
+
+                results = Eigenvalue.get_or_create_many_from_parameters(
+                    [
+                        {"n_sites": 10, "spacing": 0.1, "c": -1, "n_level": n, "value": v}
+                        for n, v in enumerate(values)
+                    ],
+                    tree={"hamiltonian": "Contact"},
+                )
+                eigenvalues = [instance for instance, created in results]
+        """
+        plan = calling_cls.get_parameter_plan(tree, _class_name=_class_name)
+        return plan.get_or_create_many(
+            parameters,
+            dry_run=dry_run,
+            batch_size=batch_size,
+            _recursion_level=_recursion_level,
         )
 
-        if _recursion_level == 0:
-            for key, tables in cls.get_recursive_columns(tree).items():
-                if len(tables) > 1:
-                    LOGGER.debug(
-                        "Column %s is used by the following tables %s", key, tables
+    @classmethod
+    def _get_lookup_key(cls, kwargs: Dict[str, Any]) -> Tuple[Tuple[str, Any]]:
+        """Returns a hashable representation of the lookup kwargs which is independent
+        of the Python type of the values.
+
+        E.g., ``{"spacing": 0.1}`` and ``{"spacing": Decimal("0.100")}`` have the same
+        key for a decimal field with three decimal places.
+        """
+        key = []
+        for name in sorted(kwargs):
+            field = cls._meta.get_field(name)  # pylint: disable=W0212
+            value = kwargs[name]
+            if isinstance(value, models.Model):
+                # unsaved instances of dry runs are only equal to themselves
+                value = value.pk if value.pk is not None else ("unsaved", id(value))
+            elif value is not None and not field.is_relation:
+                value = field.to_python(field.get_db_prep_save(value, connection))
+            key.append((name, value))
+        return tuple(key)
+
+    @classmethod
+    def _filter_many(
+        cls,
+        lookups: Dict[Tuple[Tuple[str, Any]], Dict[str, Any]],
+        batch_size: Optional[int] = None,
+    ) -> Dict[Tuple[Tuple[str, Any]], "Base"]:
+        """Queries instances matching the lookups with one query per batch.
+
+        Arguments:
+            lookups:
+                Map of lookup keys (see :meth:`Base._get_lookup_key`) to lookup kwargs.
+                All lookups must use the same field names.
+            batch_size:
+                Maximal number of lookups per query.
+
+        Raises:
+            MultipleObjectsReturned: If more than one instance matches a lookup.
+        """
+        if not lookups:
+            return {}
+
+        names = [name for name, _ in next(iter(lookups))]
+        # use attnames to not query foreign keys of each instance
+        attnames = {
+            name: cls._meta.get_field(name).attname  # pylint: disable=W0212
+            for name in names
+        }
+        max_query_params = connection.features.max_query_params
+        if batch_size is None:
+            batch_size = (
+                max(1, max_query_params // max(1, len(names)))
+                if max_query_params
+                else len(lookups)
+            )
+
+        items = list(lookups.values())
+        found = {}
+        for start in range(0, len(items), batch_size):
+            query = Q()
+            for kwargs in items[start : start + batch_size]:
+                query |= Q(**kwargs)
+
+            for instance in cls.objects.filter(query):
+                key = cls._get_lookup_key(
+                    {name: getattr(instance, attnames[name]) for name in names}
+                )
+                if key not in lookups:
+                    continue
+                if key in found and found[key].pk != instance.pk:
+                    raise cls.MultipleObjectsReturned(
+                        f"Found more than one {cls.__name__} for {lookups[key]}."
                     )
+                found[key] = instance
 
-        LOGGER.debug("%sPreparing creation of %s", indent, cls)
+        return found
 
-        kwargs = {}
-        for field in cls.get_open_fields():
+    @classmethod
+    def _get_or_create_many(
+        cls,
+        kwargs_list: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        dry_run: bool = False,
+    ) -> List[Tuple["Base", bool]]:
+        """Bulk version of ``cls.objects.get_or_create(**kwargs)``.
 
-            if isinstance(field, models.ForeignKey):
-                instance, created = cls._get_or_create_fk(  # pylint: disable=W0212
-                    field,
-                    parameters,
-                    tree=tree,
-                    dry_run=dry_run,
-                    _recursion_level=_recursion_level + 1,
+        Existing instances are queried in batches and missing instances are inserted
+        with ``bulk_create``.
+        If ``dry_run`` is set, missing instances are returned unsaved.
+
+        Returns:
+            Instances and created flags in the order of the kwargs.
+            If kwargs are repeated, only the first occurrence is flagged as created.
+        """
+        keys = [cls._get_lookup_key(kwargs) for kwargs in kwargs_list]
+
+        lookups_by_names = {}
+        for key, kwargs in zip(keys, kwargs_list):
+            if any(
+                isinstance(value, models.Model) and value.pk is None
+                for value in kwargs.values()
+            ):  # depends on unsaved instances of a dry run -> not in database
+                continue
+            names = tuple(name for name, _ in key)
+            lookups_by_names.setdefault(names, {})[key] = kwargs
+
+        instances = {}
+        for lookups in lookups_by_names.values():
+            instances.update(cls._filter_many(lookups, batch_size=batch_size))
+
+        missing = {
+            key: kwargs
+            for key, kwargs in zip(keys, kwargs_list)
+            if key not in instances
+        }
+        if missing and dry_run:
+            instances.update((key, cls(**kwargs)) for key, kwargs in missing.items())
+        elif missing:
+            try:
+                created = cls._bulk_create_instances(
+                    [cls(**kwargs) for kwargs in missing.values()],
+                    batch_size=batch_size,
                 )
-                kwargs[field.name] = instance
+            except Exception as e:
+                LOGGER.error("Bulk create call for %s failed", cls)
+                raise e
+            instances.update(zip(missing, created))
 
-            else:
-                value = parameters.get(field.name, None)
-                if value is None and not (
-                    field.null or isinstance(field, models.ManyToManyField)
-                ):
-                    raise KeyError(
-                        f"Missing value for constructing {cls}."
-                        f" Parameter dictionary has no value for {field.name}."
-                        f" Here are the keys {parameters.keys()}."
-                    )
-                elif value is not None:
-                    kwargs[field.name] = field.get_db_prep_value(value, connection)
+        results = []
+        created = set(missing)
+        for key in keys:
+            results.append((instances[key], key in created))
+            created.discard(key)
 
-        try:
-            instance, created = cls.objects.get_or_create(**kwargs)
-        except Exception as e:
-            LOGGER.error(
-                "Get or create call for %s failed with kwargs\n%s", cls, kwargs
-            )
-            raise e
+        return results
+
+    @classmethod
+    def _bulk_create_instances(
+        cls, instances: List["Base"], batch_size: Optional[int] = None
+    ) -> List["Base"]:
+        """Inserts instances using ``bulk_create`` after running the pre save logic and
+        consistency checks.
+
+        Models which inherit from other tables are saved row by row.
+
+        Returns:
+            The inserted instances including their primary keys.
+        """
+        if cls._meta.parents:  # pylint: disable=W0212
+            for instance in instances:
+                instance.save()
+            return instances
+
+        cls.objects.bulk_create(instances, batch_size=batch_size)
+
+        if all(instance.pk is not None for instance in instances):
+            return instances
+
+        # Some backends do not return primary keys -> query inserted rows
+        names = [
+            field.name
+            for field in cls._get_open_fields()
+            if field.concrete and not field.many_to_many
+        ]
+        lookups = {}
+        for instance in instances:
+            kwargs = {name: getattr(instance, name) for name in names}
+            lookups[cls._get_lookup_key(kwargs)] = kwargs
+        found = cls._filter_many(lookups, batch_size=batch_size)
+        return [
+            found[
+                cls._get_lookup_key({name: getattr(instance, name) for name in names})
+            ]
+            for instance in instances
+        ]
+
+
+def _add_base_indexes(sender, **kwargs):  # pylint: disable=W0613
+    """Adds the indexes of :meth:`Base.build_base_indexes` to new concrete models.
+    """
+    if issubclass(sender, Base) and not sender._meta.abstract:
+        indexes = sender.build_base_indexes()
+        if indexes:
+            meta = sender._meta
+            meta.indexes += indexes
+            # Migrations only consider explicitly declared indexes
+            meta.original_attrs["indexes"] = meta.indexes
 
-        LOGGER.debug(
-            "%sCreated %s" if created else "%sFetched %s from db", indent, instance
-        )
 
-        return instance, created
+models.signals.class_prepared.connect(_add_base_indexes)
@@ -0,0 +1,350 @@
+"""This module provides compiled plans for creating
+:class:`espressodb.base.models.Base` instances and their dependencies from parameters.
+
+A :class:`ParameterPlan` resolves the dependency ``tree`` of a model once.
+It can be executed many times and only binds values and queries the database.
+
+Example:
+
+    .. code-block:: python
+
+        plan = Eigenvalue.get_parameter_plan(tree={"hamiltonian": "Contact"})
+
+        for pars in parameters:
+            instance, created = plan.get_or_create(pars)
+
+        # or in bulk
+        results = plan.get_or_create_many(parameters)
+"""
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Optional
+from typing import Any
+from typing import FrozenSet
+
+import logging
+
+from django.db import models
+from django.db import connection
+from django.db import transaction
+
+
+LOGGER = logging.getLogger("base")
+
+
+class ParameterPlan:
+    """Compiled dependency tree of a model for ``get_or_create_from_parameters``.
+
+    The plan stores the resolved (specialized) classes, the column fields which are
+    populated from parameters and the sub plans of all foreign keys in the order they
+    have to be created.
+
+    Plans should be obtained from :meth:`espressodb.base.models.Base.get_parameter_plan`
+    which caches plans per model and tree.
+    """
+
+    def __init__(
+        self,
+        model: "espressodb.base.models.Base",
+        tree: Optional[Dict[str, Any]] = None,
+        class_name: Optional[str] = None,
+    ):
+        """Resolves the classes of the tree and the fields which will be populated.
+
+        Arguments:
+            model:
+                The (base) model to create.
+            tree:
+                The tree of ForeignKey dependencies. This specify which class the
+                ForeignKey will take since only the base class is linked against.
+                Keys are strings corresponding to model fields, values are either
+                strings corresponding to classes
+            class_name:
+                The name of the specialization of the model to create.
+
+        Raises:
+            KeyError:
+                If a class name can not be resolved or the tree has no entry for a
+                non-null foreign key.
+        """
+        tree = tree or {}
+        self.model = (
+            model._get_child_by_name(class_name)  # pylint: disable=W0212
+            if class_name
+            else model
+        )
+        self.tree = tree
+
+        self.columns: Tuple[models.Field] = tuple(
+            field
+            for field in self.model._get_open_fields()  # pylint: disable=W0212
+            if not isinstance(field, models.ForeignKey)
+        )
+        self.foreign_keys: Tuple[
+            Tuple[models.ForeignKey, Optional[ParameterPlan]]
+        ] = tuple(
+            (field, self._compile_foreign_key(field, tree))
+            for field in self.model.get_foreign_key_fields()
+        )
+
+        self.duplicate_columns: Dict[str, List[str]] = {
+            key: tables
+            for key, tables in self.model.get_recursive_columns(tree).items()
+            if len(tables) > 1
+        }
+        self.parameter_roots: FrozenSet[str] = frozenset(
+            [field.name for field in self.columns]
+            + [field.name for field, _ in self.foreign_keys]
+            + [
+                root
+                for _, plan in self.foreign_keys
+                if plan is not None
+                for root in plan.parameter_roots
+            ]
+        )
+
+    def _compile_foreign_key(
+        self, field: models.ForeignKey, tree: Dict[str, Any]
+    ) -> Optional["ParameterPlan"]:
+        """Returns the plan for the foreign key or None if not present in the tree.
+
+        Raises:
+            KeyError: If the tree has no entry for a non-null foreign key.
+        """
+        sub_class_name = tree.get(field.name, None)
+        if sub_class_name is None:
+            if not field.null:
+                raise KeyError(
+                    "Tree for parsing classes did not contain"
+                    f" value for non-null foreign key {field.name}"
+                )
+            return None
+
+        sub_tree = self.model.get_sub_info(field.name, tree)
+        return field.related_model.get_parameter_plan(
+            tree=sub_tree, _class_name=sub_class_name
+        )
+
+    def __repr__(self) -> str:
+        return f"ParameterPlan({self.model.__name__}, tree={self.tree})"
+
+    @staticmethod
+    def route(field_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns the parameters of a foreign key.
+
+        These are all general (non-dotted) parameters updated by the parameters
+        specialized for the foreign key, e.g., ``"hamiltonian.c"``.
+        """
+        prefix = field_name + "."
+        sub_pars = {}
+        specialized = {}
+        for key, val in parameters.items():
+            if "." not in key:
+                sub_pars[key] = val
+            elif key.startswith(prefix):
+                specialized[key[len(prefix) :]] = val
+        sub_pars.update(specialized)
+        return sub_pars
+
+    def _log_duplicate_columns(self):
+        for key, tables in self.duplicate_columns.items():
+            LOGGER.debug("Column %s is used by the following tables %s", key, tables)
+
+    def get_kwargs(
+        self,
+        parameters: Dict[str, Any],
+        foreign_keys: Dict[str, Optional["espressodb.base.models.Base"]],
+    ) -> Dict[str, Any]:
+        """Returns the construction / query arguments of the model.
+
+        Arguments:
+            parameters: The parameters of the model.
+            foreign_keys: The instances of the foreign keys of the model.
+
+        Raises:
+            KeyError: If a value of a non-null column is missing.
+        """
+        kwargs = {}
+        for field in self.columns:
+            value = parameters.get(field.name, None)
+            if value is None and not (
+                field.null or isinstance(field, models.ManyToManyField)
+            ):
+                raise KeyError(
+                    f"Missing value for constructing {self.model}."
+                    f" Parameter dictionary has no value for {field.name}."
+                    f" Here are the keys {parameters.keys()}."
+                )
+            elif value is not None:
+                kwargs[field.name] = field.get_db_prep_value(value, connection)
+
+        kwargs.update(foreign_keys)
+        return kwargs
+
+    @transaction.atomic
+    def get_or_create(
+        self,
+        parameters: Dict[str, Any],
+        dry_run: bool = False,
+        _recursion_level: int = 0,
+    ) -> Tuple["espressodb.base.models.Base", bool]:
+        """Gets or creates the model and its dependencies from parameters.
+
+        See :meth:`espressodb.base.models.Base.get_or_create_from_parameters`.
+
+        Arguments:
+            parameters:
+                The construction / query arguments.
+                These parameters are shared among all constructions.
+            dry_run:
+                Do not insert in database.
+            _recursion_level:
+                This key is used internaly to track number of recursions.
+        """
+        indent = "|" if _recursion_level else ""
+        indent += "-" * _recursion_level * 2
+
+        if _recursion_level == 0:
+            self._log_duplicate_columns()
+
+        LOGGER.debug("%sPreparing creation of %s", indent, self.model)
+
+        foreign_keys = {}
+        for field, plan in self.foreign_keys:
+            foreign_keys[field.name] = (
+                plan.get_or_create(
+                    self.route(field.name, parameters),
+                    dry_run=dry_run,
+                    _recursion_level=_recursion_level + 1,
+                )[0]
+                if plan is not None
+                else None
+            )
+
+        kwargs = self.get_kwargs(parameters, foreign_keys)
+
+        try:
+            instance, created = self.model.objects.get_or_create(**kwargs)
+        except Exception as e:
+            LOGGER.error(
+                "Get or create call for %s failed with kwargs\n%s", self.model, kwargs
+            )
+            raise e
+
+        LOGGER.debug(
+            "%sCreated %s" if created else "%sFetched %s from db", indent, instance
+        )
+
+        return instance, created
+
+    def _get_unique_parameters(
+        self, parameters: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """Merges parameters which are identical for the model and its dependencies.
+
+        Returns:
+            The unique parameters and, for each input parameter, the index of the
+            corresponding unique parameter.
+        """
+        unique_parameters = []
+        indices = {}
+        positions = []
+        for pars in parameters:
+            relevant = {
+                key: val
+                for key, val in pars.items()
+                if key.split(".")[0] in self.parameter_roots
+            }
+            try:
+                key = tuple(sorted(relevant.items()))
+                hash(key)
+            except TypeError:  # unhashable values are not merged
+                key = ("__position__", len(positions))
+
+            if key not in indices:
+                indices[key] = len(unique_parameters)
+                unique_parameters.append(relevant)
+            positions.append(indices[key])
+
+        return unique_parameters, positions
+
+    @transaction.atomic
+    def get_or_create_many(
+        self,
+        parameters: List[Dict[str, Any]],
+        dry_run: bool = False,
+        batch_size: Optional[int] = None,
+        _recursion_level: int = 0,
+    ) -> List[Tuple["espressodb.base.models.Base", bool]]:
+        """Gets or creates the model and its dependencies for many parameter sets.
+
+        See :meth:`espressodb.base.models.Base.get_or_create_many_from_parameters`.
+
+        Arguments:
+            parameters:
+                List of construction / query arguments.
+            dry_run:
+                Do not insert in database and return unsaved instances instead.
+            batch_size:
+                Maximal number of rows per query and insert.
+            _recursion_level:
+                This key is used internaly to track number of recursions.
+        """
+        indent = "|" if _recursion_level else ""
+        indent += "-" * _recursion_level * 2
+
+        if _recursion_level == 0:
+            self._log_duplicate_columns()
+
+        unique_parameters, positions = self._get_unique_parameters(parameters)
+
+        LOGGER.debug(
+            "%sPreparing creation of %d unique %s",
+            indent,
+            len(unique_parameters),
+            self.model,
+        )
+
+        foreign_keys = [{} for _ in unique_parameters]
+        for field, plan in self.foreign_keys:
+            if plan is None:
+                instances = [None] * len(unique_parameters)
+            else:
+                instances = [
+                    instance
+                    for instance, _ in plan.get_or_create_many(
+                        [self.route(field.name, pars) for pars in unique_parameters],
+                        dry_run=dry_run,
+                        batch_size=batch_size,
+                        _recursion_level=_recursion_level + 1,
+                    )
+                ]
+            for fks, instance in zip(foreign_keys, instances):
+                fks[field.name] = instance
+
+        kwargs_list = [
+            self.get_kwargs(pars, fks)
+            for pars, fks in zip(unique_parameters, foreign_keys)
+        ]
+
+        unique_results = self.model._get_or_create_many(  # pylint: disable=W0212
+            kwargs_list, batch_size=batch_size, dry_run=dry_run
+        )
+
+        LOGGER.debug(
+            "%sCreated %d and fetched %d %s",
+            indent,
+            sum(created for _, created in unique_results),
+            sum(not created for _, created in unique_results),
+            self.model,
+        )
+
+        results = []
+        visited = set()
+        for position in positions:
+            instance, created = unique_results[position]
+            results.append((instance, created and position not in visited))
+            visited.add(position)
+
+        return results
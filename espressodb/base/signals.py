@@ -2,8 +2,10 @@
 
 Includes checks to run on save.
 """
+from django.contrib.auth.models import User
 from django.db.models import Model
-from django.db.models.signals import pre_save, m2m_changed
+from django.db.models.signals import pre_save, m2m_changed, class_prepared
+from django.db.models.signals import post_save, post_delete, post_migrate
 from django.dispatch import receiver
 
 from espressodb.base.models import Base
@@ -38,6 +40,8 @@ def base_m2m_add_handler(sender: Model, **kwargs):
     """Runs many to many pre add logic of Base class
 
     This calls the check_m2m_consistency method of the class containing the m2m column.
+    For reverse adds, all affected instances are queried at once and passed to the
+    ``check_m2m_consistency_bulk`` method of the class.
 
     Note:
         For revese adding elements, the pk_set is sorted.
@@ -63,27 +67,29 @@ def base_m2m_add_handler(sender: Model, **kwargs):
         return
 
     # Identify the name of the m2m attr within this class
-    through_table = sender._meta.db_table  # pylint: disable=W0212
-    column = None
-    for field in m2m_cls.get_open_fields():
-        if field.many_to_many and field.m2m_db_table() == through_table:
-            column = field.name
-            break
+    column = m2m_cls.get_m2m_column(sender._meta.db_table)  # pylint: disable=W0212
 
     if reverse:
-        # a1.check_m2m_consistency((b,))
-        # a2.check_m2m_consistency((b,))
+        # B.check_m2m_consistency_bulk([a1, a2, ...], (b,))
         instances_to_add = instance.__class__.objects.filter(pk=instance.pk)
-        for pk in sorted(pk_set):
-            instance = m2m_cls.objects.get(pk=pk)
-            try:
-                instance.check_m2m_consistency(instances_to_add, column=column)
-            except Exception as error:
-                raise ConsistencyError(
-                    error,
-                    instance,
-                    data={"instances_to_add": instances_to_add, "column": column},
-                )
+        instances = m2m_cls.objects.in_bulk(pk_set)
+        instances = [instances[pk] for pk in sorted(pk_set) if pk in instances]
+        try:
+            m2m_cls.check_m2m_consistency_bulk(
+                instances, instances_to_add, column=column
+            )
+        except ConsistencyError:
+            raise
+        except Exception as error:
+            raise ConsistencyError(
+                error,
+                instance,
+                data={
+                    "instances": instances,
+                    "instances_to_add": instances_to_add,
+                    "column": column,
+                },
+            )
 
     else:
         # b.check_m2m_consistency((a1, a2, ...))
@@ -96,3 +102,31 @@ def base_m2m_add_handler(sender: Model, **kwargs):
                 instance,
                 data={"instances_to_add": instances_to_add, "column": column},
             )
+
+
+@receiver(class_prepared)
+def base_class_prepared_handler(sender: Model, **kwargs):  # pylint: disable=W0613
+    """Clears the field meta data cache of Base classes when a new model is prepared.
+
+    New models may add children to existing classes which changes their
+    specializations.
+    """
+    if issubclass(sender, Base):
+        Base.clear_field_cache()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed_handler(sender: User, **kwargs):  # pylint: disable=W0613
+    """Removes changed or deleted users from the default user cache.
+    """
+    instance = kwargs.get("instance")
+    if instance is not None:
+        Base.clear_default_user_cache(instance)
+
+
+@receiver(post_migrate)
+def base_post_migrate_handler(sender, **kwargs):  # pylint: disable=W0613
+    """Clears the default user cache after migrations (or flushes) of the database.
+    """
+    Base.clear_default_user_cache()
@@ -8,15 +8,13 @@ from django.db.models import ForeignKey
 from django.db.models.fields import Field
 from django.template.defaultfilters import Truncator
 
-from django.urls import reverse, NoReverseMatch
-
-from django_extensions.management.commands.show_urls import Command as URLFinder
-
 from espressodb.management.utilities.settings import PROJECT_NAME
 from espressodb.management.utilities.version import get_repo_version
 from espressodb.management.utilities.version import get_db_info
 from espressodb.base.utilities.apps import get_apps_slug_map
 from espressodb.base.utilities.apps import get_app_name
+from espressodb.base.utilities.links import get_link_list
+from espressodb.base.utilities.links import DEFAULT_EXCLUDE
 from espressodb.base.forms import MODELS
 
 
@@ -24,9 +22,7 @@ register = template.Library()  # pylint: disable=C0103
 
 
 @register.inclusion_tag("link-list.html")
-def render_link_list(
-    exclude=("", "populate", "populate-result", "admin", "documentation")
-) -> List[Tuple[str, str]]:
+def render_link_list(exclude=DEFAULT_EXCLUDE) -> List[Tuple[str, str]]:
     """Renders all app page links
 
     Arguments:
@@ -37,6 +33,8 @@ def render_link_list(
         of Tuples with the reverse url name and display name.
 
     Ignores urls which do not result in a match.
+    Links are read from the registry which is computed once per URLconf (see
+    :func:`espressodb.base.utilities.links.get_link_list`).
 
     Uses the template ``link-list.html``.
 
@@ -44,44 +42,7 @@ def render_link_list(
         It is possible to give class based views the ``exclude_from_nav`` flag.
         If this flag is set, the view will not be rendered.
     """
-    urlconf = __import__(settings.ROOT_URLCONF, {}, {}, [""])
-
-    u = URLFinder()
-    view_infos = u.extract_views_from_urlpatterns(urlconf.urlpatterns)
-
-    urls = {}
-    for view, path, reverse_name in view_infos:
-
-        try:
-            reverse(reverse_name)
-        except NoReverseMatch:
-            continue
-
-        if path.split("/")[0] in exclude:
-            continue
-
-        cls = None
-        if hasattr(view, "view_class"):
-            cls = view.view_class
-        elif hasattr(view, "cls"):
-            cls = view.cls
-        if cls and hasattr(cls, "exclude_from_nav") and cls.exclude_from_nav:
-            continue
-
-        import_path = view.__module__.split(".")
-
-        if import_path[0] != PROJECT_NAME:
-            continue
-
-        app_name = import_path[1].capitalize()
-        link_name = reverse_name.split(":")[-1].capitalize()
-
-        if app_name in urls:
-            urls[app_name].append((link_name, reverse_name))
-        else:
-            urls[app_name] = [(link_name, reverse_name)]
-
-    context = {"urls": urls}
+    context = {"urls": get_link_list(exclude)}
 
     return context
 
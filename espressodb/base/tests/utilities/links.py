@@ -0,0 +1,39 @@
+"""Tests for the navigation link registry
+"""
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.urls import clear_url_caches
+
+from espressodb.base.utilities import links
+
+
+class LinkRegistryTest(SimpleTestCase):
+    """Test case for computing navigation links once per URLconf
+    """
+
+    def setUp(self):
+        """Clears the link registry
+        """
+        links.clear_link_list()
+
+    def test_registry(self):
+        """Tests if links are computed once and again after the URLconf reloads.
+        """
+        with patch.object(
+            links, "compute_link_list", wraps=links.compute_link_list
+        ) as compute:
+            link_list = links.get_link_list()
+            self.assertIs(links.get_link_list(), link_list)
+            self.assertEqual(compute.call_count, 1)
+
+            clear_url_caches()
+            self.assertEqual(links.get_link_list(), link_list)
+            self.assertEqual(compute.call_count, 2)
+
+    def test_immutable(self):
+        """Tests if the registry can not be modified.
+        """
+        link_list = links.get_link_list()
+        with self.assertRaises(TypeError):
+            link_list["Foo"] = ()
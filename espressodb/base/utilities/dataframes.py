@@ -0,0 +1,237 @@
+"""Helper functions for chunked DataFrame exports of querysets
+
+Chunks of a streamed queryset must have the same column types, independent of which
+values (or missing values) a chunk contains.
+Thus, column types are derived from the model fields (see :func:`get_dtypes`) and not
+from the data.
+Chunks are written to files one at a time (see :func:`write_dataframes`), so exports
+never hold the full table in memory.
+
+Example:
+    .. code-block:: python
+
+        Eigenvalue.objects.filter(n_level=0).export_dataframes(
+            "eigenvalues.parquet", fieldnames=["hamiltonian__id", "value"]
+        )
+
+    See :meth:`espressodb.base.managers.BaseQuerySet.iter_dataframes`.
+"""
+from typing import Dict
+from typing import List
+from typing import Iterable
+from typing import Optional
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+
+#: Maps internal field types to pandas dtypes which support missing values
+FIELD_DTYPES = {
+    "AutoField": "Int64",
+    "BigAutoField": "Int64",
+    "SmallAutoField": "Int64",
+    "IntegerField": "Int64",
+    "BigIntegerField": "Int64",
+    "SmallIntegerField": "Int64",
+    "PositiveIntegerField": "Int64",
+    "PositiveBigIntegerField": "Int64",
+    "PositiveSmallIntegerField": "Int64",
+    "FloatField": "Float64",
+    "DecimalField": "Float64",
+    "BooleanField": "boolean",
+    "NullBooleanField": "boolean",
+    "CharField": "string",
+    "TextField": "string",
+    "SlugField": "string",
+    "EmailField": "string",
+    "URLField": "string",
+    "DateField": "datetime64[ns]",
+    "DateTimeField": "datetime64[ns]",
+}
+
+#: Maps file suffixes to export formats
+FILE_FORMATS = {
+    ".parquet": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".h5": "hdf5",
+    ".hdf": "hdf5",
+    ".hdf5": "hdf5",
+}
+
+
+def get_field(model: models.Model, name: str) -> Optional[models.Field]:
+    """Returns the (related) field of the model for the lookup.
+
+    Foreign keys are resolved to the related primary key.
+
+    Arguments:
+        model: The model of the queryset.
+        name: The field name or lookup, e.g., ``"hamiltonian__n_sites"``.
+
+    Returns:
+        The field or None if not found (e.g., annotations) or not a column.
+    """
+    field = None
+    for part in name.split("__"):
+        if field is not None:
+            model = field.related_model
+        if model is None:
+            return None
+        try:
+            field = (
+                model._meta.pk  # pylint: disable=W0212
+                if part == "pk"
+                else model._meta.get_field(part)  # pylint: disable=W0212
+            )
+        except FieldDoesNotExist:
+            return None
+
+    while (field.many_to_one or field.one_to_one) and field.target_field is not field:
+        field = field.target_field
+
+    return None if field.many_to_many or field.one_to_many else field
+
+
+def get_dtypes(model: models.Model, fieldnames: List[str]) -> Dict[str, str]:
+    """Returns the pandas dtypes of the (related) fields of the model.
+
+    Aware date times are converted to UTC.
+    Columns which are not fields have the dtype ``"object"``.
+    """
+    dtypes = {}
+    for name in fieldnames:
+        field = get_field(model, name)
+        internal_type = field.get_internal_type() if field else None
+        if internal_type == "DateTimeField" and settings.USE_TZ:
+            dtypes[name] = "datetime64[ns, UTC]"
+        else:
+            dtypes[name] = FIELD_DTYPES.get(internal_type, "object")
+    return dtypes
+
+
+def get_max_lengths(model: models.Model, fieldnames: List[str]) -> Dict[str, int]:
+    """Returns the maximal lengths of (related) char fields of the model.
+    """
+    fields = {name: get_field(model, name) for name in fieldnames}
+    return {
+        name: field.max_length
+        for name, field in fields.items()
+        if field is not None and field.max_length
+    }
+
+
+def cast_dataframe(frame: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+    """Casts the columns of the frame to the dtypes.
+    """
+    for column, dtype in dtypes.items():
+        if dtype.startswith("datetime64"):
+            frame[column] = pd.to_datetime(frame[column], utc=dtype.endswith("UTC]"))
+        elif dtype != "object":
+            frame[column] = frame[column].astype(dtype)
+    return frame
+
+
+def get_file_format(path: str, file_format: Optional[str] = None) -> str:
+    """Returns the export format for the file.
+
+    Arguments:
+        path: The file name. The suffix determines the format if not given.
+        file_format: One of ``parquet``, ``feather`` or ``hdf5``.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    file_format = file_format or FILE_FORMATS.get(os.path.splitext(path)[1].lower())
+    if file_format not in FILE_FORMATS.values():
+        raise ValueError(
+            f"Unknown export format for {path}."
+            f" Use one of {sorted(set(FILE_FORMATS.values()))}."
+        )
+    return file_format
+
+
+def _to_numpy_dtypes(frame: pd.DataFrame) -> pd.DataFrame:
+    """Converts nullable extension dtypes to numpy dtypes (required by PyTables).
+
+    Integer and boolean columns with missing values become floats.
+    """
+    for column, dtype in frame.dtypes.items():
+        if isinstance(dtype, pd.StringDtype):
+            frame[column] = (
+                frame[column].astype(object).where(frame[column].notna(), np.nan)
+            )
+        elif isinstance(dtype, pd.api.extensions.ExtensionDtype) and not isinstance(
+            dtype, pd.DatetimeTZDtype
+        ):
+            frame[column] = frame[column].astype("float64")
+    return frame
+
+
+def write_dataframes(
+    chunks: Iterable[pd.DataFrame],
+    path: str,
+    file_format: Optional[str] = None,
+    key: str = "data",
+    min_itemsize: Optional[Dict[str, int]] = None,
+) -> int:
+    """Writes DataFrame chunks to one file without concatenating them.
+
+    Each chunk is written as a Parquet row group, an Arrow record batch (Feather) or
+    appended to an HDF5 table.
+    Parquet and Feather require ``pyarrow``, HDF5 requires ``tables``.
+    The schema of the file is determined by the first chunk.
+
+    Arguments:
+        chunks: The DataFrames with identical columns and dtypes.
+        path: The file to (over)write.
+        file_format: One of ``parquet``, ``feather`` or ``hdf5``.
+            Inferred from the suffix of ``path`` if not given.
+        key: The HDF5 group identifier.
+        min_itemsize: Maximal string length per column for HDF5 tables.
+
+    Returns:
+        The number of written rows.
+    """
+    file_format = get_file_format(path, file_format)
+    n_rows = 0
+
+    if file_format == "hdf5":
+        with pd.HDFStore(path, mode="w") as store:
+            for chunk in chunks:
+                store.append(
+                    key,
+                    _to_numpy_dtypes(chunk),
+                    format="table",
+                    index=False,
+                    min_itemsize=min_itemsize,
+                )
+                n_rows += len(chunk)
+        return n_rows
+
+    import pyarrow as pa  # pylint: disable=C0415
+    import pyarrow.parquet as pq  # pylint: disable=C0415
+
+    writer = schema = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = (
+                    pq.ParquetWriter(path, schema)
+                    if file_format == "parquet"
+                    else pa.ipc.new_file(path, schema)
+                )
+            writer.write_table(table.cast(schema))
+            n_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return n_rows
@@ -0,0 +1,197 @@
+"""Foreign key dependency graph of :class:`espressodb.base.models.Base` models
+
+The :class:`DependencyGraph` stores which models each model depends on and which
+specializations can be chosen for each dependency.
+It is computed once (see :func:`get_dependency_graph`) and used to resolve population
+trees without touching the models again.
+
+A population tree is fully determined by the root model and the choices made for
+dependencies with more than one option.
+These steps are encoded in a compact path, e.g., ``"4-1n"``, which identifies the state
+of the :class:`espressodb.base.views.PopulationView` wizard.
+"""
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Optional
+from typing import NamedTuple
+
+from functools import lru_cache
+
+from django.db import models
+
+from espressodb.base.models import Base
+from espressodb.base.utilities.models import get_espressodb_models
+from espressodb.base.utilities.markdown import convert_string
+
+
+class PopulationState(NamedTuple):
+    """The resolved state of a population tree.
+
+    Attributes:
+        root: The label of the root model.
+        tree: Column names mapped to the labels of the chosen models.
+        help: Column names mapped to the html help texts of the foreign keys.
+        column: The next column which needs a choice or None if the tree is complete.
+        options: The labels of the models which can be chosen for ``column``.
+    """
+
+    root: str
+    tree: Dict[str, str]
+    help: Dict[str, str]
+    column: Optional[str] = None
+    options: Tuple[str, ...] = ()
+
+
+class DependencyGraph:
+    """Directed acyclic graph of foreign key dependencies between models.
+
+    Nodes are model labels (see :meth:`espressodb.base.models.Base.get_label`).
+    """
+
+    def __init__(self, model_list: List[Base]):
+        """Collects the dependencies and choices of all models.
+
+        Foreign keys to models which are not in the list are ignored.
+
+        Arguments:
+            model_list: The models of the graph.
+        """
+        #: Labels mapped to models
+        self.models: Dict[str, Base] = {
+            model.get_label(): model for model in model_list
+        }
+        #: Sorted labels. Positions are used to encode paths.
+        self.labels: Tuple[str, ...] = tuple(sorted(self.models))
+        self._positions = {label: n for n, label in enumerate(self.labels)}
+
+        #: Labels mapped to tuples of foreign key name, label of the related model
+        #: and html help text
+        self.dependencies: Dict[str, Tuple[Tuple[str, str, str], ...]] = {}
+        #: Labels mapped to the labels of models which can be chosen for them
+        self.choices: Dict[str, Tuple[str, ...]] = {}
+
+        for label, model in self.models.items():
+            self.dependencies[label] = tuple(
+                (
+                    field.name,
+                    field.related_model.get_label(),
+                    convert_string(field.help_text),
+                )
+                for field in model.get_open_fields()
+                if isinstance(field, models.ForeignKey)
+                and issubclass(field.related_model, Base)
+                and field.related_model.get_label() in self.models
+            )
+            self.choices[label] = tuple(
+                sub.get_label()
+                for sub in model.__subclasses__()
+                if sub.get_label() in self.models
+            ) or (label,)
+
+        self._doc_urls: Dict[str, Optional[str]] = {}
+
+    def get_doc_url(self, label: str) -> Optional[str]:
+        """Returns the (cached) documentation url of the model.
+        """
+        if label not in self._doc_urls:
+            self._doc_urls[label] = self.models[label].get_doc_url()
+        return self._doc_urls[label]
+
+    def encode_path(self, steps: List[Tuple[str, bool]]) -> str:
+        """Encodes the steps as a compact string.
+
+        Each step is the position of the label in :attr:`labels` followed by ``n`` if
+        dependencies are not parsed.
+
+        Arguments:
+            steps: Labels of chosen models and if their dependencies are parsed.
+        """
+        return "-".join(
+            f"{self._positions[label]}{'' if parse_tree else 'n'}"
+            for label, parse_tree in steps
+        )
+
+    def decode_path(self, path: Optional[str]) -> List[Tuple[str, bool]]:
+        """Decodes the steps of a path created by :meth:`encode_path`.
+
+        Raises:
+            ValueError: If the path is invalid.
+        """
+        steps = []
+        for token in path.split("-") if path else []:
+            parse_tree = not token.endswith("n")
+            position = int(token if parse_tree else token[:-1])
+            if not 0 <= position < len(self.labels):
+                raise ValueError(f"Invalid population path {path}")
+            steps.append((self.labels[position], parse_tree))
+        return steps
+
+    def resolve(self, steps: List[Tuple[str, bool]]) -> PopulationState:
+        """Resolves the population tree for the steps.
+
+        The first step is the root model.
+        Following steps are the choices for dependencies with more than one option in
+        the order they are queried.
+        Dependencies with one option are chosen automatically.
+        Columns are ordered such that models can be created bottom up.
+
+        Arguments:
+            steps: Labels of chosen models and if their dependencies are parsed.
+
+        Returns:
+            The tree and the next open choice (if present).
+
+        Raises:
+            ValueError: If there are no steps or a choice is not a valid option.
+        """
+        if not steps:
+            raise ValueError("Population steps must contain the root model.")
+
+        pending = iter(steps)
+        label, parse_tree = next(pending)
+        if label not in self.models:
+            raise ValueError(f"Unknown model {label}")
+
+        root = label
+        tree = {}
+        help_texts = {}
+        todo = []
+        column = None
+
+        while True:
+            if column:
+                tree[column] = label
+
+            if parse_tree:
+                for name, sub_label, help_text in self.dependencies[label]:
+                    sub_column = f"{column}.{name}" if column else name
+                    todo.insert(0, (sub_column, sub_label))
+                    help_texts[sub_column] = help_text
+
+            if not todo:
+                return PopulationState(root, tree, help_texts)
+
+            column, base_label = todo.pop(0)
+            options = self.choices[base_label]
+
+            if len(options) == 1:
+                label = options[0]
+                continue
+
+            step = next(pending, None)
+            if step is None:
+                return PopulationState(root, tree, help_texts, column, options)
+
+            label, parse_tree = step
+            if label not in options:
+                raise ValueError(f"Model {label} is not an option for {column}")
+
+
+@lru_cache(maxsize=None)
+def get_dependency_graph() -> DependencyGraph:
+    """Returns the dependency graph of all project models.
+
+    The graph is computed on first call.
+    """
+    return DependencyGraph(get_espressodb_models())
@@ -0,0 +1,102 @@
+"""Registry of project page links displayed in the navigation bar
+
+The links are computed once per URLconf by walking all url patterns.
+Computed links are stored in immutable mappings and shared by all renders.
+The registry is tied to the URL resolver of the URLconf: if the URLconf is reloaded
+(e.g., :func:`django.urls.clear_url_caches` is called when ``ROOT_URLCONF`` changes),
+links are computed again.
+"""
+from typing import Dict
+from typing import Tuple
+from typing import Mapping
+
+from types import MappingProxyType
+
+from django.urls import get_resolver
+from django.urls import reverse
+from django.urls import NoReverseMatch
+from django.urls.resolvers import URLResolver
+
+from django_extensions.management.commands.show_urls import Command as URLFinder
+
+from espressodb.management.utilities.settings import PROJECT_NAME
+
+#: Link names which are not rendered in the navigation bar by default
+DEFAULT_EXCLUDE = ("", "populate", "populate-result", "admin", "documentation")
+
+#: Computed links by excluded names and the resolver they were computed for
+_LINK_REGISTRY: Dict[
+    Tuple[str, ...], Tuple[URLResolver, Mapping[str, Tuple[Tuple[str, str], ...]]]
+] = {}
+
+
+def compute_link_list(
+    resolver: URLResolver, exclude: Tuple[str, ...] = DEFAULT_EXCLUDE
+) -> Mapping[str, Tuple[Tuple[str, str], ...]]:
+    """Walks all url patterns of the resolver and collects links of project views.
+
+    Ignores urls which do not result in a match.
+    Views with the ``exclude_from_nav`` flag are not included.
+
+    Arguments:
+        resolver: The URL resolver of the URLconf.
+        exclude: The link names to exclude.
+
+    Returns:
+        Immutable mapping of app names to tuples of display and reverse url names.
+    """
+    view_infos = URLFinder().extract_views_from_urlpatterns(resolver.url_patterns)
+
+    urls = {}
+    for view, path, reverse_name in view_infos:
+
+        try:
+            reverse(reverse_name, urlconf=resolver.urlconf_name)
+        except NoReverseMatch:
+            continue
+
+        if path.split("/")[0] in exclude:
+            continue
+
+        cls = None
+        if hasattr(view, "view_class"):
+            cls = view.view_class
+        elif hasattr(view, "cls"):
+            cls = view.cls
+        if cls and hasattr(cls, "exclude_from_nav") and cls.exclude_from_nav:
+            continue
+
+        import_path = view.__module__.split(".")
+
+        if import_path[0] != PROJECT_NAME:
+            continue
+
+        app_name = import_path[1].capitalize()
+        link_name = reverse_name.split(":")[-1].capitalize()
+
+        urls.setdefault(app_name, []).append((link_name, reverse_name))
+
+    return MappingProxyType({app: tuple(links) for app, links in urls.items()})
+
+
+def get_link_list(
+    exclude: Tuple[str, ...] = DEFAULT_EXCLUDE,
+) -> Mapping[str, Tuple[Tuple[str, str], ...]]:
+    """Returns the links of the ``ROOT_URLCONF`` from the registry.
+
+    Links are computed by :func:`compute_link_list` on first access and whenever the
+    URL resolver changed.
+    """
+    exclude = tuple(exclude)
+    resolver = get_resolver()
+    entry = _LINK_REGISTRY.get(exclude)
+    if entry is None or entry[0] is not resolver:
+        entry = (resolver, compute_link_list(resolver, exclude))
+        _LINK_REGISTRY[exclude] = entry
+    return entry[1]
+
+
+def clear_link_list():
+    """Clears the link registry.
+    """
+    _LINK_REGISTRY.clear()
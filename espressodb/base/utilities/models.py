@@ -4,6 +4,8 @@ from typing import Optional
 from typing import Tuple
 from typing import List
 
+from django.db import connections
+from django.db import DatabaseError
 from django.db import models
 
 from espressodb.base.utilities.apps import get_project_apps
@@ -44,3 +46,73 @@ def iter_tree(model: Base, name: Optional[str] = None) -> List[Tuple[str, str]]:
             )
 
     return tree
+
+
+def get_indexed_field_names(model: models.Model) -> List[str]:
+    """Returns the names of fields which are the leading column of an index.
+
+    Considers primary keys, unique fields, fields with ``db_index`` (e.g., foreign
+    keys) and the first column of ``Meta.indexes``, ``unique_together`` and
+    unique constraints of the model and its concrete parents.
+
+    Arguments:
+        model: The model to inspect.
+    """
+    names = [
+        field.name
+        for field in model._meta.concrete_fields  # pylint: disable=W0212
+        if field.primary_key or field.unique or field.db_index
+    ]
+
+    for cls in [model] + model._meta.get_parent_list():  # pylint: disable=W0212
+        meta = cls._meta  # pylint: disable=W0212
+        columns = [index.fields for index in meta.indexes]
+        columns += [list(fields) for fields in meta.unique_together]
+        columns += [
+            constraint.fields
+            for constraint in meta.constraints
+            if isinstance(constraint, models.UniqueConstraint)
+        ]
+        for fields in columns:
+            if fields and fields[0].lstrip("-") not in names:
+                names.append(fields[0].lstrip("-"))
+
+    return names
+
+
+def get_estimated_count(model: models.Model, using: str = "default") -> Optional[int]:
+    """Returns the number of rows of the model table estimated by the query planner.
+
+    Uses ``reltuples`` of ``pg_class`` for PostgreSQL and ``sqlite_stat1`` for SQLite.
+    Estimates are only as recent as the last ``ANALYZE`` (or autovacuum) of the table.
+
+    Arguments:
+        model: The model to count.
+        using: The database alias.
+
+    Returns:
+        The estimate or None if the backend provides no (valid) estimate.
+    """
+    connection = connections[using]
+    table = model._meta.db_table  # pylint: disable=W0212
+
+    if connection.vendor == "postgresql":
+        query = "SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)"
+        table = connection.ops.quote_name(table)
+    elif connection.vendor == "sqlite":
+        query = "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1"
+    else:
+        return None
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(query, [table])
+            row = cursor.fetchone()
+    except DatabaseError:  # sqlite_stat1 does not exist before the first ANALYZE
+        return None
+
+    if row is None:
+        return None
+    estimate = int(float(str(row[0]).split()[0]))
+    # PostgreSQL reports -1 for tables which have never been analyzed
+    return estimate if estimate >= 0 else None
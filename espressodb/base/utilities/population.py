@@ -0,0 +1,166 @@
+"""Generates bulk population scripts for :class:`espressodb.base.models.Base` models
+
+Other than the single instance script of the population view (see
+:func:`espressodb.base.templatetags.base_extras.render_tree`), generated scripts fill a
+list of flat parameter dictionaries and insert all entries (and their dependencies)
+at once using :meth:`espressodb.base.models.Base.get_or_create_many_from_parameters`.
+
+Scripts are generated for all possible dependency trees of all leaf models in one pass
+using the :class:`espressodb.base.utilities.dependencies.DependencyGraph`.
+Parameter blocks of models are rendered once and shared by all trees.
+
+Example:
+    The script for an ``Eigenvalue`` of a ``Contact`` Hamiltonian reads
+
+    .. code-block:: python
+
+        from my_project.hamiltonian.models import Eigenvalue as hamiltonian_Eigenvalue
+
+        TREE = {
+            "hamiltonian": "Contact",
+        }
+
+        PARAMETERS = [
+            {
+                "hamiltonian.n_sites": None,  # Number of sites in one ...
+                ...
+                "n_level": None,  # The nth eigenvalue extracted in ascending order.
+                ...
+            },
+        ]
+
+        RESULTS = hamiltonian_Eigenvalue.get_or_create_many_from_parameters(
+            PARAMETERS, tree=TREE, batch_size=1000
+        )
+"""
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Optional
+from typing import Iterator
+
+from functools import lru_cache
+
+from django.db import models
+from django.template.defaultfilters import Truncator
+
+from espressodb.base.utilities.dependencies import DependencyGraph
+from espressodb.base.utilities.dependencies import PopulationState
+from espressodb.base.utilities.dependencies import get_dependency_graph
+
+
+def get_leaf_labels(graph: Optional[DependencyGraph] = None) -> List[str]:
+    """Returns the labels of all models which have no specializations.
+    """
+    graph = graph or get_dependency_graph()
+    return [label for label in graph.labels if graph.choices[label] == (label,)]
+
+
+def iter_population_trees(
+    root: str, graph: Optional[DependencyGraph] = None
+) -> Iterator[PopulationState]:
+    """Iterates all complete dependency trees of the root model.
+
+    Trees branch over all options of dependencies with more than one specialization.
+
+    Arguments:
+        root: The label of the root model.
+        graph: The dependency graph. Defaults to the graph of all project models.
+    """
+    graph = graph or get_dependency_graph()
+    pending = [[(root, True)]]
+    while pending:
+        steps = pending.pop(0)
+        state = graph.resolve(steps)
+        if state.column:
+            pending += [steps + [(option, True)] for option in state.options]
+        else:
+            yield state
+
+
+@lru_cache(maxsize=None)
+def _render_parameter_block(model: models.Model) -> Tuple[Tuple[str, str], ...]:
+    """Returns the column names and comments of the model.
+
+    Required columns come first.
+    Computed once per model class and shared by all scripts and graphs.
+    """
+    lines = [
+        (
+            field.name,
+            ("(Optional) " if field.null else "")
+            + str(Truncator(field.help_text).words(12)),
+        )
+        for field in model.get_open_fields()
+        if not isinstance(field, (models.ForeignKey, models.ManyToManyField))
+    ]
+    return tuple(sorted(lines, key=lambda line: line[1].startswith("(Optional)")))
+
+
+def render_bulk_script(
+    state: PopulationState,
+    batch_size: int = 1000,
+    graph: Optional[DependencyGraph] = None,
+) -> str:
+    """Renders a population script for a complete dependency tree.
+
+    Parameters of dependencies are prefixed by their column, e.g.,
+    ``"hamiltonian.n_sites"``.
+
+    Arguments:
+        state: The resolved tree (see :func:`iter_population_trees`).
+        batch_size: The batch size of the generated insert call.
+        graph: The dependency graph. Defaults to the graph of all project models.
+    """
+    graph = graph or get_dependency_graph()
+    model = graph.models[state.root]
+    app = model._meta.app_label  # pylint: disable=W0212
+    name = f"{app}_{model.__name__}"
+
+    content = f'"""Bulk population script for {state.root}\n'
+    for column, label in state.tree.items():
+        content += f"\n{column}: {label}"
+    content += '\n"""\n'
+    content += f"from {model.__module__} import {model.__name__} as {name}\n\n"
+
+    content += "TREE = {\n"
+    for column, label in state.tree.items():
+        content += f'    "{column}": "{graph.models[label].__name__}",\n'
+    content += "}\n\n"
+
+    content += "PARAMETERS = [\n    {\n"
+    for column, label in list(state.tree.items())[::-1] + [(None, state.root)]:
+        prefix = f"{column}." if column else ""
+        content += f"        # {column or 'root'}: {label}\n"
+        for field_name, comment in _render_parameter_block(graph.models[label]):
+            content += f'        "{prefix}{field_name}": None,  # {comment}\n'
+    content += "    },\n]\n\n"
+
+    content += (
+        f"RESULTS = {name}.get_or_create_many_from_parameters(\n"
+        f"    PARAMETERS, tree=TREE, batch_size={batch_size}\n"
+        ")\n"
+    )
+    return content
+
+
+def render_bulk_scripts(
+    labels: Optional[List[str]] = None, batch_size: int = 1000
+) -> Dict[str, List[Tuple[PopulationState, str]]]:
+    """Renders bulk population scripts for all trees of the models.
+
+    Arguments:
+        labels: The labels of the root models. Defaults to all leaf models.
+        batch_size: The batch size of the generated insert calls.
+
+    Returns:
+        Labels mapped to the trees and scripts of the model.
+    """
+    graph = get_dependency_graph()
+    return {
+        label: [
+            (state, render_bulk_script(state, batch_size=batch_size, graph=graph))
+            for state in iter_population_trees(label, graph=graph)
+        ]
+        for label in (labels or get_leaf_labels(graph))
+    }
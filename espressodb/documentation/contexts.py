@@ -0,0 +1,162 @@
+"""Builds and caches the template contexts of documentation pages
+
+Documentation contexts contain the converted doc strings and help texts of apps and
+models as well as links to related models.
+Model schemas do not change while the server runs.
+Thus, contexts are computed on first access and reused by all requests.
+Model contexts are keyed by the model class and its schema hash (see
+:func:`get_schema_hash`), which is computed on each access, so changed models are
+documented again.
+App contexts (names and module doc strings) are kept until
+:func:`clear_documentation_cache` is called.
+"""
+from typing import Dict
+from typing import Any
+from typing import Optional
+from typing import Tuple
+
+import hashlib
+
+from django.apps import AppConfig
+from django.db.models import Model
+from django.template.defaultfilters import slugify
+from django.urls import reverse
+
+from espressodb.base.utilities.apps import get_apps_slug_map, get_app_name
+from espressodb.base.utilities.markdown import convert_string
+
+#: Maps app-slugs to apps
+SLUG_MAP = get_apps_slug_map()
+
+#: Cached app contexts by app slug
+_APP_CONTEXTS: Dict[str, Dict[str, Any]] = {}
+
+#: Cached model contexts by model and schema hash
+_MODEL_CONTEXTS: Dict[Tuple[Model, str], Dict[str, Any]] = {}
+
+
+def get_schema_hash(model: Model) -> str:
+    """Returns a hash of the documented schema of the model.
+
+    The hash changes if the doc string, fields, field types, defaults, help texts or
+    relations change.
+    """
+    schema = [model._meta.label, model.__doc__ or ""]  # pylint: disable=W0212
+    for field in model.get_open_fields():
+        schema += [
+            field.name,
+            field.get_internal_type(),
+            str(field.null),
+            repr(field.default) if field.has_default() else "",
+            str(field.help_text),
+            field.related_model._meta.label  # pylint: disable=W0212
+            if field.is_relation
+            else "",
+        ]
+    return hashlib.md5("\n".join(schema).encode("utf-8")).hexdigest()
+
+
+def get_model(app: AppConfig, model_slug: str) -> Optional[Model]:
+    """Returns the model of the app for the slug or None if not (uniquely) found.
+    """
+    model_choices = [
+        model for model in app.get_models() if model.get_slug() == model_slug
+    ]
+    return model_choices[0] if len(model_choices) == 1 else None
+
+
+def build_model_context(model: Model) -> Dict[str, Any]:
+    """Converts doc strings and help texts of the model and links relations.
+
+    Returns:
+        The context of the ``model-doc.html`` template without slugs.
+    """
+    fields = {}
+    for field in model.get_open_fields():
+
+        relation = None
+        if field.is_relation:
+            app_slug = slugify(
+                get_app_name(
+                    field.related_model._meta.app_config  # pylint: disable=W0212
+                )
+            )
+            relation = {
+                "model": field.related_model.__name__,
+                "doc_link": reverse(
+                    "documentation:details", kwargs={"app_slug": app_slug}
+                ),
+                "model_slug": field.related_model.get_slug(),
+            }
+
+        fields[field.name] = {
+            "name": field.name,
+            "optional": field.null,
+            "default": field.default if field.has_default() else None,
+            "help": convert_string(field.help_text),
+            "type": field.get_internal_type(),
+            "relation": relation,
+        }
+
+    return {
+        "name": model.__name__,
+        "module": model.__module__,
+        "doc": convert_string(model.__doc__, wrap_blocks=True),
+        "base": str(model.__base__.__name__),
+        # For the rare case where a field name is items, prefer this key val iteration
+        "columns": [(key, val) for key, val in fields.items()],
+    }
+
+
+def get_model_context(app_slug: str, model_slug: str) -> Dict[str, Any]:
+    """Returns the (cached) context of the ``model-doc.html`` template.
+
+    Arguments:
+        app_slug:
+            Slug of the app to be rendered.
+            Uses :meth:`espressodb.base.utilities.apps.get_apps_slug_map` to obtain
+            app from app names.
+        model_slug:
+            Slug of the model to be rendered.
+    """
+    context = {"app_slug": app_slug, "model_slug": model_slug}
+
+    app = SLUG_MAP.get(app_slug, None)
+    model = get_model(app, model_slug) if app else None
+    if model is not None:
+        # The hash is computed on each call such that changed models are documented
+        # again
+        key = (model, get_schema_hash(model))
+        model_context = _MODEL_CONTEXTS.get(key)
+        if model_context is None:
+            model_context = _MODEL_CONTEXTS[key] = build_model_context(model)
+        context.update(model_context)
+
+    return context
+
+
+def get_app_context(app_slug: str) -> Optional[Dict[str, Any]]:
+    """Returns the (cached) documentation context of the app or None if not found.
+
+    The context contains the ``app_name``, the slugs of all app ``models`` and the
+    converted ``module_doc``.
+    """
+    context = _APP_CONTEXTS.get(app_slug)
+    if context is None:
+        app = SLUG_MAP.get(app_slug, None)
+        if app is None:
+            return None
+
+        context = _APP_CONTEXTS[app_slug] = {
+            "app_name": app.name,
+            "models": [model.get_slug() for model in app.get_models()],
+            "module_doc": convert_string(app.module.models.__doc__, wrap_blocks=True),
+        }
+    return context
+
+
+def clear_documentation_cache():
+    """Clears all cached app and model contexts.
+    """
+    _APP_CONTEXTS.clear()
+    _MODEL_CONTEXTS.clear()
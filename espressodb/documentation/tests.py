@@ -0,0 +1,68 @@
+"""Tests for the documentation pages
+"""
+import os
+import tempfile
+
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from espressodb.documentation import contexts
+
+
+class DocumentationCacheTest(TestCase):
+    """Test case for cached documentation contexts
+    """
+
+    def setUp(self):
+        """Clears the documentation cache
+        """
+        contexts.clear_documentation_cache()
+
+    def test_cache(self):
+        """Tests if doc strings are converted on the first request only.
+        """
+        app_slug = next(iter(contexts.SLUG_MAP))
+        url = f"/documentation/{app_slug}/"
+        with patch.object(
+            contexts, "convert_string", wraps=contexts.convert_string
+        ) as convert:
+            first = self.client.get(url)
+            n_calls = convert.call_count
+            self.assertGreater(n_calls, 0)
+
+            second = self.client.get(url)
+            self.assertEqual(convert.call_count, n_calls)
+
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(self.client.get("/documentation/foo/").status_code, 404)
+
+    def test_schema_change(self):
+        """Tests if model contexts are rebuilt if the documented schema changes.
+        """
+        app_slug, app = next(iter(contexts.SLUG_MAP.items()))
+        model = next(iter(app.get_models()))
+        with patch.object(
+            contexts, "build_model_context", wraps=contexts.build_model_context
+        ) as build:
+            for _ in range(2):
+                contexts.get_model_context(app_slug, model.get_slug())
+            self.assertEqual(build.call_count, 1)
+
+            with patch.object(model, "__doc__", "Changed documentation"):
+                changed = contexts.get_model_context(app_slug, model.get_slug())
+            self.assertEqual(build.call_count, 2)
+
+        self.assertIn("Changed documentation", changed["doc"])
+
+    def test_render_command(self):
+        """Tests if the command writes one html file per app.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            call_command("render_documentation", directory, stdout=StringIO())
+            for app_slug in contexts.SLUG_MAP:
+                path = os.path.join(directory, app_slug, "index.html")
+                with open(path) as inp:
+                    self.assertIn("Documentation of", inp.read())
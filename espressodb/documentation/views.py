@@ -5,17 +5,15 @@ from typing import Dict, Any
 from django.views.generic.base import TemplateView
 from django.http import Http404
 
-from espressodb.base.utilities.apps import get_apps_slug_map
-from espressodb.base.utilities.markdown import convert_string
-
-#: Maps app-slugs to apps
-SLUG_MAP = get_apps_slug_map()
+from espressodb.documentation.contexts import get_app_context
 
 
 class DocView(TemplateView):
     """Renders the documentation page for apps present in EspressoDBs models.
 
     Uses :meth:`espressodb.base.utilities.apps.get_apps_slug_map` to locate apps.
+    The context is cached, see
+    :meth:`espressodb.documentation.contexts.get_app_context`.
     """
 
     #: The used template file.
@@ -26,17 +24,13 @@ class DocView(TemplateView):
         """
         context = super().get_context_data(**kwargs)
         app_slug = context["app_slug"]
-        app = SLUG_MAP.get(app_slug, None)
+        app_context = get_app_context(app_slug)
 
-        if app is None:
+        if app_context is None:
             raise Http404(f"App for slug <code>{app_slug}</code> does not")
 
-        app_name = app.name if app is not None else ""
-
-        context["app_name"] = app_name
-        context["models"] = [model.get_slug() for model in app.get_models()]
-        context["module_doc"] = convert_string(
-            app.module.models.__doc__, wrap_blocks=True
-        )
+        context["app_name"] = app_context["app_name"]
+        context["models"] = app_context["models"]
+        context["module_doc"] = app_context["module_doc"]
 
         return context
@@ -0,0 +1,65 @@
+"""Checks if frequently filtered columns of :class:`espressodb.base.models.Base`
+models are indexed in the database
+"""
+from typing import Dict, List, Optional, Tuple
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from espressodb.base.utilities.models import get_espressodb_models
+
+#: Base columns which are frequently filtered, e.g., by searches or notifications
+FILTERED_COLUMNS = ("tag", "last_modified", "user")
+
+
+def get_missing_indexes(
+    using: str = DEFAULT_DB_ALIAS,
+    columns: Tuple[str, ...] = FILTERED_COLUMNS,
+    exclude_apps: Optional[Tuple[str]] = None,
+) -> Dict[str, List[str]]:
+    """Returns the columns of project models which are not the leading column of an
+    index in the database.
+
+    Only columns of the model's own table are checked (not inherited columns of
+    parent tables). Tables which do not exist (e.g., unapplied migrations) are skipped.
+
+    Arguments:
+        using: The database alias.
+        columns: The field names to check.
+        exclude_apps: The apps to exclude.
+
+    Returns:
+        Model labels (``app_label.Model``) mapped to field names without index.
+    """
+    connection = connections[using]
+    missing = {}
+    with connection.cursor() as cursor:
+        tables = set(connection.introspection.table_names(cursor))
+        for model in get_espressodb_models(exclude_apps):
+            meta = model._meta  # pylint: disable=W0212
+            if meta.db_table not in tables:
+                continue
+
+            local_columns = {field.name: field.column for field in meta.local_fields}
+            constraints = connection.introspection.get_constraints(
+                cursor, meta.db_table
+            )
+            indexed = {
+                constraint["columns"][0]
+                for constraint in constraints.values()
+                if constraint["columns"]
+                and (
+                    constraint["index"]
+                    or constraint["unique"]
+                    or constraint["primary_key"]
+                )
+            }
+
+            names = [
+                name
+                for name in columns
+                if name in local_columns and local_columns[name] not in indexed
+            ]
+            if names:
+                missing[meta.label] = names
+
+    return missing
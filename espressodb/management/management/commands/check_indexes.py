@@ -0,0 +1,50 @@
+"""Script to report frequently filtered Base columns which lack database indexes.
+"""
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from espressodb.management.checks.indexes import FILTERED_COLUMNS
+from espressodb.management.checks.indexes import get_missing_indexes
+
+
+class Command(BaseCommand):
+    """Reports which ``tag``, ``last_modified`` and ``user`` columns are not indexed
+
+    Uses :meth:`espressodb.management.checks.indexes.get_missing_indexes`.
+    Indexes are added by default unless disabled by the ``ESPRESSODB_BASE_INDEXES``
+    setting or the ``base_indexes`` attribute of models (see
+    :meth:`espressodb.base.models.Base.get_base_indexes`) followed by
+    ``makemigrations`` and ``migrate``.
+    """
+
+    help = "Reports frequently filtered Base columns which lack database indexes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            type=str,
+            default=DEFAULT_DB_ALIAS,
+            help="The database to inspect.",
+        )
+        parser.add_argument(
+            "--column",
+            nargs="+",
+            default=FILTERED_COLUMNS,
+            help="The columns to check.",
+        )
+
+    def handle(self, *args, **options):
+        missing = get_missing_indexes(
+            using=options["database"], columns=tuple(options["column"])
+        )
+        if not missing:
+            self.stdout.write("All checked columns are indexed.")
+            return
+
+        self.stdout.write("Columns without index:")
+        for label, names in missing.items():
+            self.stdout.write(f"  - {label}: {', '.join(names)}")
+        self.stdout.write(
+            "Enable ESPRESSODB_BASE_INDEXES in the settings"
+            " (or base_indexes on the models), run makemigrations and migrate."
+        )
@@ -0,0 +1,66 @@
+"""Script to generate bulk population scripts for all leaf models.
+"""
+import os
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from espressodb.base.utilities.dependencies import get_dependency_graph
+from espressodb.base.utilities.population import render_bulk_scripts
+
+
+class Command(BaseCommand):
+    """Generates bulk population scripts for all dependency trees of leaf models
+
+    Uses :meth:`espressodb.base.utilities.population.render_bulk_scripts`.
+    Scripts are written to ``{output}/{app}_{model}_{n}.py`` where ``n`` enumerates the
+    trees of the model, or printed if no output directory is given.
+    """
+
+    help = "Generates bulk population scripts for all leaf models"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            type=str,
+            default=None,
+            help="Directory to write the scripts to. Prints scripts if not given.",
+        )
+        parser.add_argument(
+            "--model",
+            nargs="+",
+            default=None,
+            help="Labels of root models, e.g., 'Eigenvalue[Base]'."
+            " Defaults to all leaf models.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="The batch size of the generated insert calls.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            scripts = render_bulk_scripts(
+                labels=options["model"], batch_size=options["batch_size"]
+            )
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        if options["output"]:
+            os.makedirs(options["output"], exist_ok=True)
+
+        graph = get_dependency_graph()
+        for label, trees in scripts.items():
+            model = graph.models[label]
+            app = model._meta.app_label  # pylint: disable=W0212
+            for n, (_, script) in enumerate(trees):
+                if not options["output"]:
+                    self.stdout.write(script)
+                    continue
+
+                path = os.path.join(options["output"], f"{app}_{model.__name__}_{n}.py")
+                with open(path, "w") as out:
+                    out.write(script)
+                self.stdout.write(f"Wrote {path}")
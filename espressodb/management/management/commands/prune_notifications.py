@@ -0,0 +1,100 @@
+"""Script to delete (and archive) old notifications.
+"""
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from espressodb.notifications.models import LEVELS
+from espressodb.notifications.retention import ARCHIVE_FORMATS
+from espressodb.notifications.retention import prune_notifications
+from espressodb.notifications.retention import apply_retention_policies
+
+
+class Command(BaseCommand):
+    """Deletes old notifications in chunks and optionally archives them
+
+    Uses :meth:`espressodb.notifications.retention.prune_notifications`.
+    If no age is specified, filters, archives and chunk sizes must not be given and the
+    command applies the ``ESPRESSODB_NOTIFICATION_RETENTION``
+    policies (see :meth:`espressodb.notifications.retention.apply_retention_policies`).
+    """
+
+    help = "Deletes old notifications in chunks and optionally archives them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=float,
+            default=None,
+            help="Delete notifications older than this number of days."
+            " Uses the retention policies of the settings if not given.",
+        )
+        parser.add_argument(
+            "--level",
+            nargs="+",
+            choices=LEVELS,
+            default=None,
+            help="Only delete notifications of these levels.",
+        )
+        parser.add_argument(
+            "--tag",
+            nargs="+",
+            default=None,
+            help="Only delete notifications with these tags.",
+        )
+        parser.add_argument(
+            "--archive",
+            type=str,
+            default=None,
+            help="Archive deleted notifications to this file (jsonl)"
+            " or directory (parquet).",
+        )
+        parser.add_argument(
+            "--format",
+            type=str,
+            choices=ARCHIVE_FORMATS,
+            default=None,
+            help="The format of the archive. Defaults to jsonl.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=None,
+            help="Maximal number of notifications deleted per transaction."
+            " Defaults to 1000.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count notifications which would be deleted.",
+        )
+
+    def handle(self, *args, **options):
+        filters = [
+            f"--{name.replace('_', '-')}"
+            for name in ("level", "tag", "archive", "format", "chunk_size")
+            if options[name]
+        ]
+        if options["days"] is None and filters:
+            raise CommandError(
+                f"{', '.join(filters)} require --days."
+                " Without --days, the retention policies of the settings are applied."
+            )
+
+        try:
+            if options["days"] is None:
+                n_deleted = apply_retention_policies(dry_run=options["dry_run"])
+            else:
+                n_deleted = prune_notifications(
+                    days=options["days"],
+                    levels=options["level"],
+                    tags=options["tag"],
+                    archive=options["archive"],
+                    archive_format=options["format"] or "jsonl",
+                    chunk_size=options["chunk_size"] or 1000,
+                    dry_run=options["dry_run"],
+                )
+        except (ValueError, ImportError) as error:
+            raise CommandError(str(error))
+
+        action = "Found" if options["dry_run"] else "Deleted"
+        self.stdout.write(f"{action} {n_deleted} notifications")
@@ -0,0 +1,48 @@
+"""Script to render the documentation pages to static html files.
+"""
+import os
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.urls import reverse
+
+from espressodb.documentation.contexts import SLUG_MAP
+from espressodb.documentation.views import DocView
+
+
+class Command(BaseCommand):
+    """Renders the documentation page of each app to ``{output}/{app_slug}/index.html``
+
+    The directory layout mirrors the documentation urls.
+    Pages are rendered for anonymous users and link static files and other pages with
+    the urls of the project.
+    Uses :class:`espressodb.documentation.views.DocView`.
+    """
+
+    help = "Renders the documentation pages to static html files"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "output", type=str, help="Directory to write the html files to."
+        )
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        view = DocView.as_view()
+
+        for app_slug in SLUG_MAP:
+            request = factory.get(
+                reverse("documentation:details", kwargs={"app_slug": app_slug})
+            )
+            request.user = AnonymousUser()
+            response = view(request, app_slug=app_slug)
+            response.render()
+
+            directory = os.path.join(options["output"], app_slug)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, "index.html")
+            with open(path, "wb") as out:
+                out.write(response.content)
+
+            self.stdout.write(f"Wrote {path}")
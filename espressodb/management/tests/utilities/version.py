@@ -0,0 +1,40 @@
+"""Tests for the cached repository version
+"""
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from espressodb.management.utilities import version
+
+
+class RepoVersionCacheTest(SimpleTestCase):
+    """Test case for caching ``get_repo_version``
+    """
+
+    def setUp(self):
+        """Clears the version cache
+        """
+        version._REPO_VERSION_CACHE.clear()  # pylint: disable=W0212
+
+    def test_cache(self):
+        """Tests if git is only called again if the git files change.
+        """
+        with patch.object(
+            version, "_read_repo_version", return_value=("master", "v1.0-0-gabc")
+        ) as read:
+            with patch.object(version, "_get_git_state", return_value=(1, 2)):
+                self.assertEqual(version.get_repo_version(), ("master", "v1.0-0-gabc"))
+                self.assertEqual(version.get_repo_version(), ("master", "v1.0-0-gabc"))
+                self.assertEqual(read.call_count, 1)
+
+            with patch.object(version, "_get_git_state", return_value=(1, 3)):
+                version.get_repo_version()
+                self.assertEqual(read.call_count, 2)
+
+    def test_no_process(self):
+        """Tests if cached lookups do not spawn processes.
+        """
+        expected = version.get_repo_version()
+        with patch.object(version.subprocess, "check_output") as check_output:
+            self.assertEqual(version.get_repo_version(), expected)
+            check_output.assert_not_called()
@@ -1,5 +1,6 @@
 """Tools to keep track of the current repository version and database.
 """
+from typing import Dict
 from typing import Tuple
 from typing import Optional
 
@@ -16,16 +17,68 @@ BASE_DIR = os.path.abspath(
 )
 
 
+#: Cached version of :func:`get_repo_version` by the state of the git files.
+_REPO_VERSION_CACHE: Dict[
+    Tuple[Optional[int], ...], Tuple[Optional[str], Optional[str]]
+] = {}
+
+
+def _get_git_state() -> Tuple[Optional[int], ...]:
+    """Returns the modification times of git files which change with the version.
+
+    These are ``HEAD``, the reference ``HEAD`` points to, ``packed-refs`` and the
+    ``refs/tags`` directory.
+    Missing files have the time None.
+    """
+    head = os.path.join(BASE_DIR, "HEAD")
+    paths = [
+        head,
+        os.path.join(BASE_DIR, "packed-refs"),
+        os.path.join(BASE_DIR, "refs", "tags"),
+    ]
+    try:
+        with open(head, "r") as inp:
+            ref = inp.read().strip()
+        if ref.startswith("ref:"):
+            paths.append(os.path.join(BASE_DIR, *ref[4:].strip().split("/")))
+    except OSError:
+        pass
+
+    state = []
+    for path in paths:
+        try:
+            state.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            state.append(None)
+    return tuple(state)
+
+
 def get_repo_version() -> Tuple[Optional[str], Optional[str]]:
     """Finds information about the EspressoDB repository if possible.
 
     Only works if EspressoDB is installed from the github repository.
+    The version is cached and only looked up again if the git files change (e.g.,
+    on checkouts, commits or new tags).
+    Thus, calls usually do not spawn processes.
 
     Returns:
         The branch and the git tag-commit version as strings if found.
         If not installed (and symlinked from the repo), returns the PyPi version.
     """
+    state = _get_git_state()
+    version = _REPO_VERSION_CACHE.get(state)
+    if version is None:
+        version = _read_repo_version()
+        _REPO_VERSION_CACHE.clear()
+        _REPO_VERSION_CACHE[state] = version
+    return version
+
 
+def _read_repo_version() -> Tuple[Optional[str], Optional[str]]:
+    """Looks up the branch and tag-commit version by calling git.
+
+    See :func:`get_repo_version`.
+    """
     tag_commit_cmd = ["git", f"--git-dir={BASE_DIR}", "describe", "--always", "--long"]
     branch_cmd = ["git", f"--git-dir={BASE_DIR}", "rev-parse", "--abbrev-ref", "HEAD"]
 
@@ -40,7 +93,7 @@ def get_repo_version() -> Tuple[Optional[str], Optional[str]]:
             .decode("utf-8")
             .strip()
         )
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, OSError):
         from espressodb import __version__
 
         tag_commit = __version__
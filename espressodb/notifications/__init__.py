@@ -18,9 +18,14 @@ from typing import List
 # needed for type annotation
 import espressodb
 
+default_app_config = "espressodb.notifications.apps.NotificationsConfig"
+
 
 def get_notifier(
-    tag: Optional[str] = None, groups: Optional[List[str]] = None
+    tag: Optional[str] = None,
+    groups: Optional[List[str]] = None,
+    buffered: bool = False,
+    **kwargs,
 ) -> "espressodb.notifications.models.Notifier":
     """Get a notifier instance.
 
@@ -30,10 +35,21 @@ def get_notifier(
         groups:
             The user groups which are allowed to view this notfication.
             No groups means not logged in users are able to view the notfication.
+        buffered:
+            Return a :class:`espressodb.notifications.buffered.BufferedNotifier` which
+            writes notifications in batches from a background thread.
+        kwargs:
+            Options of the buffered notifier like ``batch_size`` or
+            ``flush_interval``.
 
     Returns:
         A notifier instance
     """
+    if buffered:
+        from espressodb.notifications.buffered import BufferedNotifier
+
+        return BufferedNotifier(tag=tag, groups=groups, **kwargs)
+
     from espressodb.notifications.models import Notifier
 
     return Notifier(tag=tag, groups=groups)
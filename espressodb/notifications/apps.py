@@ -6,3 +6,8 @@ class NotificationsConfig(AppConfig):
     name = "espressodb.notifications"
     verbose_name = "Notifications"
     label = "notifications"
+
+    def ready(self):
+        """Loads signals of the notifications module
+        """
+        import espressodb.notifications.signals  # pylint: disable=W0611
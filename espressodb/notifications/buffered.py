@@ -0,0 +1,272 @@
+"""Implements a notifier which buffers notifications and writes them in batches
+
+The :class:`BufferedNotifier` has the same interface as the
+:class:`espressodb.notifications.models.Notifier`.
+Instead of inserting each notification when it is created, notifications are put in a
+bounded queue.
+A background thread writes the queue to the database whenever ``batch_size``
+notifications are present or ``flush_interval`` seconds have passed.
+Remaining notifications are written when the notifier is closed or the program exits.
+
+Example:
+    .. code::
+
+        notifier = get_notifier(tag="my_app", buffered=True, batch_size=500)
+        for n in range(10000):
+            notifier.debug(f"Step {n}")  # does not wait for the database
+        notifier.close()  # optional, also called at exit
+"""
+from typing import Optional
+from typing import List
+from typing import Tuple
+
+import atexit
+import logging
+import queue
+import threading
+
+from django.db import connections
+from django.db import transaction
+from django.contrib.auth.models import Group
+
+from espressodb.notifications.models import Notification
+from espressodb.notifications.models import Notifier
+
+LOGGER = logging.getLogger("espressodb")
+
+#: Policies for adding notifications to a full queue
+OVERFLOW_POLICIES = ("block", "drop", "raise")
+
+
+def write_notifications(items: List[Tuple[Notification, List[Group]]]):
+    """Inserts notifications and their groups in one transaction.
+
+    Notifications are inserted with one ``bulk_create``, their groups with one
+    insert into the through table.
+    If the database does not return ids on bulk inserts, notifications with groups
+    are inserted one by one.
+    Invalidates the cached notification counts.
+
+    Arguments:
+        items: Unsaved notifications and the groups which are allowed to view them.
+    """
+    using = Notification.objects.db
+    features = connections[using].features
+    with transaction.atomic(using=using):
+        if features.can_return_rows_from_bulk_insert:
+            Notification.objects.bulk_create([item[0] for item in items])
+        else:
+            Notification.objects.bulk_create(
+                [notification for notification, groups in items if not groups]
+            )
+            for notification, groups in items:
+                if groups:
+                    notification.save()
+
+        through = Notification.groups.through
+        through.objects.bulk_create(
+            [
+                through(notification_id=notification.pk, group_id=group.pk)
+                for notification, groups in items
+                for group in groups
+            ]
+        )
+
+    Notification.clear_count_cache()
+
+
+class BufferedNotifier(Notifier):
+    """Notifier which writes notifications in batches from a background thread.
+
+    Notifications returned by the logging methods are not yet stored in the database
+    and thus have no id until the buffer is flushed.
+    """
+
+    def __init__(  # pylint: disable=R0913
+        self,
+        tag: Optional[str] = None,
+        groups: Optional[List[str]] = None,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+        overflow: str = "block",
+        max_retries: int = 3,
+    ):
+        """Init the BufferedNotifier class and starts the background thread.
+
+        Arguments:
+            tag:
+                The tag of the notification. Used for fast searches.
+            groups:
+                The user groups which are allowed to view this notfication.
+                No groups means not logged in users are able to view the notfication.
+            batch_size:
+                Number of queued notifications which trigger a write.
+            flush_interval:
+                Maximal time in seconds notifications stay in the queue.
+            max_queue_size:
+                Maximal number of queued notifications.
+            overflow:
+                What happens if the queue is full. Either "block" (wait until the
+                queue is written), "drop" (ignore the notification and count it in
+                ``dropped``) or "raise" (raise ``queue.Full``).
+            max_retries:
+                Number of consecutive failed writes after which the failed
+                notifications are dropped (and counted in ``dropped``).
+                Until then, notifications of failed writes are queued again.
+
+        Raises:
+            ValueError:
+                If the overflow policy is unknown.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {overflow}. Choose one of {OVERFLOW_POLICIES}"
+            )
+
+        super().__init__(tag=tag, groups=groups)
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.max_retries = max_retries
+        #: Number of notifications which were dropped because the queue was full or
+        #: writing them failed more than ``max_retries`` times.
+        self.dropped = 0
+        self._failed_writes = 0
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="BufferedNotifier", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _create_notification(self, **kwargs) -> Notification:
+        """Queues a notification entry for insertion in the db.
+
+        See :meth:`espressodb.notifications.models.Notifier._create_notification`.
+
+        Raises:
+            KeyError:
+                If groups are present but not found.
+            queue.Full:
+                If the queue is full and the overflow policy is "raise".
+        """
+        if self._stop.is_set():  # closed notifiers write directly
+            return super()._create_notification(**kwargs)
+
+        options = kwargs.copy()
+        options["tag"] = options.get("tag", None) or self.tag
+        groups = options.pop("groups", None)
+        groups = list(self.get_groups_from_names(groups) if groups else self.groups)
+
+        notification = Notification(**options)
+        item = (notification, groups)
+
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if self.overflow == "drop":
+                self.dropped += 1
+                return notification
+            if self.overflow == "raise":
+                raise
+            self._wakeup.set()
+            self._queue.put(item)
+
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+
+        return notification
+
+    def _run(self):
+        """Writes queued notifications until the notifier is closed.
+        """
+        try:
+            while not self._stop.is_set():
+                self._wakeup.wait(timeout=self.flush_interval)
+                self._wakeup.clear()
+                if self._stop.is_set():
+                    break
+                try:
+                    self.flush()
+                except Exception:  # pylint: disable=W0703
+                    LOGGER.exception("Failed to write buffered notifications")
+        finally:
+            connections.close_all()
+
+    def _drain(self) -> List[Tuple[Notification, List[Group]]]:
+        """Removes all notifications from the queue and returns them.
+        """
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    def _requeue(self, items: List[Tuple[Notification, List[Group]]]):
+        """Queues notifications of a failed write again.
+
+        Notifications which do not fit in the queue are counted in ``dropped``.
+        """
+        for notification, groups in items:
+            # Ids may be set by the rolled back insert
+            notification.pk = None
+            notification._state.adding = True  # pylint: disable=W0212
+            try:
+                self._queue.put_nowait((notification, groups))
+            except queue.Full:
+                self.dropped += 1
+
+    def flush(self) -> int:
+        """Writes all queued notifications to the database in the current thread.
+
+        See :func:`write_notifications`.
+        If the write fails, the notifications are queued again and the error is
+        raised.
+        After ``max_retries`` consecutive failures, the notifications are dropped.
+
+        Returns:
+            The number of written notifications.
+        """
+        with self._flush_lock:
+            items = self._drain()
+            if not items:
+                return 0
+
+            try:
+                write_notifications(items)
+            except Exception:
+                self._failed_writes += 1
+                if self._failed_writes > self.max_retries:
+                    self._failed_writes = 0
+                    self.dropped += len(items)
+                    LOGGER.error(
+                        "Dropped %d notifications after %d failed writes",
+                        len(items),
+                        self.max_retries + 1,
+                    )
+                else:
+                    self._requeue(items)
+                raise
+
+            self._failed_writes = 0
+
+        return len(items)
+
+    def close(self):
+        """Stops the background thread and writes remaining notifications.
+
+        This method is called automatically at exit.
+        """
+        if not self._stop.is_set():
+            self._stop.set()
+            self._wakeup.set()
+            self._thread.join()
+            atexit.unregister(self.close)
+        self.flush()
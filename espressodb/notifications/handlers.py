@@ -0,0 +1,345 @@
+"""Implements a :class:`logging.Handler` which stores log records as notifications
+
+The :class:`NotificationHandler` forwards records of existing loggers to the
+:class:`espressodb.notifications.models.Notification` table.
+Records are put in a queue (see :class:`logging.handlers.QueueHandler`) and written in
+batches by a background thread (see :class:`logging.handlers.QueueListener`).
+Thus, logging threads never wait for the database.
+
+Example:
+    The handler is configured through Django's ``LOGGING`` setting, e.g.,
+
+    .. code-block:: python
+
+        LOGGING = {
+            "version": 1,
+            "handlers": {
+                "notifications": {
+                    "level": "WARNING",
+                    "class": "espressodb.notifications.handlers.NotificationHandler",
+                    "tag": "my_app",
+                    "rate_limit": 100,  # at most 100 records per level and minute
+                    "dedup_window": 60,  # ignore repeated messages for one minute
+                }
+            },
+            "loggers": {"my_app": {"handlers": ["notifications"]}},
+        }
+"""
+from typing import Optional
+from typing import List
+from typing import Dict
+from typing import Union
+from typing import Tuple
+
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+
+from django.db import connections
+
+
+#: Maps logging levels to notification levels
+_LEVEL_MAP = (
+    (logging.ERROR, "ERROR"),
+    (logging.WARNING, "WARNING"),
+    (logging.INFO, "INFO"),
+    (logging.NOTSET, "DEBUG"),
+)
+
+#: Loggers which are not forwarded to avoid recursive logging when writing records
+_IGNORED_LOGGERS = ("django.db",)
+
+
+def get_notification_level(levelno: int) -> str:
+    """Maps logging levels to notification levels.
+
+    Levels above ``ERROR`` are mapped to ``ERROR``, levels below ``INFO`` to ``DEBUG``.
+    """
+    for number, level in _LEVEL_MAP:
+        if levelno >= number:
+            return level
+    return "DEBUG"
+
+
+class _NotificationWriter(logging.Handler):
+    """Handler which collects prepared records and writes them in batches.
+
+    This handler is called by the listener thread only.
+    """
+
+    def __init__(
+        self,
+        tag: Optional[str] = None,
+        groups: Optional[List[str]] = None,
+        batch_size: int = 100,
+    ):
+        super().__init__()
+        self.tag = tag
+        self.group_names = groups
+        self.batch_size = batch_size
+        self._records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord):
+        """Collects the record and writes if the batch is full.
+        """
+        self._records.append(record)
+        if len(self._records) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Writes collected records to the database.
+        """
+        if not self._records:
+            return
+
+        records, self._records = self._records, []
+
+        # Import on first write since handlers are configured before apps are ready.
+        from espressodb.notifications.models import Notification, Notifier
+        from espressodb.notifications.buffered import write_notifications
+
+        try:
+            groups = (
+                list(Notifier.get_groups_from_names(self.group_names))
+                if self.group_names
+                else []
+            )
+            write_notifications(
+                [
+                    (
+                        Notification(
+                            title=record.name,
+                            content=record.getMessage(),
+                            level=get_notification_level(record.levelno),
+                            tag=self.tag or record.name,
+                        ),
+                        groups,
+                    )
+                    for record in records
+                ]
+            )
+        except Exception:  # pylint: disable=W0703
+            self.handleError(records[0])
+
+
+class _NotificationListener(QueueListener):
+    """Listener which wakes up regularly to write records which wait for a batch.
+    """
+
+    #: Record which triggers writing collected records and closing connections.
+    _close = object()
+
+    def __init__(
+        self, record_queue: queue.Queue, writer: _NotificationWriter, interval: float
+    ):
+        super().__init__(record_queue, writer)
+        self.writer = writer
+        self.interval = interval
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        """Returns the next record or None if no record arrived within the interval.
+        """
+        if not block:
+            return super().dequeue(block)
+        try:
+            return self.queue.get(block, timeout=self.interval)
+        except queue.Empty:
+            return None
+
+    def handle(self, record: Optional[logging.LogRecord]):
+        """Collects the record or writes collected records if record is None.
+        """
+        if record is None:
+            self.writer.flush()
+        elif record is self._close:
+            self.writer.flush()
+            connections.close_all()
+        else:
+            super().handle(record)
+
+    def enqueue_sentinel(self):
+        """Waits for space in the queue instead of raising ``queue.Full``.
+        """
+        self.queue.put(self._sentinel)
+
+    def stop(self):
+        """Writes remaining records and stops the listener thread.
+
+        Waits for space in the queue if it is full.
+        """
+        self.queue.put(self._close)
+        super().stop()
+
+
+class NotificationHandler(QueueHandler):
+    """Handler which stores log records as notifications without blocking.
+
+    Records are mapped to notifications with the logger name as title, the formatted
+    message as content and the corresponding notification level.
+    Records of ``django.db`` loggers are ignored to avoid recursion.
+    """
+
+    def __init__(  # pylint: disable=R0913
+        self,
+        level: Union[int, str] = logging.NOTSET,
+        tag: Optional[str] = None,
+        groups: Optional[List[str]] = None,
+        rate_limit: Optional[Union[int, Dict[str, int]]] = None,
+        rate_period: float = 60.0,
+        dedup_window: Optional[float] = None,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+    ):
+        """Init the handler and starts the listener thread.
+
+        Arguments:
+            level:
+                The minimal level of records to store.
+            tag:
+                The tag of the notifications. Defaults to the logger name.
+            groups:
+                The user groups which are allowed to view the notfications.
+                No groups means not logged in users are able to view the notfication.
+            rate_limit:
+                Maximal number of records per notification level and ``rate_period``.
+                Either one number for all levels or a dictionary of levels and
+                numbers. Further records are dropped.
+            rate_period:
+                Time in seconds for the rate limit.
+            dedup_window:
+                Records with the same logger, level and message are dropped if the
+                previous one was stored within the time window in seconds.
+            batch_size:
+                Number of records which are written at once.
+            flush_interval:
+                Maximal time in seconds records wait to be written.
+            max_queue_size:
+                Maximal number of queued records. Further records are dropped.
+        """
+        super().__init__(queue.Queue(maxsize=max_queue_size))
+        self.setLevel(level)
+
+        self.rate_limit = rate_limit
+        self.rate_period = rate_period
+        self.dedup_window = dedup_window
+        #: Number of dropped records because of rate limits, duplicates or full queues.
+        self.dropped = 0
+
+        self._rate_windows: Dict[str, Tuple[float, int]] = {}
+        self._last_seen: Dict[Tuple[str, int, str], float] = {}
+        # Guards rate windows and last seen entries which are updated by all
+        # logging threads
+        self._filter_lock = threading.Lock()
+
+        self.listener = _NotificationListener(
+            self.queue,
+            _NotificationWriter(tag=tag, groups=groups, batch_size=batch_size),
+            interval=flush_interval,
+        )
+        self.listener.start()
+        atexit.register(self.close)
+
+    def _get_rate_limit(self, level: str) -> Optional[int]:
+        if isinstance(self.rate_limit, dict):
+            return self.rate_limit.get(level, self.rate_limit.get(level.lower()))
+        return self.rate_limit
+
+    def _is_rate_limited(self, record: logging.LogRecord, now: float) -> bool:
+        """Checks if the record exceeds the rate limit of its level and counts it.
+
+        Must be called while holding the filter lock.
+        """
+        level = get_notification_level(record.levelno)
+        limit = self._get_rate_limit(level)
+        if limit is None:
+            return False
+
+        start, count = self._rate_windows.get(level, (now, 0))
+        if now - start >= self.rate_period:
+            start, count = now, 0
+        if count >= limit:
+            return True
+
+        self._rate_windows[level] = (start, count + 1)
+        return False
+
+    def _is_duplicate(self, record: logging.LogRecord, now: float) -> bool:
+        """Checks if the same message was stored within the dedup window.
+
+        Must be called while holding the filter lock.
+        """
+        if not self.dedup_window:
+            return False
+
+        key = (record.name, record.levelno, record.getMessage())
+        last_seen = self._last_seen.get(key)
+        if last_seen is not None and now - last_seen < self.dedup_window:
+            return True
+
+        if len(self._last_seen) > 10000:
+            self._last_seen = {
+                key: seen
+                for key, seen in self._last_seen.items()
+                if now - seen < self.dedup_window
+            }
+        self._last_seen[key] = now
+        return False
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Drops ignored, rate limited and duplicate records.
+        """
+        if record.name.startswith(_IGNORED_LOGGERS):
+            return False
+        if threading.current_thread() is self.listener._thread:  # pylint: disable=W0212
+            return False
+        if not super().filter(record):
+            return False
+
+        with self._filter_lock:
+            now = time.monotonic()
+            if self._is_duplicate(record, now) or self._is_rate_limited(record, now):
+                self.dropped += 1
+                return False
+
+        return True
+
+    def enqueue(self, record: logging.LogRecord):
+        """Queues the record without blocking and drops it if the queue is full.
+        """
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Writes all queued records by restarting the listener.
+
+        Blocks until records are written.
+        """
+        self.acquire()
+        try:
+            if self.listener._thread is not None:  # pylint: disable=W0212
+                self.listener.stop()
+                self.listener.start()
+        finally:
+            self.release()
+
+    def close(self):
+        """Writes remaining records and stops the listener thread.
+
+        This method is called automatically at exit.
+        """
+        self.acquire()
+        try:
+            if self.listener._thread is not None:  # pylint: disable=W0212
+                self.listener.stop()
+                atexit.unregister(self.close)
+        finally:
+            self.release()
+        super().close()
@@ -20,20 +20,44 @@ The notifications view will be rendered on default whenever a user is logged in.
 .. autosummary::
     LEVELS
     Notification
+    NotificationReadMark
     Notifier
 
 ------
 """
 from typing import Optional
 from typing import List
+from typing import Dict
+from typing import Tuple
+from typing import Union
 
+import time
+
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
 from django.db import models
+from django.db.models import Count
+from django.db.models import Exists
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import Value
+from django.utils import timezone
 from django.contrib.auth.models import Group
 from django.contrib.auth.models import User
 
 #: The available notifications levels
 LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
 
+#: Cache key of the counter which invalidates all cached notification counts
+_COUNT_GENERATION_KEY = "espressodb.notifications.count_generation"
+
+#: Process wide cache of groups by name with the time they were cached.
+#: See :meth:`Notifier.get_groups_from_names`.
+_GROUP_CACHE: Dict[str, Tuple[float, Group]] = {}
+
 
 class Notification(models.Model):
     """Model which implements logging like notification interface.
@@ -82,6 +106,10 @@ class Notification(models.Model):
 
     class Meta:  # pylint: disable=C0111, R0903
         ordering = ["-timestamp"]
+        indexes = [
+            models.Index(fields=["level", "-timestamp"], name="notification_level_idx"),
+            models.Index(fields=["tag"], name="notification_tag_idx"),
+        ]
 
     def add_user_to_read_by(self, user: User):
         """Adds the user to the :attr:`Notification.read_by` list and inserts in the db.
@@ -91,12 +119,20 @@ class Notification(models.Model):
         """
         if not self.has_been_read_by(user):
             self.read_by.add(user)
-            self.save()
+            self.clear_count_cache(user)
 
     def has_been_read_by(self, user: User) -> bool:
         """Checks if the user has read the notification
+
+        This is the case if the user is in :attr:`Notification.read_by` or the
+        notification is older than the read mark of the user.
         """
-        return self.read_by.filter(pk=user.pk).exists()  # pylint: disable=E1101
+        return (
+            self.read_by.filter(pk=user.pk).exists()  # pylint: disable=E1101
+            or NotificationReadMark.objects.filter(
+                user=user, timestamp__gte=self.timestamp
+            ).exists()
+        )
 
     def viewable_by(self, user: Optional[User]) -> bool:
         """Checks if the user is allowed to read this notification.
@@ -129,24 +165,197 @@ class Notification(models.Model):
             show_all:
                 If True also shows already read messages
 
-        Results are order by timestamp in decreasing order.
-        """
-        general_notifications = cls.objects.filter(groups=None)
+        Results are order by timestamp (and id) in decreasing order.
+        Notifications are read if the user is in :attr:`Notification.read_by` or they
+        are older than the :class:`NotificationReadMark` of the user.
 
-        if user.groups.exists():
-            specific_notifications = cls.objects.filter(groups__in=user.groups.all())
-        else:
-            specific_notifications = cls.objects.none()
+        Group and read permissions are checked with correlated ``EXISTS`` subqueries.
+        Thus, the query does not join the many to many tables and does not return
+        duplicates.
+        """
+        groups_through = cls.groups.through
+        notification_groups = groups_through.objects.filter(notification=OuterRef("pk"))
 
-        notifications = general_notifications | specific_notifications
+        notifications = cls.objects.annotate(has_groups=Exists(notification_groups))
+        visible = Q(has_groups=False)
 
-        if not show_all:
-            notifications = notifications.exclude(read_by=user)
+        if user.pk is not None:
+            notifications = notifications.annotate(
+                in_user_groups=Exists(notification_groups.filter(group__user=user))
+            )
+            visible |= Q(in_user_groups=True)
+
+        notifications = notifications.filter(visible)
+
+        if not show_all and user.pk is not None:
+            notifications = notifications.annotate(
+                has_been_read=Exists(
+                    cls.read_by.through.objects.filter(
+                        notification=OuterRef("pk"), user=user
+                    )
+                ),
+                before_read_mark=Exists(
+                    NotificationReadMark.objects.filter(
+                        user=user, timestamp__gte=OuterRef("timestamp")
+                    )
+                ),
+            ).filter(has_been_read=False, before_read_mark=False)
 
         if level and level in LEVELS:
             notifications = notifications.filter(level=level)
 
-        return notifications.order_by("-timestamp")
+        return notifications.order_by("-timestamp", "-pk")
+
+    @classmethod
+    def mark_as_read(
+        cls, user: User, notifications: Optional[models.QuerySet] = None
+    ) -> int:
+        """Marks all unread notifications which are viewable by the user as read.
+
+        The user is added to :attr:`Notification.read_by` of all notifications with one
+        ``INSERT ... SELECT`` statement into the through table.
+        Thus, ids of notifications are not loaded.
+
+        Arguments:
+            user:
+                The user who has read the notifications.
+            notifications:
+                Only mark these notifications. Notifications which are not viewable by
+                the user are ignored.
+
+        Returns:
+            The number of notifications marked as read.
+        """
+        unread = cls.get_notifications(user)
+        if notifications is not None:
+            unread = unread.filter(pk__in=notifications.values("pk"))
+
+        query = (
+            unread.order_by()
+            .annotate(reader=Value(user.pk, output_field=models.IntegerField()))
+            .values_list("pk", "reader")
+        )
+        sql, params = query.query.sql_with_params()
+
+        meta = cls.read_by.through._meta  # pylint: disable=W0212
+        connection = connections[query.db]
+        quote = connection.ops.quote_name
+        columns = ", ".join(
+            quote(meta.get_field(name).column) for name in ("notification", "user")
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {quote(meta.db_table)} ({columns}) {sql}", params
+            )
+            n_read = cursor.rowcount
+        cls.clear_count_cache(user)
+
+        return n_read
+
+    @classmethod
+    def mark_all_as_read(cls, user: User, before: Optional[datetime] = None):
+        """Marks all notifications created before the timestamp as read.
+
+        Other than :meth:`Notification.mark_as_read`, this only updates the
+        :class:`NotificationReadMark` of the user (one row update if the mark exists).
+
+        Arguments:
+            user:
+                The user who has read the notifications.
+            before:
+                The timestamp of the latest read notification. Defaults to now.
+        """
+        timestamp = before or timezone.now()
+        marks = NotificationReadMark.objects.filter(user=user)
+        if not marks.update(timestamp=timestamp):
+            NotificationReadMark.objects.get_or_create(
+                user=user, defaults={"timestamp": timestamp}
+            )
+        cls.clear_count_cache(user)
+
+    @staticmethod
+    def _get_count_cache_key(user: User) -> str:
+        """Returns the cache key of the notification counts of the user.
+        """
+        generation = cache.get(_COUNT_GENERATION_KEY, 0)
+        return f"espressodb.notifications.counts.{generation}.{user.pk}"
+
+    @classmethod
+    def get_notification_counts(cls, user: User) -> Dict[str, int]:
+        """Returns the number of unread notifications the user is allowed to see.
+
+        The counts are computed in one query and cached per user.
+        The cache is invalidated when new notifications are created by the
+        :class:`Notifier` or if the user reads notifications.
+        Entries expire after ``settings.ESPRESSODB_NOTIFICATION_COUNT_TIMEOUT``
+        seconds (defaults to 60) to account for other changes like group memberships.
+
+        Arguments:
+            user: The user who wants to see notifications
+
+        Returns:
+            Dictionary of lower case levels and number of unread notifications.
+        """
+        key = cls._get_count_cache_key(user)
+        counts = cache.get(key)
+
+        if counts is None:
+            counts = {level.lower(): 0 for level in LEVELS}
+            query = (
+                cls.get_notifications(user)
+                .order_by()
+                .values("level")
+                .annotate(count=Count("pk"))
+            )
+            for entry in query:
+                if entry["level"] in LEVELS:
+                    counts[entry["level"].lower()] = entry["count"]
+
+            timeout = getattr(settings, "ESPRESSODB_NOTIFICATION_COUNT_TIMEOUT", 60)
+            cache.set(key, counts, timeout)
+
+        return counts
+
+    @classmethod
+    def clear_count_cache(cls, user: Optional[User] = None):
+        """Invalidates cached notification counts.
+
+        Arguments:
+            user: Only invalidate counts of this user. Invalidates all if None.
+        """
+        if user is not None:
+            cache.delete(cls._get_count_cache_key(user))
+        else:
+            try:
+                cache.incr(_COUNT_GENERATION_KEY)
+            except ValueError:  # key not present
+                cache.set(_COUNT_GENERATION_KEY, 1, None)
+
+
+class NotificationReadMark(models.Model):
+    """Model which stores until when a user has read all notifications.
+
+    Notifications which are older than the timestamp are considered as read by the
+    user. See also :meth:`Notification.mark_all_as_read`.
+    """
+
+    #: (:class:`models.OneToOneField` -> :class:`django.contrib.auth.models.User`) -
+    #: The user who has read the notifications
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        help_text="The user who has read the notifications",
+        related_name="notification_read_mark",
+    )
+    #: (:class:`models.DateTimeField`) -
+    #: The timestamp of the latest read notification
+    timestamp = models.DateTimeField(
+        help_text="All notifications up to this timestamp have been read by the user"
+    )
+
+    def __str__(self) -> str:
+        return f"{self.user} read notifications until {self.timestamp}"
 
 
 class Notifier:
@@ -185,9 +394,13 @@ class Notifier:
         self.groups = self.get_groups_from_names(groups) if groups else []
 
     @staticmethod
-    def get_groups_from_names(group_names: List[str]) -> List[Group]:
+    def get_groups_from_names(group_names: List[Union[str, Group]]) -> List[Group]:
         """Parses the group names to :class:`Groups`.
 
+        Groups are cached by name for all notifiers of the process.
+        Entries expire after ``settings.ESPRESSODB_NOTIFICATION_GROUP_TIMEOUT``
+        seconds (defaults to 300) and are removed when groups are changed or deleted.
+
         Arguments:
             group_names:
                 List of group names which will be converted to a list of
@@ -197,19 +410,45 @@ class Notifier:
             KeyError:
                 If not all groups are found.
         """
-        groups = Group.objects.filter(name__in=group_names)
-
-        if groups.count() != len(group_names):
-            missing_groups = set(group_names).difference(
-                {groups.name for group in groups}
-            )
+        names = list(dict.fromkeys(str(name) for name in group_names))
+        timeout = getattr(settings, "ESPRESSODB_NOTIFICATION_GROUP_TIMEOUT", 300)
+        now = time.monotonic()
+
+        groups = {}
+        for name in names:
+            cached = _GROUP_CACHE.get(name)
+            if cached is not None and now - cached[0] < timeout:
+                groups[name] = cached[1]
+
+        missing = [name for name in names if name not in groups]
+        if missing:
+            for group in Group.objects.filter(name__in=missing):
+                _GROUP_CACHE[group.name] = (now, group)
+                groups[group.name] = group
+
+        if len(groups) != len(names):
+            missing_groups = set(names).difference(groups)
             raise KeyError(
                 "Could not locate all groups requested."
                 f" The requested groups are {group_names},"
                 f" but did not find {missing_groups}"
             )
 
-        return groups
+        return [groups[name] for name in names]
+
+    @staticmethod
+    def clear_group_cache(group: Optional[Group] = None):
+        """Clears cached groups.
+
+        Arguments:
+            group: Only remove this group from the cache. Removes all groups if None.
+        """
+        if group is None:
+            _GROUP_CACHE.clear()
+        else:
+            for name, (_, cached_group) in list(_GROUP_CACHE.items()):
+                if name == group.name or cached_group.pk == group.pk:
+                    _GROUP_CACHE.pop(name, None)
 
     def debug(
         self,
@@ -360,5 +599,6 @@ class Notifier:
 
         notification = Notification.objects.create(**options)  # pylint: disable=E1101
         notification.groups.add(*groups)
+        Notification.clear_count_cache()
 
         return notification
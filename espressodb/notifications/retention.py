@@ -0,0 +1,259 @@
+"""Implements the retention of notifications
+
+Old notifications and their ``groups`` and ``read_by`` entries are deleted in chunks
+by :func:`prune_notifications`.
+Each chunk is selected by id (keyset) and deleted in its own transaction.
+Thus, locks and transactions stay small independent of the size of the table.
+Deleted chunks can be archived to a JSON lines file or Parquet files.
+Chunks are written to the archive after their transaction is committed.
+Thus, failed deletions are not archived.
+
+Example:
+    Policies are configured by the ``ESPRESSODB_NOTIFICATION_RETENTION`` setting,
+    e.g.,
+
+    .. code-block:: python
+
+        ESPRESSODB_NOTIFICATION_RETENTION = [
+            {"days": 7, "levels": ["DEBUG"]},
+            {"days": 90, "archive": "/data/notifications.jsonl"},
+        ]
+
+    and applied by :func:`apply_retention_policies` or by a scheduled (cron) call of
+
+    .. code-block:: bash
+
+        python manage.py prune_notifications
+
+    Policies can also be specified on the command line, e.g.,
+
+    .. code-block:: bash
+
+        python manage.py prune_notifications --days 30 --level DEBUG INFO
+"""
+from typing import Optional
+from typing import List
+from typing import Dict
+from typing import Any
+
+import json
+import logging
+import os
+
+from functools import partial
+from datetime import datetime
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from espressodb.notifications.models import Notification
+from espressodb.notifications.models import LEVELS
+
+LOGGER = logging.getLogger("espressodb")
+
+#: Supported archive formats
+ARCHIVE_FORMATS = ("jsonl", "parquet")
+
+
+def get_expired_notifications(
+    before: datetime,
+    levels: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+) -> QuerySet:
+    """Returns notifications created before the timestamp with given levels and tags.
+
+    Raises:
+        ValueError: If a level is unknown.
+    """
+    notifications = Notification.objects.filter(timestamp__lt=before)
+    if levels:
+        unknown = set(levels) - set(LEVELS)
+        if unknown:
+            raise ValueError(f"Unknown notification levels {unknown}. Use {LEVELS}")
+        notifications = notifications.filter(level__in=levels)
+    if tags:
+        notifications = notifications.filter(tag__in=tags)
+    return notifications
+
+
+def serialize_notifications(pks: List[int]) -> List[Dict[str, Any]]:
+    """Returns the notifications as dictionaries with names of groups and ids of users
+    who have read them.
+
+    Uses three queries independent of the number of notifications.
+    """
+    entries = {
+        entry["id"]: dict(entry, groups=[], read_by=[])
+        for entry in Notification.objects.filter(pk__in=pks)
+        .order_by("pk")
+        .values("id", "timestamp", "level", "tag", "title", "content")
+    }
+    for pk, name in Notification.groups.through.objects.filter(
+        notification_id__in=pks
+    ).values_list("notification_id", "group__name"):
+        entries[pk]["groups"].append(name)
+    for pk, user_id in Notification.read_by.through.objects.filter(
+        notification_id__in=pks
+    ).values_list("notification_id", "user_id"):
+        entries[pk]["read_by"].append(user_id)
+    return list(entries.values())
+
+
+def archive_notifications(
+    entries: List[Dict[str, Any]], path: str, archive_format: str = "jsonl"
+):
+    """Appends serialized notifications to an archive.
+
+    Arguments:
+        entries:
+            Notifications serialized by :func:`serialize_notifications`.
+        path:
+            For ``jsonl``, the file entries are appended to.
+            For ``parquet``, the directory which stores one file per chunk.
+            Parquet archives require ``pandas`` and ``pyarrow``.
+        archive_format:
+            One of :data:`ARCHIVE_FORMATS`.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if not entries:
+        return
+
+    if archive_format == "jsonl":
+        with open(path, "a") as archive:
+            for entry in entries:
+                archive.write(json.dumps(entry, cls=DjangoJSONEncoder) + "\n")
+
+    elif archive_format == "parquet":
+        import pandas as pd  # pylint: disable=C0415
+
+        os.makedirs(path, exist_ok=True)
+        first, last = entries[0]["id"], entries[-1]["id"]
+        pd.DataFrame(entries).to_parquet(
+            os.path.join(path, f"notifications-{first}-{last}.parquet"), index=False
+        )
+
+    else:
+        raise ValueError(
+            f"Unknown archive format {archive_format}. Use one of {ARCHIVE_FORMATS}"
+        )
+
+
+def prune_notifications(  # pylint: disable=R0913
+    days: Optional[float] = None,
+    before: Optional[datetime] = None,
+    levels: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    archive: Optional[str] = None,
+    archive_format: str = "jsonl",
+    chunk_size: int = 1000,
+    dry_run: bool = False,
+) -> int:
+    """Deletes (and archives) old notifications in chunks.
+
+    Each chunk of at most ``chunk_size`` notifications is deleted in its own
+    transaction and archived once the transaction is committed.
+    Deleting notifications also deletes their ``groups`` and ``read_by`` entries.
+
+    Arguments:
+        days:
+            Delete notifications older than this number of days.
+        before:
+            Delete notifications created before this timestamp.
+            Either ``days`` or ``before`` must be given.
+        levels:
+            Only delete notifications of these levels.
+        tags:
+            Only delete notifications with these tags.
+        archive:
+            Archive deleted notifications to this path.
+            See :func:`archive_notifications`.
+        archive_format:
+            One of :data:`ARCHIVE_FORMATS`.
+        chunk_size:
+            Maximal number of notifications per transaction.
+        dry_run:
+            Only count matching notifications.
+
+    Returns:
+        The number of (matching) deleted notifications.
+
+    Raises:
+        ValueError: If neither ``days`` nor ``before`` is given or arguments are
+            invalid.
+    """
+    if before is None:
+        if days is None:
+            raise ValueError("Specify the age of notifications to delete.")
+        before = timezone.now() - timedelta(days=days)
+    if archive and archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(
+            f"Unknown archive format {archive_format}. Use one of {ARCHIVE_FORMATS}"
+        )
+
+    notifications = get_expired_notifications(before, levels=levels, tags=tags)
+    if dry_run:
+        return notifications.count()
+
+    n_deleted = 0
+    last_pk = 0
+    while True:
+        pks = list(
+            notifications.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not pks:
+            break
+        last_pk = pks[-1]
+
+        with transaction.atomic():
+            if archive:
+                transaction.on_commit(
+                    partial(
+                        archive_notifications,
+                        serialize_notifications(pks),
+                        archive,
+                        archive_format,
+                    )
+                )
+            Notification.read_by.through.objects.filter(
+                notification_id__in=pks
+            ).delete()
+            Notification.groups.through.objects.filter(notification_id__in=pks).delete()
+            n_deleted += Notification.objects.filter(pk__in=pks).delete()[0]
+
+        LOGGER.debug("Deleted %d notifications up to id %d", len(pks), last_pk)
+
+    if n_deleted:
+        Notification.clear_count_cache()
+
+    return n_deleted
+
+
+def get_retention_policies() -> List[Dict[str, Any]]:
+    """Returns the policies of the ``ESPRESSODB_NOTIFICATION_RETENTION`` setting.
+
+    Each policy is a dictionary of keyword arguments of :func:`prune_notifications`.
+    """
+    return list(getattr(settings, "ESPRESSODB_NOTIFICATION_RETENTION", []))
+
+
+def apply_retention_policies(dry_run: bool = False) -> int:
+    """Applies all configured retention policies.
+
+    This function is the hook for scheduled tasks (e.g., cron or celery beat).
+    See :func:`get_retention_policies`.
+
+    Returns:
+        The number of deleted notifications.
+    """
+    return sum(
+        prune_notifications(**dict(policy, dry_run=dry_run))
+        for policy in get_retention_policies()
+    )
@@ -0,0 +1,26 @@
+"""Signal processing functions for the notifications module
+
+Invalidates cached groups of notifiers.
+"""
+from django.contrib.auth.models import Group
+from django.db.models.signals import post_save, post_delete, post_migrate
+from django.dispatch import receiver
+
+from espressodb.notifications.models import Notifier
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed_handler(sender: Group, **kwargs):  # pylint: disable=W0613
+    """Removes changed or deleted groups from the group cache of notifiers.
+    """
+    instance = kwargs.get("instance")
+    if instance is not None:
+        Notifier.clear_group_cache(instance)
+
+
+@receiver(post_migrate)
+def notifications_post_migrate_handler(sender, **kwargs):  # pylint: disable=W0613
+    """Clears the group cache after migrations (or flushes) of the database.
+    """
+    Notifier.clear_group_cache()
@@ -6,7 +6,6 @@ from django import template
 from django.contrib.auth.models import User
 
 from espressodb.notifications.models import Notification
-from espressodb.notifications.models import LEVELS
 
 register = template.Library()  # pylint: disable=C0103
 
@@ -53,13 +52,12 @@ def render_notification_links(user: User):
         user: The currently logged in user.
 
     Also adds informations about notifications which are viewable by user.
+    The counts are cached, see
+    :meth:`espressodb.notifications.models.Notification.get_notification_counts`.
 
     Uses template ``espressodb/notfications/templates/render_notification_links.html``.
     """
-    notifications = Notification.get_notifications(user)
-    notification_count = {}
-    for level in LEVELS:
-        notification_count[level.lower()] = notifications.filter(level=level).count()
+    notification_count = Notification.get_notification_counts(user)
 
     return {
         "total": sum(notification_count.values()),
@@ -1,12 +1,31 @@
 """Test case for notifications app
 """
-from django.test import TestCase
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+from django.test import TestCase, TransactionTestCase
 from django.contrib.auth.models import User
 from django.contrib.auth.models import Group
 
 from bs4 import BeautifulSoup
 
 from espressodb.notifications import get_notifier
+from espressodb.notifications.models import Notification, Notifier
+from espressodb.notifications.handlers import NotificationHandler
+from espressodb.notifications.retention import prune_notifications
 
 
 class NotificationTestCase(TestCase):
@@ -97,3 +116,462 @@ class NotificationTestCase(TestCase):
 
         content = alert.find("p").text
         self.assertEqual(message, content)
+
+
+class NotificationCountTestCase(TestCase):
+    """Test case for cached notification counts
+    """
+
+    def setUp(self):
+        """Creates a user and notifications
+        """
+        cache.clear()
+        self.user = User.objects.create(username="test user")
+        self.notifier = get_notifier()
+        self.notifier.info("Info 1")
+        self.notifier.info("Info 2")
+        self.notifier.error("Error")
+
+    def test_counts(self):
+        """Tests if counts are computed in one query and cached afterwards.
+        """
+        expected = {"debug": 0, "info": 2, "warning": 0, "error": 1}
+        with self.assertNumQueries(1):
+            self.assertEqual(Notification.get_notification_counts(self.user), expected)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(Notification.get_notification_counts(self.user), expected)
+
+    def test_invalidation(self):
+        """Tests if creating and reading notifications invalidates the counts.
+        """
+        Notification.get_notification_counts(self.user)
+
+        self.notifier.warning("Warning")
+        self.assertEqual(Notification.get_notification_counts(self.user)["warning"], 1)
+
+        Notification.objects.get(level="WARNING").add_user_to_read_by(self.user)
+        self.assertEqual(Notification.get_notification_counts(self.user)["warning"], 0)
+
+
+class NotificationQueryTestCase(TestCase):
+    """Test case for notification queries and pagination
+    """
+
+    def setUp(self):
+        """Creates a user in two groups
+        """
+        self.username = "test user"
+        self.password = "admin1234"
+        self.user = User.objects.create(username=self.username)
+        self.user.set_password(self.password)
+        self.user.save()
+
+        self.groups = [Group.objects.create(name=name) for name in ["a", "b"]]
+        for group in self.groups:
+            group.user_set.add(self.user)
+
+        self.notifier = get_notifier()
+
+    def test_no_duplicates(self):
+        """Tests if notifications for multiple groups of the user are returned once.
+        """
+        notification = self.notifier.info("For a and b", groups=["a", "b"])
+        self.notifier.info("For nobody", groups=[Group.objects.create(name="c")])
+
+        notifications = Notification.get_notifications(self.user)
+        self.assertEqual(list(notifications), [notification])
+
+        notification.add_user_to_read_by(self.user)
+        self.assertEqual(Notification.get_notifications(self.user).count(), 0)
+        self.assertEqual(
+            Notification.get_notifications(self.user, show_all=True).count(), 1
+        )
+
+    def test_keyset_pagination(self):
+        """Tests if pages are selected by the before cursor.
+        """
+        for n in range(25):
+            self.notifier.info(f"Message {n}")
+
+        login = self.client.login(username=self.username, password=self.password)
+        self.assertTrue(login)
+
+        response = self.client.get("/notifications/")
+        self.assertEqual(len(response.context["notification_list"]), 20)
+        next_cursor = response.context["next_cursor"]
+        self.assertIsNotNone(next_cursor)
+
+        response = self.client.get("/notifications/", {"before": next_cursor})
+        notifications = response.context["notification_list"]
+        self.assertEqual(len(notifications), 5)
+        self.assertIsNone(response.context["next_cursor"])
+        self.assertEqual(
+            [notification.content for notification in notifications],
+            [f"Message {n}" for n in range(4, -1, -1)],
+        )
+
+
+class MarkAsReadTestCase(TestCase):
+    """Test case for marking many notifications as read
+    """
+
+    def setUp(self):
+        """Creates a user and notifications
+        """
+        cache.clear()
+        self.username = "test user"
+        self.password = "admin1234"
+        self.user = User.objects.create(username=self.username)
+        self.user.set_password(self.password)
+        self.user.save()
+
+        self.notifier = get_notifier()
+        for n in range(5):
+            self.notifier.info(f"Info {n}")
+        self.notifier.error("Error")
+        self.notifier.info("For nobody", groups=[Group.objects.create(name="a")])
+
+    def test_mark_as_read(self):
+        """Tests if selected notifications are marked as read with one insert.
+        """
+        selected = Notification.objects.filter(level="INFO")
+        with self.assertNumQueries(1):  # insert ... select
+            self.assertEqual(Notification.mark_as_read(self.user, selected), 5)
+
+        self.assertEqual(
+            list(Notification.get_notifications(self.user)),
+            list(Notification.objects.filter(level="ERROR")),
+        )
+        self.assertEqual(self.user.read_notifications.count(), 5)
+        self.assertEqual(Notification.mark_as_read(self.user), 1)
+        self.assertEqual(Notification.get_notifications(self.user).count(), 0)
+
+    def test_mark_all_as_read(self):
+        """Tests if the read mark hides older notifications only.
+        """
+        Notification.mark_all_as_read(
+            self.user, before=Notification.objects.first().timestamp
+        )
+        with self.assertNumQueries(1):  # update of the existing mark
+            Notification.mark_all_as_read(self.user)
+
+        self.assertEqual(Notification.get_notifications(self.user).count(), 0)
+        self.assertEqual(Notification.get_notification_counts(self.user)["info"], 0)
+        self.assertTrue(Notification.objects.first().has_been_read_by(self.user))
+
+        new = self.notifier.warning("New")
+        self.assertEqual(list(Notification.get_notifications(self.user)), [new])
+        self.assertFalse(new.has_been_read_by(self.user))
+        self.assertEqual(
+            Notification.get_notifications(self.user, show_all=True).count(), 7
+        )
+
+    def test_view(self):
+        """Tests marking notifications as read by posting to the view.
+        """
+        self.assertTrue(
+            self.client.login(username=self.username, password=self.password)
+        )
+        url = "/notifications/read/"
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        selected = Notification.get_notifications(self.user, "INFO")[:2]
+        response = self.client.post(
+            url, {"notification": [notification.pk for notification in selected]}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Notification.get_notifications(self.user).count(), 4)
+
+        self.client.post(url, {"level": "ERROR"})
+        self.assertEqual(Notification.get_notifications(self.user, "ERROR").count(), 0)
+
+        response = self.client.get("/notifications/")
+        before = response.context["notification_list"][0].timestamp
+        self.client.post(url, {"before": before.isoformat()})
+        self.assertEqual(Notification.get_notifications(self.user).count(), 0)
+
+        self.assertEqual(self.client.post(url, {"level": "FOO"}).status_code, 404)
+
+
+class RetentionTestCase(TransactionTestCase):
+    """Test case for deleting and archiving old notifications
+
+    Archives are written on commit. Thus, the test case commits transactions.
+    """
+
+    def setUp(self):
+        """Creates old and new notifications
+        """
+        self.user = User.objects.create(username="test user")
+        notifier = get_notifier(tag="old")
+        for n in range(5):
+            notifier.debug(f"Debug {n}", groups=[Group.objects.create(name=str(n))])
+        notifier.error("Error")
+        Notification.objects.update(timestamp=timezone.now() - timedelta(days=10))
+        Notification.objects.get(level="ERROR").add_user_to_read_by(self.user)
+
+        get_notifier(tag="new").debug("New")
+
+    def test_prune(self):
+        """Tests if notifications are deleted by age and level in chunks.
+        """
+        self.assertEqual(prune_notifications(days=5, dry_run=True), 6)
+        self.assertEqual(prune_notifications(days=5, levels=["DEBUG"], chunk_size=2), 5)
+        self.assertEqual(
+            list(Notification.objects.values_list("content", flat=True)),
+            ["New", "Error"],
+        )
+        self.assertEqual(Notification.groups.through.objects.count(), 0)
+        self.assertEqual(Notification.read_by.through.objects.count(), 1)
+
+        self.assertEqual(prune_notifications(days=5, tags=["new"]), 0)
+        with self.assertRaises(ValueError):
+            prune_notifications(days=5, levels=["FOO"])
+
+    def test_archive(self):
+        """Tests if deleted notifications are archived to a JSON lines file.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "archive.jsonl")
+            prune_notifications(days=5, archive=path, chunk_size=4)
+            with open(path) as archive:
+                entries = [json.loads(line) for line in archive]
+
+        self.assertEqual(len(entries), 6)
+        self.assertEqual(entries[0]["content"], "Debug 0")
+        self.assertEqual(entries[0]["groups"], ["0"])
+        self.assertEqual(entries[-1]["read_by"], [self.user.pk])
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_archive_failed_delete(self):
+        """Tests if notifications are not archived if their deletion fails.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "archive.jsonl")
+            with patch(
+                "django.db.models.query.QuerySet.delete",
+                side_effect=DatabaseError("Delete failed"),
+            ):
+                with self.assertRaises(DatabaseError):
+                    prune_notifications(days=5, archive=path)
+            self.assertFalse(os.path.exists(path))
+
+        self.assertEqual(Notification.objects.count(), 7)
+
+    def test_command(self):
+        """Tests the management command with arguments and settings policies.
+        """
+        out = StringIO()
+        call_command("prune_notifications", "--days=5", "--level=ERROR", stdout=out)
+        self.assertEqual(out.getvalue().strip(), "Deleted 1 notifications")
+
+        with self.settings(ESPRESSODB_NOTIFICATION_RETENTION=[{"days": 5}]):
+            call_command("prune_notifications", stdout=out)
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_command_filters_require_days(self):
+        """Tests if filters without age are rejected instead of applying policies.
+        """
+        with self.settings(ESPRESSODB_NOTIFICATION_RETENTION=[{"days": 5}]):
+            with self.assertRaises(CommandError):
+                call_command("prune_notifications", "--tag=old", stdout=StringIO())
+            with self.assertRaises(CommandError):
+                call_command("prune_notifications", "--chunk-size=2", stdout=StringIO())
+        self.assertEqual(Notification.objects.count(), 7)
+
+
+class BufferedNotifierTestCase(TestCase):
+    """Test case for the buffered notifier
+    """
+
+    def setUp(self):
+        """Creates a group
+        """
+        self.group = Group.objects.create(name="secret")
+
+    def get_notifier(self, **kwargs):
+        """Returns a buffered notifier which only writes on flush and closes it on
+        cleanup.
+        """
+        notifier = get_notifier(buffered=True, flush_interval=60, **kwargs)
+        self.addCleanup(notifier.close)
+        return notifier
+
+    def test_flush(self):
+        """Tests if notifications are only written on flush.
+        """
+        notifier = self.get_notifier()
+        notifier.info("Info")
+        notifier.warning("Warning", groups=["secret"])
+        notifier.error("Error", groups=["secret"])
+
+        self.assertEqual(Notification.objects.count(), 0)
+        self.assertEqual(notifier.flush(), 3)
+        self.assertEqual(notifier.flush(), 0)
+
+        self.assertEqual(Notification.objects.count(), 3)
+        self.assertEqual(
+            set(
+                Notification.objects.filter(groups=self.group).values_list(
+                    "level", flat=True
+                )
+            ),
+            {"WARNING", "ERROR"},
+        )
+
+    def test_close(self):
+        """Tests if closing writes remaining and new notifications.
+        """
+        notifier = self.get_notifier()
+        notifier.info("Info")
+        notifier.close()
+        self.assertEqual(Notification.objects.count(), 1)
+
+        notifier.info("Info")
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_failed_write(self):
+        """Tests if notifications of failed writes are retried and dropped after
+        ``max_retries`` failures.
+        """
+        notifier = self.get_notifier(max_retries=1)
+        notifier.info("Info")
+        notifier.info("Info", groups=["secret"])
+
+        with patch(
+            "espressodb.notifications.buffered.write_notifications",
+            side_effect=DatabaseError("locked"),
+        ):
+            with self.assertRaises(DatabaseError):
+                notifier.flush()
+        self.assertEqual(notifier.dropped, 0)
+        self.assertEqual(notifier.flush(), 2)
+        self.assertEqual(Notification.objects.filter(groups=self.group).count(), 1)
+
+        notifier.info("Info")
+        with patch(
+            "espressodb.notifications.buffered.write_notifications",
+            side_effect=DatabaseError("locked"),
+        ):
+            for _ in range(2):
+                with self.assertRaises(DatabaseError):
+                    notifier.flush()
+        self.assertEqual(notifier.dropped, 1)
+        self.assertEqual(notifier.flush(), 0)
+
+    def test_overflow(self):
+        """Tests the drop and raise policies for full queues.
+        """
+        notifier = self.get_notifier(max_queue_size=2, overflow="drop")
+        for _ in range(3):
+            notifier.info("Info")
+        self.assertEqual(notifier.dropped, 1)
+        self.assertEqual(notifier.flush(), 2)
+
+        notifier = self.get_notifier(max_queue_size=1, overflow="raise")
+        notifier.info("Info")
+        with self.assertRaises(queue.Full):
+            notifier.info("Info")
+
+
+class NotificationHandlerTestCase(TransactionTestCase):
+    """Test case for the logging handler which writes notifications
+    """
+
+    def get_logger(self, **kwargs):
+        """Returns a logger and its notification handler.
+        """
+        handler = NotificationHandler(flush_interval=60, **kwargs)
+        logger = logging.getLogger(f"espressodb.tests.{self.id()}")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        self.addCleanup(handler.close)
+        return logger, handler
+
+    def test_records(self):
+        """Tests if records are mapped to notifications.
+        """
+        logger, handler = self.get_logger(tag="test", level="INFO")
+        logger.debug("Not stored")
+        logger.info("Info")
+        logger.critical("Critical %d", 1)
+
+        handler.flush()
+
+        self.assertEqual(
+            list(Notification.objects.order_by("pk").values_list("level", "content")),
+            [("INFO", "Info"), ("ERROR", "Critical 1")],
+        )
+        self.assertEqual(
+            set(Notification.objects.values_list("tag", "title")),
+            {("test", logger.name)},
+        )
+
+    def test_rate_limit_and_dedup(self):
+        """Tests if records exceeding rate limits and duplicates are dropped.
+        """
+        logger, handler = self.get_logger(rate_limit={"INFO": 2}, dedup_window=60)
+        for n in range(4):
+            logger.info("Info %d", n)
+        for _ in range(3):
+            logger.error("Error")
+
+        handler.flush()
+
+        self.assertEqual(
+            list(Notification.objects.order_by("pk").values_list("content", flat=True)),
+            ["Info 0", "Info 1", "Error"],
+        )
+        self.assertEqual(handler.dropped, 4)
+
+    def test_rate_limit_threads(self):
+        """Tests if rate limits are exact for records of concurrent threads.
+        """
+        logger, handler = self.get_logger(rate_limit=100)
+
+        def log():
+            for n in range(200):
+                logger.info("Info %d", n)
+
+        threads = [threading.Thread(target=log) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        handler.flush()
+
+        self.assertEqual(handler.dropped, 1500)
+        self.assertEqual(Notification.objects.count(), 100)
+
+
+class GroupCacheTestCase(TestCase):
+    """Test case for the group cache of notifiers
+    """
+
+    def setUp(self):
+        """Creates groups and clears the cache
+        """
+        Notifier.clear_group_cache()
+        self.groups = [Group.objects.create(name=name) for name in ["a", "b"]]
+
+    def test_cached(self):
+        """Tests if groups are only queried once.
+        """
+        with self.assertNumQueries(1):
+            groups = Notifier.get_groups_from_names(["a", "b"])
+        with self.assertNumQueries(0):
+            self.assertEqual(Notifier.get_groups_from_names(["b", "a"]), groups[::-1])
+        self.assertEqual(groups, self.groups)
+
+    def test_invalidation(self):
+        """Tests if deleted groups are removed from the cache.
+        """
+        Notifier.get_groups_from_names(["a"])
+        self.groups[0].delete()
+
+        with self.assertRaises(KeyError) as context:
+            Notifier.get_groups_from_names(["a", "b"])
+        self.assertIn("{'a'}", str(context.exception))
@@ -16,11 +16,14 @@ The URL-app name is ``notifications``.
 +----------------------------+--------------------+-----------------------------------------------------------+
 | notification-read          | ``read/<int:pk>/`` | :class:`espressodb.notifications.views.HasReadView`       |
 +----------------------------+--------------------+-----------------------------------------------------------+
+| notifications-read         | ``read/``          | :class:`espressodb.notifications.views.MarkAsReadView`    |
++----------------------------+--------------------+-----------------------------------------------------------+
 """
 
 from django.urls import path
 
 from espressodb.notifications.views import NotificationsView, HasReadView
+from espressodb.notifications.views import MarkAsReadView
 
 app_name = "notifications"
 urlpatterns = [
@@ -46,4 +49,5 @@ urlpatterns = [
         name="notifications-list-error",
     ),
     path("read/<int:pk>", HasReadView.as_view(), name="notification-read"),
+    path("read/", MarkAsReadView.as_view(), name="notifications-read"),
 ]
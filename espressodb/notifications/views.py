@@ -3,8 +3,13 @@
 """
 from typing import List
 from typing import Union
+from typing import Optional
+from typing import Tuple
+from datetime import datetime
 
+from django.db.models import Q
 from django.db.models import QuerySet
+from django.utils.dateparse import parse_datetime
 
 from django.http import Http404
 from django.http import HttpResponseRedirect
@@ -17,6 +22,7 @@ from django.views.generic.list import ListView
 from django.contrib.auth.mixins import LoginRequiredMixin
 
 from espressodb.notifications.models import Notification
+from espressodb.notifications.models import LEVELS
 
 
 class NotificationsView(LoginRequiredMixin, ListView):
@@ -36,17 +42,80 @@ class NotificationsView(LoginRequiredMixin, ListView):
     #: Shows notifications for all levels if not specified.
     level = ""
 
+    #: The cursor of the next page. Set when the queryset is paginated.
+    next_cursor = None
+
     def get_context_data(self, *, object_list=None, **kwargs):
         """Parses context data of view.
 
         Sets context view ``level`` to own view level.
         Sets context ``all`` option to true if specified as url parameter.
+        Sets context ``next_cursor`` to the cursor of the next page (or None) and
+        ``is_first_page`` to false if the url specifies a ``before`` cursor.
         """
         context = super().get_context_data(object_list=object_list, **kwargs)
         context["level"] = self.level
         context["all"] = self.request.GET.get("all", "False").lower() == "true"
+        context["next_cursor"] = self.next_cursor
+        context["is_first_page"] = (
+            self.parse_cursor(self.request.GET.get("before")) is None
+        )
         return context
 
+    @staticmethod
+    def get_cursor(notification: Notification) -> str:
+        """Returns the cursor which points to the notification.
+
+        The format is ``{timestamp isoformat}_{id}``.
+        """
+        return f"{notification.timestamp.isoformat()}_{notification.pk}"
+
+    @staticmethod
+    def parse_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+        """Parses the timestamp and id from the cursor.
+
+        Returns:
+            None if the cursor is not present or invalid.
+        """
+        if not cursor:
+            return None
+
+        timestamp, _, pk = cursor.rpartition("_")
+        try:
+            timestamp = parse_datetime(timestamp)
+            pk = int(pk)
+        except ValueError:
+            return None
+
+        return (timestamp, pk) if timestamp is not None else None
+
+    def paginate_queryset(self, queryset, page_size):
+        """Paginates the queryset by keyset (timestamp, id) instead of offset.
+
+        The page starts after the notification specified by the ``before`` url
+        parameter.
+        Thus, the database can seek to the page using the timestamp index and does not
+        count all notifications.
+
+        Returns:
+            ``(paginator, page, object_list, is_paginated)`` where ``paginator`` and
+            ``page`` are None.
+        """
+        cursor = self.parse_cursor(self.request.GET.get("before"))
+        if cursor is not None:
+            timestamp, pk = cursor
+            queryset = queryset.filter(
+                Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, pk__lt=pk)
+            )
+
+        notifications = list(queryset.order_by("-timestamp", "-pk")[: page_size + 1])
+        if len(notifications) > page_size:
+            notifications = notifications[:page_size]
+            self.next_cursor = self.get_cursor(notifications[-1])
+
+        is_paginated = self.next_cursor is not None or cursor is not None
+        return None, None, notifications, is_paginated
+
     def get_queryset(self) -> Union[QuerySet, List[Notification]]:
         """Returns notifications which are vieawable by logged in user for current level.
         """
@@ -93,3 +162,69 @@ class HasReadView(LoginRequiredMixin, SingleObjectMixin, View):
             raise Http404("This site does not exist")
 
         return HttpResponseRedirect(self.success_url)
+
+
+class MarkAsReadView(LoginRequiredMixin, View):
+    """Post only view to mark many notifications as read by the logged in user.
+
+    The post data specifies which notifications are marked:
+
+    * ``notification``: a list of ids of selected notifications,
+    * ``level``: all notifications of the level,
+    * neither: all notifications. The optional ``before`` timestamp (isoformat)
+      restricts this to notifications created before the timestamp.
+    """
+
+    #: Go back to notification list view on success
+    success_url = reverse_lazy("notifications:notifications-list")
+
+    @staticmethod
+    def get(request, *args, **kwargs):
+        """Get accessed of view is removed.
+
+        Raises:
+            Http404:
+                When this function is called.
+        """
+        raise Http404("This site does not exist")
+
+    def post(  # pylint: disable=W0613
+        self, request, *args, **kwargs
+    ) -> HttpResponseRedirect:
+        """Marks notifications as read by the logged in user.
+
+        Selected notifications and notifications of a level are marked with
+        :meth:`espressodb.notifications.models.Notification.mark_as_read`, all
+        notifications with
+        :meth:`espressodb.notifications.models.Notification.mark_all_as_read`.
+        Notifications which the user is not allowed to see are ignored.
+
+        Raises:
+            Http404:
+                If the ids, level or timestamp are invalid.
+        """
+        user = request.user
+        pks = request.POST.getlist("notification")
+        level = request.POST.get("level")
+        before = request.POST.get("before")
+
+        try:
+            before = parse_datetime(before) if before else None
+            pks = [int(pk) for pk in pks]
+        except ValueError:
+            raise Http404("This site does not exist")
+
+        if level and level not in LEVELS:
+            raise Http404("This site does not exist")
+
+        if pks:
+            Notification.mark_as_read(user, Notification.objects.filter(pk__in=pks))
+        elif level:
+            notifications = Notification.objects.filter(level=level)
+            if before is not None:
+                notifications = notifications.filter(timestamp__lte=before)
+            Notification.mark_as_read(user, notifications)
+        else:
+            Notification.mark_all_as_read(user, before=before)
+
+        return HttpResponseRedirect(self.success_url)
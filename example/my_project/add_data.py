@@ -16,7 +16,7 @@ RANGES = {
     "c": [-1],
 }
 
-NOTIFIER = get_notifier(tag="add_data")
+NOTIFIER = get_notifier(tag="add_data", buffered=True)
 
 
 def main():
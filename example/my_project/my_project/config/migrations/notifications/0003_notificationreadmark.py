@@ -0,0 +1,22 @@
+# Generated by Django 3.2.25 on 2026-10-18 10:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('notifications', '0002_notification_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationReadMark',
+            fields=[
+                ('user', models.OneToOneField(help_text='The user who has read the notifications', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_read_mark', serialize=False, to='auth.user')),
+                ('timestamp', models.DateTimeField(help_text='All notifications up to this timestamp have been read by the user')),
+            ],
+        ),
+    ]
@@ -4,7 +4,18 @@
 from espressodb.base.tests.apps import AppTest
 from espressodb.base.tests.views.index import IndexViewTest
 from espressodb.base.tests.views.urls import URLViewTest
+from espressodb.base.tests.utilities.links import LinkRegistryTest
+
+from espressodb.documentation.tests import DocumentationCacheTest
 
 from espressodb.notifications.tests import NotificationTestCase
+from espressodb.notifications.tests import NotificationCountTestCase
+from espressodb.notifications.tests import NotificationQueryTestCase
+from espressodb.notifications.tests import MarkAsReadTestCase
+from espressodb.notifications.tests import RetentionTestCase
+from espressodb.notifications.tests import BufferedNotifierTestCase
+from espressodb.notifications.tests import NotificationHandlerTestCase
+from espressodb.notifications.tests import GroupCacheTestCase
 
 from espressodb.management.tests.commands.info import InfoCommandTest
+from espressodb.management.tests.utilities.version import RepoVersionCacheTest
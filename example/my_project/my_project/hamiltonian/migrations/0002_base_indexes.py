@@ -0,0 +1,29 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hamiltonian', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eigenvalue',
+            index=models.Index(fields=['tag'], name='hamiltonian_tag_4ffc88_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eigenvalue',
+            index=models.Index(fields=['last_modified'], name='hamiltonian_last_mo_59c334_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hamiltonian',
+            index=models.Index(fields=['tag'], name='hamiltonian_tag_269a3e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hamiltonian',
+            index=models.Index(fields=['last_modified'], name='hamiltonian_last_mo_5d1e5e_idx'),
+        ),
+    ]
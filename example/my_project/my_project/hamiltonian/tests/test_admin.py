@@ -0,0 +1,191 @@
+"""Tests for the admin pages of the Hamiltonians app
+"""
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from espressodb.base.admin import ListViewAdmin, EstimatedCountPaginator
+from espressodb.base.utilities.models import get_estimated_count
+
+from my_project.hamiltonian.models import Contact, Coulomb, Eigenvalue, Hamiltonian
+
+
+class LargeEigenvalueAdmin(ListViewAdmin):
+    """Eigenvalue admin in large table mode
+    """
+
+    large_table = True
+    list_per_page = 3
+    search_fields = ("tag", "hamiltonian", "id")
+
+
+class UnindexedEigenvalueAdmin(LargeEigenvalueAdmin):
+    """Large table admin with an unindexed search field
+    """
+
+    search_fields = ("id", "n_level")
+
+
+class ListViewAdminTest(TestCase):
+    """Tests the number of queries of the change list admin pages
+    """
+
+    def setUp(self):
+        """Creates and logs in a super user
+        """
+        self.username = "admin"
+        self.password = "admin1234"
+        User.objects.create_superuser(self.username, "admin@example.com", self.password)
+        self.assertTrue(
+            self.client.login(username=self.username, password=self.password)
+        )
+
+    @staticmethod
+    def create_eigenvalues(start: int, stop: int):
+        """Creates Hamiltonians of both types with two eigenvalues each.
+        """
+        for n in range(start, stop):
+            cls = Contact if n % 2 else Coulomb
+            kwargs = {"c": n} if cls == Contact else {"v": n}
+            hamiltonian = cls.objects.create(n_sites=n + 1, spacing=0.1, **kwargs)
+            for level in range(2):
+                Eigenvalue.objects.create(
+                    hamiltonian=hamiltonian, n_level=level, value=float(level)
+                )
+
+    def count_queries(self, url: str) -> int:
+        """Returns the number of queries needed to render the url.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_constant_queries(self):
+        """Tests if the number of queries does not grow with the number of rows.
+        """
+        urls = [
+            "/admin/hamiltonian/eigenvalue/",
+            "/admin/hamiltonian/hamiltonian/",
+            "/admin/hamiltonian/contact/",
+        ]
+
+        self.create_eigenvalues(0, 2)
+        few = [self.count_queries(url) for url in urls]
+
+        self.create_eigenvalues(2, 12)
+        self.assertEqual([self.count_queries(url) for url in urls], few)
+
+    def test_instance_names(self):
+        """Tests if rows and foreign keys are displayed by their specialization.
+        """
+        self.create_eigenvalues(0, 2)
+        content = self.client.get("/admin/hamiltonian/eigenvalue/").content.decode()
+        for hamiltonian in Hamiltonian.objects.all():
+            self.assertIn(str(hamiltonian.specialization), content)
+
+    def test_search_fields(self):
+        """Tests if search fields are restricted to displayed (and indexed) columns.
+        """
+        self.assertEqual(ListViewAdmin(Eigenvalue, admin.site).search_fields, ["tag"])
+        self.assertEqual(
+            LargeEigenvalueAdmin(Eigenvalue, admin.site).search_fields,
+            ["tag", "hamiltonian", "id"],
+        )
+
+
+class LargeTableAdminTest(TestCase):
+    """Tests the change list of admins in large table mode
+    """
+
+    url = "/admin/hamiltonian/eigenvalue/"
+
+    def setUp(self):
+        """Creates a super user and the large table admin for eigenvalues
+        """
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.model_admin = LargeEigenvalueAdmin(Eigenvalue, admin.site)
+
+    def get_changelist(self, **params):
+        """Renders the change list for the parameters.
+        """
+        request = RequestFactory().get(self.url, params)
+        request.user = self.user
+        response = self.model_admin.changelist_view(request)
+        if response.status_code == 200:
+            response.render()
+        return response
+
+    def test_estimated_count(self):
+        """Tests if the paginator uses planner estimates for unfiltered tables.
+        """
+        ListViewAdminTest.create_eigenvalues(0, 2)
+        self.assertIsNone(get_estimated_count(Eigenvalue))
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        self.assertEqual(get_estimated_count(Eigenvalue), 4)
+
+        ListViewAdminTest.create_eigenvalues(2, 4)
+        paginator = EstimatedCountPaginator(Eigenvalue.objects.order_by("pk"), 3)
+        paginator.exact_count_threshold = 0
+        self.assertEqual(paginator.count, 4)
+
+        paginator = EstimatedCountPaginator(
+            Eigenvalue.objects.filter(pk__gt=0).order_by("pk"), 3
+        )
+        paginator.exact_count_threshold = 0
+        self.assertEqual(paginator.count, 8)
+
+    def test_keyset_navigation(self):
+        """Tests if pages are navigated by the last id of the previous page.
+        """
+        ListViewAdminTest.create_eigenvalues(0, 4)
+        pks = list(Eigenvalue.objects.order_by("-pk").values_list("pk", flat=True))
+
+        response = self.get_changelist()
+        changelist = response.context_data["cl"]
+        self.assertEqual([row.pk for row in changelist.result_list], pks[:3])
+        self.assertEqual(changelist.keyset_next, pks[2])
+        self.assertContains(response, f"?after={pks[2]}")
+
+        changelist = self.get_changelist(after=pks[2]).context_data["cl"]
+        self.assertEqual([row.pk for row in changelist.result_list], pks[3:6])
+
+        changelist = self.get_changelist(after=pks[5]).context_data["cl"]
+        self.assertEqual([row.pk for row in changelist.result_list], pks[6:])
+        self.assertIsNone(changelist.keyset_next)
+
+        self.assertEqual(self.get_changelist(after="abc").status_code, 302)
+
+    def test_indexed_search(self):
+        """Tests if search terms are matched exactly against indexed columns.
+        """
+        ListViewAdminTest.create_eigenvalues(0, 2)
+        eigenvalue = Eigenvalue.objects.first()
+
+        changelist = self.get_changelist(q=eigenvalue.pk).context_data["cl"]
+        self.assertIn(eigenvalue, changelist.result_list)
+        for row in changelist.result_list:
+            self.assertIn(eigenvalue.pk, [row.pk, row.hamiltonian_id])
+
+        changelist = self.get_changelist(q="abc").context_data["cl"]
+        self.assertEqual(list(changelist.result_list), [])
+
+    def test_unindexed_search_fields(self):
+        """Tests if unindexed search fields are ignored and reported by the checks.
+        """
+        model_admin = UnindexedEigenvalueAdmin(Eigenvalue, admin.site)
+        self.assertEqual(model_admin.search_fields, ["id"])
+        self.assertEqual(
+            [error.id for error in model_admin.check()], ["espressodb.W001"]
+        )
+        self.assertEqual(self.model_admin.check(), [])
+
+        ListViewAdminTest.create_eigenvalues(0, 2)
+        eigenvalue = Eigenvalue.objects.filter(n_level=1).exclude(pk=1).first()
+        self.model_admin = model_admin
+        changelist = self.get_changelist(q=1).context_data["cl"]
+        self.assertNotIn(eigenvalue, changelist.result_list)
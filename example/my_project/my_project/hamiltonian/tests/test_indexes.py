@@ -0,0 +1,59 @@
+"""Tests for the default indexes of Base columns
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from espressodb.base.models import DEFAULT_BASE_INDEXES
+from espressodb.management.checks.indexes import get_missing_indexes
+
+from my_project.hamiltonian.models import Contact, Eigenvalue, Hamiltonian
+
+
+class BaseIndexTest(TestCase):
+    """Tests the configuration and report of Base column indexes
+    """
+
+    @override_settings(ESPRESSODB_BASE_INDEXES=False)
+    def test_opt_out(self):
+        """Tests that no indexes are added if disabled in the settings.
+        """
+        self.assertEqual(Hamiltonian.get_base_indexes(), ())
+        self.assertEqual(Hamiltonian.build_base_indexes(), [])
+
+    def test_default_indexes(self):
+        """Tests if indexes are added to local, not yet indexed columns by default.
+        """
+        self.assertEqual(Hamiltonian.get_base_indexes(), DEFAULT_BASE_INDEXES)
+        self.assertEqual(
+            [index.fields for index in Hamiltonian._meta.indexes],
+            [["tag"], ["last_modified"]],
+        )
+        self.assertEqual(Contact._meta.indexes, [])
+        self.assertEqual(Hamiltonian.build_base_indexes(), [])
+
+    @override_settings(ESPRESSODB_BASE_INDEXES=False)
+    def test_model_configuration(self):
+        """Tests if the model attribute overwrites the setting.
+        """
+        Eigenvalue.base_indexes = ("tag", "n_level")
+        self.addCleanup(delattr, Eigenvalue, "base_indexes")
+        self.assertEqual(
+            [index.fields for index in Eigenvalue.build_base_indexes()], [["n_level"]]
+        )
+
+    def test_missing_indexes(self):
+        """Tests if unindexed columns are reported and indexed columns are not.
+        """
+        out = StringIO()
+        call_command("check_indexes", stdout=out)
+        self.assertIn("All checked columns are indexed.", out.getvalue())
+
+        name = Hamiltonian._meta.indexes[0].name
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+
+        missing = get_missing_indexes()
+        self.assertEqual(missing, {"hamiltonian.Hamiltonian": ["tag"]})
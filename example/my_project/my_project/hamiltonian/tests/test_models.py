@@ -1,13 +1,22 @@
 """Tests for models specific for the Hamiltonians app
 """
+import os
+
 from decimal import Decimal
+from importlib.util import find_spec
+from tempfile import TemporaryDirectory
 
+from unittest import skipUnless
 from unittest.mock import patch
 
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+
+from pandas import concat, read_feather, read_hdf, read_parquet
 
-from espressodb.base.exceptions import ConsistencyError
-from my_project.hamiltonian.models import Hamiltonian, Contact, Eigenvalue
+from espressodb.base.exceptions import ConsistencyError, BulkConsistencyError
+from my_project.hamiltonian.models import Hamiltonian, Contact, Coulomb, Eigenvalue
 
 
 class EigenvalueTest(TestCase):
@@ -292,3 +301,598 @@ class EigenvalueTest(TestCase):
 
         eigenvalues = Eigenvalue.objects.all()
         self.assertEqual(eigenvalues.count(), 0)
+
+
+class SpecializationTest(TestCase):
+    """Tests the specialization look up of Hamiltonians
+    """
+
+    def setUp(self):
+        """Creates Hamiltonians of different types.
+        """
+        self.contacts = [
+            Contact.objects.create(n_sites=n, spacing=Decimal("0.1"), c=Decimal("-1.0"))
+            for n in range(10, 13)
+        ]
+        self.coulombs = [
+            Coulomb.objects.create(n_sites=n, spacing=Decimal("0.1"), v=Decimal("1.0"))
+            for n in range(10, 12)
+        ]
+        self.hamiltonian = Hamiltonian.objects.create()
+
+    def test_specialized_classes(self):
+        """Tests if all classes are identified in one query.
+        """
+        with self.assertNumQueries(1):
+            classes = Hamiltonian.objects.order_by("pk").specialized_classes()
+
+        expected = {h.pk: Contact for h in self.contacts}
+        expected.update({h.pk: Coulomb for h in self.coulombs})
+        expected[self.hamiltonian.pk] = Hamiltonian
+        self.assertEqual(classes, expected)
+
+    def test_specialized(self):
+        """Tests if specialized instances are loaded with one query per class.
+        """
+        with self.assertNumQueries(4):
+            instances = Hamiltonian.objects.order_by("-pk").specialized()
+
+        expected = sorted(
+            self.contacts + self.coulombs + [self.hamiltonian],
+            key=lambda h: h.pk,
+            reverse=True,
+        )
+        self.assertEqual(instances, expected)
+        self.assertEqual(
+            [type(instance) for instance in instances],
+            [type(instance) for instance in expected],
+        )
+
+        with self.assertNumQueries(0):
+            for instance in instances:
+                self.assertEqual(instance.specialization, instance)
+
+    def test_get_specialization(self):
+        """Tests if the specialization of a base instance is the child instance.
+        """
+        contact = self.contacts[0]
+        hamiltonian = Hamiltonian.objects.get(pk=contact.pk)
+
+        self.assertEqual(hamiltonian.specialization, contact)
+        self.assertEqual(hamiltonian.type, "Contact")
+        self.assertEqual(hamiltonian.n_sites, contact.n_sites)
+
+        hamiltonian = Hamiltonian.objects.get(pk=self.hamiltonian.pk)
+        self.assertIs(hamiltonian.specialization, hamiltonian)
+
+
+class DataFrameExportTest(TestCase):
+    """Tests the chunked DataFrame export of querysets
+    """
+
+    fieldnames = ["id", "n_sites", "spacing", "tag", "last_modified", "user"]
+
+    def setUp(self):
+        """Creates tagged Hamiltonians and one Hamiltonian without tag.
+        """
+        for n in range(1, 6):
+            Contact.objects.create(
+                n_sites=n,
+                spacing=Decimal("0.1"),
+                c=Decimal("-1.0"),
+                tag=f"contact-{n}" if n < 5 else None,
+            )
+
+    def test_iter_dataframes(self):
+        """Tests if chunks have fixed dtypes and concatenate to the full table.
+        """
+        queryset = Contact.objects.order_by("pk")
+        with self.assertNumQueries(1):
+            chunks = list(
+                queryset.iter_dataframes(fieldnames=self.fieldnames, chunk_size=4)
+            )
+
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 1])
+        self.assertEqual(
+            [str(dtype) for dtype in chunks[0].dtypes],
+            ["Int64", "Int64", "Float64", "string", "datetime64[ns, UTC]", "Int64"],
+        )
+        self.assertTrue(chunks[0].dtypes.equals(chunks[1].dtypes))
+
+        frame = concat(chunks)
+        self.assertEqual(list(frame.index), list(range(5)))
+        self.assertEqual(list(frame["id"]), list(queryset.values_list("id", flat=True)))
+        self.assertEqual(list(frame["n_sites"]), [1, 2, 3, 4, 5])
+        self.assertEqual(frame["tag"].iloc[0], "contact-1")
+        self.assertTrue(frame["tag"].isna().iloc[4])
+
+    def test_iter_dataframes_lookups(self):
+        """Tests dtypes of related fields, default columns and empty querysets.
+        """
+        chunks = list(
+            Eigenvalue.objects.none().iter_dataframes(
+                fieldnames=["hamiltonian", "hamiltonian__contact__n_sites", "value"]
+            )
+        )
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(
+            [str(dtype) for dtype in chunks[0].dtypes], ["Int64", "Int64", "Float64"]
+        )
+
+        chunks = list(Contact.objects.iter_dataframes())
+        self.assertIn("c", chunks[0].columns)
+        self.assertEqual(len(chunks[0]), 5)
+        self.assertEqual(str(chunks[0].dtypes["hamiltonian_ptr"]), "Int64")
+
+    def test_to_flat_dataframe(self):
+        """Tests if dependencies of the tree are joined in one query.
+        """
+        coulomb = Coulomb.objects.create(
+            n_sites=7, spacing=Decimal("0.2"), v=Decimal("1.0")
+        )
+        for hamiltonian in [*Contact.objects.all(), coulomb]:
+            Eigenvalue.objects.create(hamiltonian=hamiltonian, n_level=1, value=0.5)
+
+        queryset = Eigenvalue.objects.order_by("pk")
+        with self.assertNumQueries(1):
+            frame = queryset.to_flat_dataframe(tree={"hamiltonian": "Contact"})
+
+        self.assertEqual(
+            list(frame.columns),
+            [
+                "id",
+                "tag",
+                "hamiltonian",
+                "hamiltonian.tag",
+                "hamiltonian.n_sites",
+                "hamiltonian.spacing",
+                "hamiltonian.c",
+                "n_level",
+                "value",
+            ],
+        )
+        self.assertEqual(len(frame), 6)
+        self.assertEqual(list(frame["hamiltonian.n_sites"].iloc[:5]), [1, 2, 3, 4, 5])
+        self.assertEqual(frame["hamiltonian.tag"].iloc[0], "contact-1")
+        self.assertEqual(frame["hamiltonian"].iloc[5], coulomb.pk)
+        self.assertTrue(frame["hamiltonian.c"].isna().iloc[5])
+        self.assertEqual(str(frame.dtypes["hamiltonian.c"]), "Float64")
+
+        frame = queryset.to_flat_dataframe()
+        self.assertEqual(
+            list(frame.columns), ["id", "tag", "hamiltonian", "n_level", "value"]
+        )
+
+    @skipUnless(find_spec("pyarrow"), "Requires pyarrow")
+    def test_export_dataframes(self):
+        """Tests if chunks are written to Parquet and Feather files.
+        """
+        queryset = Contact.objects.order_by("pk")
+        expected = concat(queryset.iter_dataframes(fieldnames=self.fieldnames))
+        with TemporaryDirectory() as directory:
+            for name, read in [
+                ("c.parquet", read_parquet),
+                ("c.feather", read_feather),
+            ]:
+                path = os.path.join(directory, name)
+                n_rows = queryset.export_dataframes(
+                    path, fieldnames=self.fieldnames, chunk_size=2
+                )
+                self.assertEqual(n_rows, 5)
+                self.assertTrue(read(path).equals(expected))
+
+    @skipUnless(find_spec("tables"), "Requires tables")
+    def test_export_dataframes_hdf5(self):
+        """Tests if chunks are appended to an HDF5 table.
+        """
+        queryset = Contact.objects.order_by("pk")
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "c.h5")
+            n_rows = queryset.export_dataframes(
+                path, fieldnames=self.fieldnames, chunk_size=2
+            )
+            frame = read_hdf(path, "data")
+
+        self.assertEqual(n_rows, 5)
+        self.assertEqual(list(frame.index), list(range(5)))
+        self.assertEqual(list(frame["n_sites"]), [1, 2, 3, 4, 5])
+        self.assertEqual(frame["tag"].iloc[0], "contact-1")
+
+    def test_export_dataframes_unknown_format(self):
+        """Tests if unknown file formats are rejected.
+        """
+        with self.assertRaises(ValueError):
+            Hamiltonian.objects.export_dataframes("hamiltonians.txt")
+
+
+class LazySpecializationTest(TestCase):
+    """Tests the lazy specialization mode of Hamiltonians
+    """
+
+    def setUp(self):
+        """Creates Hamiltonians of different types and enables lazy mode.
+        """
+        self.contact = Contact.objects.create(
+            n_sites=10, spacing=Decimal("0.1"), c=Decimal("-1.0")
+        )
+        self.coulomb = Coulomb.objects.create(
+            n_sites=10, spacing=Decimal("0.1"), v=Decimal("1.0")
+        )
+
+        patcher = patch.object(Hamiltonian, "lazy_specialization", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_no_queries_on_init(self):
+        """Tests if loading instances does not query specializations.
+        """
+        with self.assertNumQueries(1):
+            hamiltonians = list(Hamiltonian.objects.all())
+
+        self.assertEqual(len(hamiltonians), 2)
+
+    def test_attribute_access(self):
+        """Tests if specialized attributes are loaded on first access.
+        """
+        hamiltonian = Hamiltonian.objects.get(pk=self.contact.pk)
+
+        self.assertEqual(hamiltonian.c, self.contact.c)
+        with self.assertNumQueries(0):
+            self.assertEqual(hamiltonian.n_sites, self.contact.n_sites)
+            self.assertEqual(hamiltonian.specialization, self.contact)
+
+        hamiltonian = Hamiltonian.objects.get(pk=self.coulomb.pk)
+        with self.assertRaises(AttributeError):
+            hamiltonian.c  # pylint: disable=W0104
+        self.assertEqual(hamiltonian.v, self.coulomb.v)
+
+    def test_save_specialized_attribute(self):
+        """Tests if setting specialized attributes before access updates the
+        specialization.
+        """
+        hamiltonian = Hamiltonian.objects.get(pk=self.contact.pk)
+        hamiltonian.c = Decimal("-2.0")
+        hamiltonian.save()
+
+        self.assertEqual(Contact.objects.get(pk=self.contact.pk).c, Decimal("-2.0"))
+
+
+class FieldCacheTest(TestCase):
+    """Tests the cached field meta data of models
+    """
+
+    def test_open_fields_cached(self):
+        """Tests if open fields are computed once and partitioned by type.
+        """
+        Eigenvalue.clear_field_cache()
+        with patch.object(
+            Eigenvalue._meta,  # pylint: disable=W0212
+            "get_fields",
+            wraps=Eigenvalue._meta.get_fields,  # pylint: disable=W0212
+        ) as mocked_get_fields:
+            fields = Eigenvalue.get_open_fields()
+            self.assertEqual(fields, Eigenvalue.get_open_fields())
+
+        self.assertEqual(mocked_get_fields.call_count, 1)
+        self.assertEqual(
+            [field.name for field in Eigenvalue.get_foreign_key_fields()],
+            ["hamiltonian"],
+        )
+        self.assertEqual(
+            [field.name for field in Eigenvalue.get_column_fields()],
+            ["tag", "n_level", "value"],
+        )
+        self.assertEqual(Eigenvalue.get_many_to_many_fields(), ())
+
+    def test_recursive_columns_cached(self):
+        """Tests if cached recursive columns can not be modified by callers.
+        """
+        tree = {"hamiltonian": "Contact"}
+        columns = Eigenvalue.get_recursive_columns(tree)
+        columns["n_sites"].append("Other")
+        columns.pop("c")
+
+        self.assertEqual(
+            Eigenvalue.get_recursive_columns(tree),
+            {
+                "tag": ["Eigenvalue", "Eigenvalue.Contact"],
+                "n_level": ["Eigenvalue"],
+                "value": ["Eigenvalue"],
+                "n_sites": ["Eigenvalue.Contact"],
+                "spacing": ["Eigenvalue.Contact"],
+                "c": ["Eigenvalue.Contact"],
+            },
+        )
+
+
+class GetOrCreateManyTest(TestCase):
+    """Tests the bulk get or create from parameters method
+    """
+
+    def setUp(self):
+        """Creates a hamiltonian and an eigenvalue which already exist.
+        """
+        self.contact = Contact.objects.create(
+            n_sites=10, spacing=Decimal("0.1"), c=Decimal("-1.0")
+        )
+        self.eigenvalue = Eigenvalue.objects.create(
+            hamiltonian=self.contact, n_level=0, value=0.0
+        )
+        self.tree = {"hamiltonian": "Contact"}
+
+    def test_get_or_create_many_from_parameters(self):
+        """Tests if existing entries are fetched, new entries are created and results
+        are returned in the order of the parameters.
+        """
+        parameters = [
+            {"n_level": n, "value": float(n), "n_sites": 10, "spacing": 0.1, "c": c}
+            for c in [-1.0, -2.0]
+            for n in range(3)
+        ]
+        parameters.append(parameters[-1])
+
+        results = Eigenvalue.get_or_create_many_from_parameters(
+            parameters, tree=self.tree
+        )
+
+        self.assertEqual(len(results), len(parameters))
+        self.assertEqual(results[0], (self.eigenvalue, False))
+        self.assertEqual(
+            [created for _, created in results],
+            [False, True, True, True, True, True, False],
+        )
+        self.assertEqual(results[-1][0], results[-2][0])
+        for (instance, _), pars in zip(results, parameters):
+            self.assertIsNotNone(instance.pk)
+            self.assertEqual(instance.n_level, pars["n_level"])
+            self.assertEqual(instance.hamiltonian.c, Decimal(str(pars["c"])))
+
+        self.assertEqual(Contact.objects.count(), 2)
+        self.assertEqual(Eigenvalue.objects.count(), 6)
+
+    def test_get_or_create_many_from_parameters_existing(self):
+        """Tests if existing entries are fetched with a constant number of queries.
+        """
+        parameters = [
+            {"n_level": n, "value": float(n), "n_sites": 10, "spacing": 0.1, "c": -1.0}
+            for n in range(5)
+        ]
+        Eigenvalue.get_or_create_many_from_parameters(parameters, tree=self.tree)
+
+        # one select per table and two savepoint queries per table
+        with self.assertNumQueries(6):
+            results = Eigenvalue.get_or_create_many_from_parameters(
+                parameters, tree=self.tree
+            )
+
+        self.assertFalse(any(created for _, created in results))
+
+    def test_get_or_create_many_repeated(self):
+        """Tests if only the first occurrence of repeated kwargs is flagged as created.
+        """
+        kwargs = {"n_sites": 10, "spacing": 0.1, "c": -2.0}
+        results = Contact._get_or_create_many(  # pylint: disable=W0212
+            [kwargs, {"n_sites": 10, "spacing": Decimal("0.1"), "c": -2}]
+        )
+        self.assertEqual([created for _, created in results], [True, False])
+        self.assertEqual(results[0][0], results[1][0])
+        self.assertEqual(Contact.objects.count(), 2)
+
+    def test_get_or_create_many_from_parameters_dry_run(self):
+        """Tests if dry runs return unsaved instances for missing entries.
+        """
+        parameters = [
+            {"n_level": n, "value": float(n), "n_sites": 10, "spacing": 0.1, "c": c}
+            for c in [-1.0, -2.0, -3.0]
+            for n in range(2)
+        ]
+
+        results = Eigenvalue.get_or_create_many_from_parameters(
+            parameters, tree=self.tree, dry_run=True
+        )
+
+        self.assertEqual(results[0], (self.eigenvalue, False))
+        self.assertEqual(
+            [created for _, created in results], [False, True, True, True, True, True]
+        )
+        for (instance, _), pars in zip(results[1:], parameters[1:]):
+            self.assertIsNone(instance.pk)
+            self.assertEqual(instance.n_level, pars["n_level"])
+            self.assertEqual(instance.hamiltonian.c, Decimal(str(pars["c"])))
+        self.assertIs(results[2][0].hamiltonian, results[3][0].hamiltonian)
+        self.assertIsNot(results[2][0].hamiltonian, results[4][0].hamiltonian)
+
+        self.assertEqual(Contact.objects.count(), 1)
+        self.assertEqual(Eigenvalue.objects.count(), 1)
+
+    def test_get_or_create_many_from_parameters_fail_atomicness(self):
+        """Tests if no entry is created if one consistency check fails.
+        """
+        parameters = [
+            {"n_level": n, "value": 0.0, "n_sites": 10, "spacing": 0.1, "c": -2.0}
+            for n in [1, 11]  # 11 causes fail
+        ]
+
+        with self.assertRaises(ConsistencyError):
+            Eigenvalue.get_or_create_many_from_parameters(parameters, tree=self.tree)
+
+        self.assertEqual(Contact.objects.count(), 1)
+        self.assertEqual(Eigenvalue.objects.count(), 1)
+
+
+class ParameterPlanTest(TestCase):
+    """Tests the compiled parameter plans
+    """
+
+    def test_plan_cached(self):
+        """Tests if plans are compiled once per tree and resolve the tree.
+        """
+        tree = {"hamiltonian": "Contact"}
+        plan = Eigenvalue.get_parameter_plan(tree)
+
+        self.assertIs(plan, Eigenvalue.get_parameter_plan(dict(tree)))
+        self.assertIsNot(
+            plan, Eigenvalue.get_parameter_plan({"hamiltonian": "Coulomb"})
+        )
+        self.assertEqual(plan.model, Eigenvalue)
+        self.assertEqual(
+            [(field.name, sub.model) for field, sub in plan.foreign_keys],
+            [("hamiltonian", Contact)],
+        )
+
+    def test_plan_compile_fail(self):
+        """Tests if compiling a plan without tree for a non-null foreign key fails.
+        """
+        with self.assertRaises(KeyError):
+            Eigenvalue.get_parameter_plan()
+
+    def test_plan_get_or_create(self):
+        """Tests if executing a plan does not resolve the tree again.
+        """
+        plan = Eigenvalue.get_parameter_plan({"hamiltonian": "Contact"})
+        data = {"n_level": 0, "value": 0.0, "n_sites": 10, "spacing": 0.1, "c": -1.0}
+
+        with patch.object(Hamiltonian, "_get_child_by_name") as mocked_get_child:
+            instance, created = plan.get_or_create(data)
+            self.assertEqual(plan.get_or_create(data), (instance, False))
+
+        mocked_get_child.assert_not_called()
+        self.assertTrue(created)
+        self.assertEqual(instance.hamiltonian.specialization.c, Decimal("-1.0"))
+
+
+class BulkConsistencyTest(TestCase):
+    """Tests the consistency checks of bulk operations
+    """
+
+    def setUp(self):
+        """Creates a hamiltonian for the checks.
+        """
+        Contact.objects.create(n_sites=10, spacing=Decimal("0.1"), c=Decimal("-1.0"))
+        self.hamiltonian = Hamiltonian.objects.first()
+
+    def test_bulk_create(self):
+        """Tests if bulk create runs the pre save logic and sets the user.
+        """
+        eigenvalues = [
+            Eigenvalue(hamiltonian=self.hamiltonian, n_level=n, value=0.0)
+            for n in range(3)
+        ]
+        with patch.object(Eigenvalue, "pre_save") as mocked_pre_save:
+            Eigenvalue.objects.bulk_create(eigenvalues)
+
+        self.assertEqual(mocked_pre_save.call_count, 3)
+        self.assertEqual(Eigenvalue.objects.count(), 3)
+        self.assertEqual(Eigenvalue.objects.filter(user__isnull=True).count(), 0)
+
+    def test_bulk_create_fail(self):
+        """Tests if all failed checks are reported and nothing is inserted.
+        """
+        for max_workers in [None, 2]:
+            eigenvalues = [
+                Eigenvalue(hamiltonian=self.hamiltonian, n_level=n, value=0.0)
+                for n in [11, 1, 12]
+            ]
+            with self.assertRaises(BulkConsistencyError) as context:
+                Eigenvalue.objects.bulk_create(eigenvalues, max_workers=max_workers)
+
+            self.assertIsInstance(context.exception, ConsistencyError)
+            self.assertEqual(
+                [error.instance for error in context.exception.errors],
+                [eigenvalues[0], eigenvalues[2]],
+            )
+            self.assertEqual(Eigenvalue.objects.count(), 0)
+
+    def test_bulk_update(self):
+        """Tests if bulk update runs checks and updates the last modified column.
+        """
+        eigenvalue = Eigenvalue.objects.create(
+            hamiltonian=self.hamiltonian, n_level=1, value=0.0
+        )
+        last_modified = eigenvalue.last_modified
+
+        eigenvalue.n_level = 11
+        with self.assertRaises(BulkConsistencyError):
+            Eigenvalue.objects.bulk_update([eigenvalue], ["n_level"])
+        self.assertEqual(Eigenvalue.objects.get().n_level, 1)
+
+        eigenvalue.n_level = 2
+        Eigenvalue.objects.bulk_update([eigenvalue], ["n_level"])
+        stored = Eigenvalue.objects.get()
+        self.assertEqual(stored.n_level, 2)
+        self.assertGreater(stored.last_modified, last_modified)
+
+
+class DefaultUserTest(TransactionTestCase):
+    """Tests the cache of the default user
+    """
+
+    def setUp(self):
+        """Creates a hamiltonian and clears the user cache.
+        """
+        Eigenvalue.clear_default_user_cache()
+        self.hamiltonian = Contact.objects.create(
+            n_sites=10, spacing=Decimal("0.1"), c=Decimal("-1.0")
+        )
+
+    def test_save_single_statement(self):
+        """Tests if saving instances without user does not query the user.
+        """
+        user = Eigenvalue.get_default_user()
+        self.assertEqual(self.hamiltonian.user, user)
+
+        eigenvalue = Eigenvalue(hamiltonian=self.hamiltonian, n_level=0, value=0.0)
+        with self.assertNumQueries(1):
+            eigenvalue.save()
+
+        self.assertEqual(eigenvalue.user, user)
+
+        with self.assertNumQueries(2):  # begin transaction and insert
+            Eigenvalue.objects.bulk_create(
+                [Eigenvalue(hamiltonian=self.hamiltonian, n_level=1, value=0.0)]
+            )
+
+        with self.assertNumQueries(2):  # users given by id are not loaded
+            Eigenvalue.objects.bulk_create(
+                [
+                    Eigenvalue(
+                        hamiltonian=self.hamiltonian,
+                        n_level=n_level,
+                        value=0.0,
+                        user_id=user.pk,
+                    )
+                    for n_level in range(2, 5)
+                ]
+            )
+
+    def test_delete_user(self):
+        """Tests if deleted users are removed from the cache.
+        """
+        user = Eigenvalue.get_default_user()
+        user.delete()
+
+        new_user = Eigenvalue.get_default_user()
+        self.assertNotEqual(user.pk, new_user.pk)
+        self.assertEqual(user.username, new_user.username)
+
+    def test_cache_in_transaction(self):
+        """Tests if users created in transactions are cached until rolled back.
+        """
+        Eigenvalue.get_default_user().delete()
+
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                user = Eigenvalue.get_default_user()
+                with self.assertNumQueries(0):
+                    self.assertEqual(Eigenvalue.get_default_user(), user)
+                raise ValueError("Roll back")
+
+        self.assertFalse(User.objects.filter(username=user.username).exists())
+        new_user = Eigenvalue.get_default_user()
+        self.assertTrue(User.objects.filter(pk=new_user.pk).exists())
+
+        new_user.delete()
+        with transaction.atomic():
+            user = Eigenvalue.get_default_user()
+        with self.assertNumQueries(0):
+            self.assertEqual(Eigenvalue.get_default_user(), user)
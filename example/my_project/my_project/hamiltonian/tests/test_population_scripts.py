@@ -0,0 +1,73 @@
+"""Tests for generated bulk population scripts
+"""
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from espressodb.base.utilities.dependencies import DependencyGraph
+from espressodb.base.utilities.population import get_leaf_labels
+from espressodb.base.utilities.population import render_bulk_script
+from espressodb.base.utilities.population import render_bulk_scripts
+
+from my_project.hamiltonian.models import Contact, Eigenvalue
+
+
+class BulkPopulationScriptTest(TestCase):
+    """Tests generating and running bulk population scripts
+    """
+
+    def test_leaf_models(self):
+        """Tests if scripts are generated for all trees of leaf models.
+        """
+        self.assertEqual(
+            get_leaf_labels(),
+            ["Contact[Hamiltonian]", "Coulomb[Hamiltonian]", "Eigenvalue[Base]"],
+        )
+        scripts = render_bulk_scripts()
+        self.assertEqual(
+            {label: len(trees) for label, trees in scripts.items()},
+            {
+                "Contact[Hamiltonian]": 1,
+                "Coulomb[Hamiltonian]": 1,
+                "Eigenvalue[Base]": 2,
+            },
+        )
+
+    def test_run_script(self):
+        """Fills out the generated eigenvalue script and runs it.
+        """
+        (state, script), _ = render_bulk_scripts(["Eigenvalue[Base]"])[
+            "Eigenvalue[Base]"
+        ]
+        self.assertEqual(state.tree, {"hamiltonian": "Contact[Hamiltonian]"})
+
+        definitions, call = script.split("RESULTS =")
+        namespace = {}
+        exec(definitions, namespace)  # pylint: disable=W0122
+
+        parameters = namespace["PARAMETERS"][0]
+        parameters.update(
+            {"hamiltonian.n_sites": 10, "hamiltonian.spacing": 0.1, "hamiltonian.c": -1}
+        )
+        namespace["PARAMETERS"] = [
+            dict(parameters, n_level=n, value=float(n)) for n in range(5)
+        ]
+        exec("RESULTS =" + call, namespace)  # pylint: disable=W0122
+
+        self.assertEqual(len(namespace["RESULTS"]), 5)
+        self.assertEqual(Contact.objects.count(), 1)
+        self.assertEqual(
+            Eigenvalue.objects.filter(hamiltonian__contact__c=-1).count(), 5
+        )
+
+    def test_script_of_graph(self):
+        """Tests if scripts only use the models of the given graph.
+        """
+        graph = DependencyGraph([Contact])
+        state = graph.resolve([("Contact[Hamiltonian]", True)])
+        with patch(
+            "espressodb.base.utilities.population.get_dependency_graph",
+            side_effect=AssertionError("Project graph used"),
+        ):
+            script = render_bulk_script(state, graph=graph)
+        self.assertIn('"c": None,', script)
@@ -2,10 +2,13 @@
 """
 from typing import Set
 
+from django.conf import settings
 from django.test import TestCase
 
 from bs4 import BeautifulSoup
 
+from espressodb.base.utilities.dependencies import get_dependency_graph
+
 
 class PopulationViewTestCase(TestCase):
     """Test for the population view.
@@ -14,6 +17,26 @@ class PopulationViewTestCase(TestCase):
     run and checked if the desired classes are generated.
     """
 
+    #: The script for an eigenvalue of a contact Hamiltonian
+    expected_code = r"""
+from my_project.hamiltonian.models import Contact as hamiltonian_Contact
+from my_project.hamiltonian.models import Eigenvalue as hamiltonian_Eigenvalue
+
+hamiltonian, created = hamiltonian_Contact.objects.get_or_create(
+	n_sites=, # Number of sites in one spatial dimension
+	spacing=, # The lattice spacing between sites
+	c=, # Interaction parameter of th the Hamiltonian. Implements a contact interaction.
+	tag=, # (Optional) User defined tag for easy searches
+)
+
+hamiltonian_eigenvalue, created = hamiltonian_Eigenvalue.objects.get_or_create(
+	hamiltonian=hamiltonian, # Matrix for which the eigenvalue has been computed.
+	n_level=, # The nth eigenvalue extracted in ascending order.
+	value=, # The value of the eigenvalue
+	tag=, # (Optional) User defined tag for easy searches
+)
+"""
+
     @staticmethod
     def get_soup(response) -> BeautifulSoup:
         """Returns soup for response object
@@ -46,8 +69,11 @@ class PopulationViewTestCase(TestCase):
             {"Contact[Hamiltonian]", "Coulomb[Hamiltonian]", "Eigenvalue[Base]"},
         )
 
-    def test_03_pick_eiegenvalue(self):
+    def test_03_pick_eiegenvalue(self) -> str:
         """Selects the eigenvalue option for the form
+
+        Returns:
+            The population path submitted with the next form.
         """
         self.test_01_page_status()  # needed to initialize cookies
         response = self.client.post(
@@ -63,6 +89,8 @@ class PopulationViewTestCase(TestCase):
             {"Contact[Hamiltonian]", "Coulomb[Hamiltonian]"},
         )
 
+        return soup.find("input", attrs={"name": "path"})["value"]
+
     def test_04_pick_hamiltonian(self) -> str:
         """Selcts Hamiltonian after choosing an eigenvalue
 
@@ -71,10 +99,14 @@ class PopulationViewTestCase(TestCase):
         Returns:
             The code block.
         """
-        self.test_03_pick_eiegenvalue()  # needed to preselct on previous step
+        path = self.test_03_pick_eiegenvalue()  # needed to preselct on previous step
         response = self.client.post(
             "/populate/",
-            data={"model": ["Contact[Hamiltonian]"], "parse_tree": ["on"]},
+            data={
+                "model": ["Contact[Hamiltonian]"],
+                "parse_tree": ["on"],
+                "path": path,
+            },
             follow=True,
         )
         self.assertEqual(response.status_code, 200)
@@ -91,22 +123,59 @@ class PopulationViewTestCase(TestCase):
         After the run, the tables are checked if the objects where created.
         """
         code = self.test_04_pick_hamiltonian()
-        expected_code = r"""
-from my_project.hamiltonian.models import Contact as hamiltonian_Contact
-from my_project.hamiltonian.models import Eigenvalue as hamiltonian_Eigenvalue
+        self.assertEqual(code, self.expected_code)
 
-hamiltonian, created = hamiltonian_Contact.objects.get_or_create(
-	n_sites=, # Number of sites in one spatial dimension
-	spacing=, # The lattice spacing between sites
-	c=, # Interaction parameter of th the Hamiltonian. Implements a contact interaction.
-	tag=, # (Optional) User defined tag for easy searches
-)
+    def test_06_script_from_labels(self):
+        """Tests if the script is generated in one request from labels.
+        """
+        response = self.client.get(
+            "/populate-result/",
+            {"root": "Eigenvalue[Base]", "choice": "Contact[Hamiltonian]"},
+        )
+        code = self.get_soup(response).find("pre", attrs={"id": "population-code"})
+        self.assertEqual(code.text, self.expected_code)
 
-hamiltonian_eigenvalue, created = hamiltonian_Eigenvalue.objects.get_or_create(
-	hamiltonian=hamiltonian, # Matrix for which the eigenvalue has been computed.
-	n_level=, # The nth eigenvalue extracted in ascending order.
-	value=, # The value of the eigenvalue
-	tag=, # (Optional) User defined tag for easy searches
-)
-"""
-        self.assertEqual(code, expected_code)
+    def test_07_path_without_session(self):
+        """Tests if the wizard state is fully described by the submitted path.
+        """
+        response = self.client.post(
+            "/populate/", data={"model": ["Eigenvalue[Base]"], "parse_tree": ["on"]}
+        )
+        path = self.get_soup(response).find("input", attrs={"name": "path"})["value"]
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+        self.client.cookies.clear()
+        response = self.client.post(
+            "/populate/",
+            data={
+                "model": ["Coulomb[Hamiltonian]"],
+                "parse_tree": ["on"],
+                "path": path,
+            },
+            follow=True,
+        )
+        code = self.get_soup(response).find("pre", attrs={"id": "population-code"})
+        self.assertIn("hamiltonian_Coulomb.objects.get_or_create", code.text)
+
+    def test_08_dependency_graph(self):
+        """Tests encoding and resolving population paths.
+        """
+        graph = get_dependency_graph()
+        self.assertEqual(
+            graph.choices["Hamiltonian[Base]"],
+            ("Contact[Hamiltonian]", "Coulomb[Hamiltonian]"),
+        )
+
+        steps = [("Eigenvalue[Base]", True)]
+        state = graph.resolve(steps)
+        self.assertEqual(state.column, "hamiltonian")
+        self.assertEqual(state.tree, {})
+
+        steps.append(("Contact[Hamiltonian]", False))
+        self.assertEqual(graph.decode_path(graph.encode_path(steps)), steps)
+        state = graph.resolve(steps)
+        self.assertIsNone(state.column)
+        self.assertEqual(state.tree, {"hamiltonian": "Contact[Hamiltonian]"})
+
+        with self.assertRaises(ValueError):
+            graph.resolve([("Eigenvalue[Base]", True), ("Eigenvalue[Base]", True)])
@@ -0,0 +1,29 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customizations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ca',
+            index=models.Index(fields=['tag'], name='customizati_tag_1db671_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ca',
+            index=models.Index(fields=['last_modified'], name='customizati_last_mo_868839_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cb',
+            index=models.Index(fields=['tag'], name='customizati_tag_b1d3c5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cb',
+            index=models.Index(fields=['last_modified'], name='customizati_last_mo_8d9156_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('m2mtests', '0003_d'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='a',
+            index=models.Index(fields=['tag'], name='m2mtests_a_tag_65412c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='a',
+            index=models.Index(fields=['last_modified'], name='m2mtests_a_last_mo_8ae4d1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='b',
+            index=models.Index(fields=['tag'], name='m2mtests_b_tag_6a7164_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='b',
+            index=models.Index(fields=['last_modified'], name='m2mtests_b_last_mo_e0ca1e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='c',
+            index=models.Index(fields=['tag'], name='m2mtests_c_tag_b51ea1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='c',
+            index=models.Index(fields=['last_modified'], name='m2mtests_c_last_mo_fc33d5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='d',
+            index=models.Index(fields=['tag'], name='m2mtests_d_tag_3dbf6c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='d',
+            index=models.Index(fields=['last_modified'], name='m2mtests_d_last_mo_74abb5_idx'),
+        ),
+    ]
@@ -3,6 +3,7 @@
 """
 from logging import getLogger
 from unittest import skip
+from unittest.mock import patch
 
 from django.test import TransactionTestCase
 from django.forms import ModelForm
@@ -200,6 +201,27 @@ class M2MTest(TransactionTestCase):  # pylint: disable=R0902
             self.d1.a_set.add(self.a2, a3)
         self.assertEqual(self.d1.a_set.count(), 1)
 
+    def test_09_reverse_bulk_check(self):
+        """Checks that reverse adds call the bulk check once with all instances."""
+        with patch.object(B, "check_m2m_consistency_bulk") as mocked_check:
+            self.a1.b_set.add(self.b2, self.b1)
+
+        mocked_check.assert_called_once()
+        (instances, instances_to_add), kwargs = mocked_check.call_args
+        self.assertEqual(instances, [self.b1, self.b2])
+        self.assertEqual(list(instances_to_add), [self.a1])
+        self.assertEqual(kwargs, {"column": "a_set"})
+
+    def test_10_reverse_bulk_check_fails(self):
+        """Checks that errors of the bulk check prevent reverse adds."""
+        with patch.object(
+            B, "check_m2m_consistency_bulk", side_effect=ValueError("Bulk check")
+        ):
+            with self.assertRaises(ConsistencyError):
+                self.a1.b_set.add(self.b1, self.b2)
+
+        self.assertEqual(self.a1.b_set.count(), 0)
+
     @skip("Form erros not properly implemented yet.")
     def test_08_form_validates_properly(self):
         """Tests if consistency error is triggered properly for m2m field in form."""
@@ -0,0 +1,29 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pre_save_tests', '0002_auto_20200417_1121'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mandatorytagtable',
+            index=models.Index(fields=['tag'], name='pre_save_te_tag_28e356_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mandatorytagtable',
+            index=models.Index(fields=['last_modified'], name='pre_save_te_last_mo_ec1da7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='optionaltagtable',
+            index=models.Index(fields=['tag'], name='pre_save_te_tag_17ea25_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='optionaltagtable',
+            index=models.Index(fields=['last_modified'], name='pre_save_te_last_mo_440a85_idx'),
+        ),
+    ]
@@ -40,4 +40,6 @@ class ProjectSetup:  # pylint: disable=R0903
             PROJECT_APPS=PROJECT_APPS,
             ROOT_DIR=ROOT_DIR,
             PROJECT_NAME="migration_states",
+            # the database states were created without Base column indexes
+            ESPRESSODB_BASE_INDEXES=False,
         )